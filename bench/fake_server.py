@@ -0,0 +1,765 @@
+# fake_server.py
+"""
+Stand-in for chromedriver and the Electron DevTools endpoint, serving a synthetic DOM.
+
+It speaks the W3C WebDriver subset SpectronPy uses and answers the calls into the SpectronPy renderer runtime
+(see `spectronpy.evaluate`) from the synthetic DOM, so finders, matchers and assertions run unchanged against it.
+Every request can be delayed to simulate chromedriver round trips.
+
+The DevTools WebSocket (`webSocketDebuggerUrl` of `/json/list`) answers the DevTools commands of
+`spectronpy.cdp.CDPDriver` the same way, so the CDP backend runs against it as well. `FakeServer.fetch()` sends
+a request through the Fetch domain, for `spectronpy.intercept` to stub, block or replay.
+
+In-process:
+    server = fake_server.start(elements=100, latency=0.002)
+    ...
+    server.stop()
+
+As a process, standing in for chromedriver (--port) or an Electron app (--remote-debugging-port):
+    python -m bench.fake_server --port=9515 --elements=100 --latency=2
+"""
+import argparse
+import base64
+import json
+import pkgutil
+import re
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from spectronpy import cdp
+from spectronpy.intercept import glob_to_regex
+from spectronpy.evaluate import _MISSING
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# 1x1 transparent PNG
+PNG = 'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII='
+
+_CSS = re.compile(r'^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<id>#[\w-]+)?(?P<classes>(?:\.[\w-]+)*)'
+                  r'(?:\[(?P<attr>[\w-]+)="(?P<value>[^"]*)"])?$')
+_RUNTIME_CALL = re.compile(r'rt\.(\w+)\.apply')
+
+# Atoms selenium sends for WebElement.is_displayed() and get_attribute()
+_IS_DISPLAYED = pkgutil.get_data('selenium.webdriver.remote', 'isDisplayed.js').decode('utf8')
+_GET_ATTRIBUTE = pkgutil.get_data('selenium.webdriver.remote', 'getAttribute.js').decode('utf8')
+
+
+@dataclass(eq=False)
+class FakeElement:
+    id: str
+    tag: str = 'div'
+    classes: set = field(default_factory=set)
+    text: str = ''
+    visible: bool = True
+    enabled: bool = True
+    attributes: dict = field(default_factory=dict)
+    # Element reference, a re-render creates new elements with the same id
+    ref: str = ''
+
+    def __post_init__(self):
+        self.ref = self.ref or self.id
+
+    def attribute(self, name: str) -> Optional[str]:
+        if name == 'id':
+            return self.id
+        if name == 'class':
+            return ' '.join(sorted(self.classes))
+        return self.attributes.get(name)
+
+
+class FakeDOM:
+    """
+    Flat synthetic document: `elements` items `div#e{i}.item`, text "Item {i}", every second one visible.
+    Changes made through `mutate()` wake up pending observations, like DOM mutations in the renderer.
+    """
+
+    def __init__(self, elements: int = 100, title: str = 'SpectronPy Bench', url: str = 'file:///bench/index.html'):
+        self.title = title
+        self.url = url
+        self.elements: list[FakeElement] = []
+        self.runtime_installed = False
+        self.cdp_installed = False
+        self.version = 0
+        self.rerenders = 0
+        self._changed = threading.Condition()
+        self.populate(elements)
+
+    def populate(self, count: int, generation: int = 0) -> None:
+        self.elements = [
+            FakeElement(f'e{i}', classes={'item'}, text=f'Item {i}', visible=i % 2 == 0,
+                        attributes={'name': f'item{i}'}, ref=f'e{i}-{generation}' if generation else '')
+            for i in range(count)
+        ]
+        self._by_id = {x.ref: x for x in self.elements}
+
+    def rerender(self, delay: float = 0) -> None:
+        """Replaces every element with an equal new one, like a framework re-render. References go stale."""
+        self.rerenders += 1
+        self.mutate(lambda dom: dom.populate(len(dom.elements), self.rerenders), delay)
+
+    def mutate(self, change: Callable[['FakeDOM'], None], delay: float = 0) -> None:
+        """Applies the change after `delay` seconds, from a timer thread."""
+        if delay:
+            threading.Timer(delay, self.mutate, (change,)).start()
+            return
+
+        with self._changed:
+            change(self)
+            self.version += 1
+            self._changed.notify_all()
+
+    def set_title(self, title: str, delay: float = 0) -> None:
+        self.mutate(lambda dom: setattr(dom, 'title', title), delay)
+
+    def navigate(self, url: str) -> None:
+        def _navigate(dom):
+            dom.url = url
+            dom.runtime_installed = False
+            dom.cdp_installed = False
+
+        self.mutate(_navigate)
+
+    def get(self, element_id: str) -> Optional[FakeElement]:
+        return self._by_id.get(element_id)
+
+    def locate(self, by: str, value: str) -> list[FakeElement]:
+        if by == 'css selector':
+            return [x for x in self.elements if _css_matches(x, value)]
+        elif by == 'id':
+            return [x for x in self.elements if x.id == value]
+        elif by == 'class name':
+            return [x for x in self.elements if value in x.classes]
+        elif by == 'name':
+            return [x for x in self.elements if x.attributes.get('name') == value]
+        elif by == 'tag name':
+            return [x for x in self.elements if x.tag == value]
+        elif by == 'xpath':
+            tag = value[2:] if value.startswith('//') else None
+            return [x for x in self.elements if tag in ('*', x.tag)]
+
+        return []
+
+    # Runtime predicates, same semantics as in evaluate._RUNTIME_JS
+
+    def predicate(self, name: str, args: list):
+        return getattr(self, f'_p_{name}')(*args)
+
+    def observe(self, name: str, args: list, timeout_ms: int):
+        deadline = time.monotonic() + timeout_ms / 1000
+
+        with self._changed:
+            while True:
+                if value := self.predicate(name, args):
+                    return value
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+
+                self._changed.wait(remaining)
+
+    def _p_title_contains(self, expected, case_insensitive=False):
+        if case_insensitive:
+            return expected.lower() in self.title.lower()
+        return expected in self.title
+
+    def _p_title_is(self, title):
+        return self.title == title
+
+    def _p_url_contains(self, url):
+        return url in self.url
+
+    def _p_url_to_be(self, url):
+        return self.url == url
+
+    def _p_url_matches(self, pattern):
+        return re.search(pattern, self.url) is not None
+
+    def _p_url_changes(self, url):
+        return self.url != url
+
+    def _p_presence(self, by, value):
+        return self.locate(by, value) or None
+
+    def _p_clickable(self, by, value, element=None):
+        target = element or next(iter(self.locate(by, value)), None)
+        return target if target and target.visible and target.enabled else None
+
+    def _p_text_in_element(self, by, value, element, expected):
+        target = element or next(iter(self.locate(by, value)), None)
+        return target is not None and expected in target.text
+
+    def _p_verify(self, by, value, expectations, elements=None):
+        targets = elements or self.locate(by, value)
+        if not targets:
+            return None
+        return [_verify(x, expectations) for x in targets]
+
+    def _p_select(self, by, value, filters):
+        candidates = self.locate(by, value)
+        if not candidates:
+            return None
+        return {
+            'found': len(candidates),
+            'elements': [x for x in candidates if all(_verify(x, filters).values())],
+        }
+
+    def _p_any_of(self, conditions):
+        for index, (name, args) in enumerate(conditions):
+            if value := self.predicate(name, args):
+                return [index, value]
+        return None
+
+    def _p_all_of(self, conditions):
+        values = []
+        for name, args in conditions:
+            if not (value := self.predicate(name, args)):
+                return None
+            values.append(value)
+        return values
+
+    def _p_snapshot(self):
+        root = [FakeElement('html', 'html'), FakeElement('body', 'body')]
+        nodes = [[-1, 'html', {}, True, ['', '']], [0, 'body', {}, True, [''] * (len(self.elements) + 1)]]
+        nodes += [[1, x.tag, x.attributes | {'id': x.id, 'class': x.attribute('class')}, x.visible, [x.text]]
+                  for x in self.elements]
+        return {'title': self.title, 'url': self.url, 'nodes': nodes, 'elements': root + self.elements}
+
+    def _p_texts(self, elements):
+        return [x.text for x in elements]
+
+    def _p_attributes(self, elements, name):
+        return [x.attribute(name) for x in elements]
+
+    def _p_rects(self, elements):
+        return [{'x': 0, 'y': i * 20, 'width': 100, 'height': 20} for i, _ in enumerate(elements)]
+
+    def _p_clickAll(self, elements):
+        return len(elements)
+
+    def _p_isDisplayed(self, element):
+        return element.visible
+
+    def _p_text(self, element):
+        return element.text
+
+    def _p_locate(self, by, value):
+        return self.locate(by, value)
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, dom: FakeDOM = None, latency: float = 0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        self.dom = dom or FakeDOM()
+        self.latency = latency
+        self.requests = 0
+        self.sessions: set[str] = set()
+        # DevTools sessions with Fetch enabled: their request patterns
+        self.fetch_patterns: dict['_DevToolsSession', list[dict]] = {}
+        self.paused: dict[str, list] = {}
+        # Client sockets currently open, keep-alive ones included
+        self.connections: set[socket.socket] = set()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+    def start(self) -> 'FakeServer':
+        self._thread = threading.Thread(target=self.serve_forever, name='fake-webdriver', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def drop_connections(self) -> None:
+        """Closes every open client connection, like a server dropping idle keep-alive sockets."""
+        for connection in list(self.connections):
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def fetch(self, url: str, method: str = 'GET', headers: dict = None, timeout: float = 2) -> dict:
+        """
+        A request of the page, paused like Chromium's Fetch domain does when a pattern matches. The network answers
+        200 with body 'network <url>'. Returns {'action': 'network' | 'fulfill' | 'fail', 'status', 'body', ...}.
+        """
+        request = {'url': url, 'method': method, 'headers': headers or {}}
+        network = {'status': 200, 'headers': {'Content-Type': 'text/plain'}, 'body': f'network {url}'}
+
+        for session, patterns in list(self.fetch_patterns.items()):
+            stages = {x.get('requestStage', 'Request') for x in patterns if glob_to_regex(x['urlPattern']).match(url)}
+            if 'Request' in stages:
+                answer = self._pause(session, {'request': request}, timeout)
+                if answer['action'] != 'continue':
+                    return answer
+            if 'Response' in stages:
+                response = {'responseStatusCode': network['status'],
+                            'responseHeaders': [{'name': k, 'value': v} for k, v in network['headers'].items()]}
+                answer = self._pause(session, {'request': request} | response, timeout, network['body'])
+                if answer['action'] != 'continue':
+                    return answer
+
+        return {'action': 'network'} | network
+
+    def _pause(self, session: '_DevToolsSession', params: dict, timeout: float, body: str = None) -> dict:
+        request_id = uuid.uuid4().hex
+        waiter = [threading.Event(), None, body]
+        self.paused[request_id] = waiter
+
+        session._send({'method': 'Fetch.requestPaused', 'params': {'requestId': request_id} | params})
+        if not waiter[0].wait(timeout):
+            self.paused.pop(request_id, None)
+            raise TimeoutError(f"Paused request {params['request']['url']} was not answered.")
+        return waiter[1]
+
+    def _resume(self, params: dict, answer: dict) -> None:
+        waiter = self.paused.pop(params['requestId'])
+        waiter[1] = answer
+        waiter[0].set()
+
+
+def start(port: int = 0, elements: int = 100, latency: float = 0) -> FakeServer:
+    """Serves a FakeDOM with `elements` items from a background thread. `latency` is added to every request."""
+    return FakeServer(port, FakeDOM(elements), latency).start()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, Nagle + delayed ACK would add ~40ms to every keep-alive request
+    disable_nagle_algorithm = True
+    server: FakeServer
+
+    def setup(self):
+        super().setup()
+        self.server.connections.add(self.connection)
+
+    def finish(self):
+        self.server.connections.discard(self.connection)
+        super().finish()
+
+    def do_GET(self):
+        if self.headers.get('Upgrade', '').lower() == 'websocket' and self.path.startswith('/devtools/page/'):
+            return _DevToolsSession(self).serve()
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method: str):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'null') if length else None
+
+        self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        path = self.path.rstrip('/')
+        for route_method, pattern, handler in _ROUTES:
+            if route_method == method and (match := pattern.fullmatch(path)):
+                try:
+                    body = _unwrap(self.server.dom, body)
+                    status, value = 200, handler(self.server, body, *match.groups())
+                except _WebDriverError as e:
+                    status, value = e.status, {'error': e.error, 'message': e.message, 'stacktrace': ''}
+                break
+        else:
+            status, value = 404, {'error': 'unknown command', 'message': f'{method} {path}', 'stacktrace': ''}
+
+        if path.startswith('/json'):
+            self._respond(status, value)
+        else:
+            self._respond(status, {'value': _wrap(value)})
+
+        if path == '/shutdown':
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+    def _respond(self, status: int, payload) -> None:
+        data = json.dumps(payload).encode('utf8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _WebDriverError(Exception):
+    def __init__(self, status: int, error: str, message: str):
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+def _css_matches(element: FakeElement, selector: str) -> bool:
+    match = _CSS.match(selector.strip())
+    if not match:
+        return False
+
+    parts = match.groupdict()
+    if parts['tag'] not in (None, '*', element.tag):
+        return False
+    if parts['id'] and parts['id'][1:] != element.id:
+        return False
+    if parts['classes'] and not set(parts['classes'][1:].split('.')) <= element.classes:
+        return False
+    if parts['attr'] and element.attribute(parts['attr']) != parts['value']:
+        return False
+
+    return True
+
+
+def _verify(element: FakeElement, expectations: dict) -> dict:
+    result = {}
+    if expectations.get('visible'):
+        result['visible'] = element.visible
+    if expectations.get('text'):
+        result['text'] = expectations['text'] in element.text
+    return result
+
+
+def _wrap(value):
+    if isinstance(value, FakeElement):
+        return {ELEMENT_KEY: value.ref}
+    elif isinstance(value, dict):
+        return {k: _wrap(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_wrap(x) for x in value]
+    return value
+
+
+def _unwrap(dom: FakeDOM, value):
+    if isinstance(value, dict):
+        if ELEMENT_KEY in value:
+            return _element(dom, value[ELEMENT_KEY])
+        return {k: _unwrap(dom, v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_unwrap(dom, x) for x in value]
+    return value
+
+
+def _element(dom: FakeDOM, element_id: str) -> FakeElement:
+    element = dom.get(element_id)
+    if element is None:
+        raise _WebDriverError(404, 'stale element reference', f'Element {element_id} is not attached to the page')
+    return element
+
+
+# WebDriver commands
+
+def _new_session(server: FakeServer, body, *_):
+    # Like chromedriver, the session is not created when nothing answers at the debugger address
+    options = (body or {}).get('capabilities', {}).get('alwaysMatch', {}).get('goog:chromeOptions', {})
+    if address := options.get('debuggerAddress'):
+        host, _, port = address.rpartition(':')
+        try:
+            socket.create_connection((host, int(port)), timeout=1).close()
+        except OSError:
+            raise _WebDriverError(500, 'session not created', f'cannot connect to chrome at {address}')
+
+    session_id = uuid.uuid4().hex
+    server.sessions.add(session_id)
+    return {
+        'sessionId': session_id,
+        'capabilities': {'browserName': 'chrome', 'browserVersion': '120.0.0.0', 'platformName': 'linux'},
+    }
+
+
+def _delete_session(server: FakeServer, body, session_id):
+    server.sessions.discard(session_id)
+
+
+def _execute(server: FakeServer, body, session_id, mode):
+    dom = server.dom
+    script, args = body['script'], body.get('args', [])
+
+    if 'window.__spectronpy =' in script:
+        dom.runtime_installed = True
+        return None
+    if _IS_DISPLAYED in script:
+        return args[0].visible
+    if _GET_ATTRIBUTE in script:
+        return args[0].attribute(args[1])
+    if 'process.versions.electron' in script:
+        return '0.0.0-bench'
+    if 'document.readyState' in script:
+        return 'complete'
+
+    if call := _RUNTIME_CALL.search(script):
+        if not dom.runtime_installed:
+            return _MISSING
+        if call.group(1) == 'observe':
+            return dom.observe(*args)
+        return dom.predicate(call.group(1), args)
+
+    return None
+
+
+def _find_elements(server: FakeServer, body, session_id):
+    return server.dom.locate(body['using'], body['value'])
+
+
+def _find_element(server: FakeServer, body, session_id):
+    if found := server.dom.locate(body['using'], body['value']):
+        return found[0]
+    raise _WebDriverError(404, 'no such element', f"Unable to locate element: {body['value']}")
+
+
+def _cdp(server: FakeServer, body, session_id):
+    if body['cmd'] == 'Page.captureScreenshot':
+        return {'data': PNG}
+    return {}
+
+
+def _navigate(server: FakeServer, body, session_id):
+    server.dom.navigate(body['url'])
+
+
+_ROUTES = [(method, re.compile(pattern), handler) for method, pattern, handler in [
+    ('GET', r'/json/version', lambda s, b: {'Browser': 'Chrome/120.0.0.0', 'Protocol-Version': '1.3'}),
+    ('GET', r'/json(?:/list)?', lambda s, b: [{'id': 'page', 'type': 'page', 'title': s.dom.title, 'url': s.dom.url,
+                                               'webSocketDebuggerUrl': f'ws://127.0.0.1:{s.port}/devtools/page/page'}]),
+    ('GET', r'/status', lambda s, b: {'ready': True, 'message': 'bench'}),
+    ('GET', r'/shutdown', lambda s, b: None),
+    ('POST', r'/session', _new_session),
+    ('DELETE', r'/session/(\w+)', _delete_session),
+    ('POST', r'/session/(\w+)/timeouts', lambda s, b, sid: None),
+    ('POST', r'/session/(\w+)/execute/(sync|async)', _execute),
+    ('POST', r'/session/(\w+)/elements', _find_elements),
+    ('POST', r'/session/(\w+)/element', _find_element),
+    ('GET', r'/session/(\w+)/title', lambda s, b, sid: s.dom.title),
+    ('GET', r'/session/(\w+)/url', lambda s, b, sid: s.dom.url),
+    ('POST', r'/session/(\w+)/url', _navigate),
+    ('POST', r'/session/(\w+)/refresh', lambda s, b, sid: s.dom.navigate(s.dom.url)),
+    ('GET', r'/session/(\w+)/window', lambda s, b, sid: 'main'),
+    ('GET', r'/session/(\w+)/window/handles', lambda s, b, sid: ['main']),
+    ('POST', r'/session/(\w+)/window', lambda s, b, sid: None),
+    ('DELETE', r'/session/(\w+)/window', lambda s, b, sid: []),
+    ('GET', r'/session/(\w+)/screenshot', lambda s, b, sid: PNG),
+    ('POST', r'/session/(\w+)/goog/cdp/execute', _cdp),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/text', lambda s, b, sid, eid: _element(s.dom, eid).text),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/name', lambda s, b, sid, eid: _element(s.dom, eid).tag),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/enabled', lambda s, b, sid, eid: _element(s.dom, eid).enabled),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/displayed', lambda s, b, sid, eid: _element(s.dom, eid).visible),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/attribute/([\w-]+)',
+     lambda s, b, sid, eid, name: _element(s.dom, eid).attribute(name)),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/property/([\w-]+)',
+     lambda s, b, sid, eid, name: _element(s.dom, eid).attribute(name)),
+    ('GET', r'/session/(\w+)/element/([\w-]+)/rect',
+     lambda s, b, sid, eid: {'x': 0, 'y': 20 * int(_element(s.dom, eid).id[1:]), 'width': 100, 'height': 20}),
+    ('POST', r'/session/(\w+)/element/([\w-]+)/click', lambda s, b, sid, eid: _element(s.dom, eid) and None),
+    ('POST', r'/session/(\w+)/element/([\w-]+)/clear', lambda s, b, sid, eid: _element(s.dom, eid) and None),
+    ('POST', r'/session/(\w+)/element/([\w-]+)/value', lambda s, b, sid, eid: _element(s.dom, eid) and None),
+]]
+
+
+# DevTools protocol
+
+_CDP_CALL = re.compile(r'window\.__spectronpy_cdp \? window\.__spectronpy_cdp\.(\w+)\((.*)\) : "\w+"', re.S)
+
+
+class _DevToolsSession:
+    """One DevTools WebSocket connection. Every message is answered on its own thread, like in the renderer."""
+
+    def __init__(self, handler: _Handler):
+        self.handler = handler
+        self.server: FakeServer = handler.server
+        self._send_lock = threading.Lock()
+
+    def serve(self) -> None:
+        handler = self.handler
+        handler.send_response(101)
+        handler.send_header('Upgrade', 'websocket')
+        handler.send_header('Connection', 'Upgrade')
+        handler.send_header('Sec-WebSocket-Accept', cdp.accept_key(handler.headers['Sec-WebSocket-Key']))
+        handler.end_headers()
+        handler.wfile.flush()
+        handler.close_connection = True
+
+        while True:
+            try:
+                _, opcode, payload = cdp.read_frame(handler.rfile)
+            except (OSError, ConnectionError):
+                break
+
+            if opcode == cdp.OP_CLOSE:
+                self._send_frame(cdp.OP_CLOSE, payload)
+                break
+            if opcode == cdp.OP_TEXT:
+                threading.Thread(target=self._answer, args=(json.loads(payload),), daemon=True).start()
+
+        self.server.fetch_patterns.pop(self, None)
+
+    def _answer(self, message: dict) -> None:
+        self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        method, params = message['method'], message.get('params', {})
+        handler = getattr(self, '_' + method.replace('.', '_'), None)
+        if handler is None:
+            return self._send({'id': message['id'], 'error': {'code': -32601, 'message': f"'{method}' wasn't found"}})
+
+        self._send({'id': message['id'], 'result': handler(params) or {}})
+
+    def _send(self, message: dict) -> None:
+        self._send_frame(cdp.OP_TEXT, json.dumps(message).encode('utf8'))
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        try:
+            with self._send_lock:
+                self.handler.connection.sendall(cdp.encode_frame(opcode, payload, mask=False))
+        except OSError:
+            pass
+
+    def _loaded(self) -> None:
+        self._send({'method': 'Page.loadEventFired', 'params': {'timestamp': time.monotonic()}})
+
+    # Commands
+
+    def _Page_enable(self, params):
+        pass
+
+    def _Page_navigate(self, params):
+        self.server.dom.navigate(params['url'])
+        self._loaded()
+        return {'frameId': 'main', 'loaderId': uuid.uuid4().hex}
+
+    def _Page_reload(self, params):
+        self.server.dom.navigate(self.server.dom.url)
+        self._loaded()
+
+    def _Page_captureScreenshot(self, params):
+        return {'data': PNG}
+
+    def _Page_close(self, params):
+        pass
+
+    def _Fetch_enable(self, params):
+        self.server.fetch_patterns[self] = params.get('patterns') or [{'urlPattern': '*'}]
+
+    def _Fetch_disable(self, params):
+        self.server.fetch_patterns.pop(self, None)
+
+    def _Fetch_continueRequest(self, params):
+        self.server._resume(params, {'action': 'continue'})
+
+    def _Fetch_failRequest(self, params):
+        self.server._resume(params, {'action': 'fail', 'reason': params['errorReason']})
+
+    def _Fetch_fulfillRequest(self, params):
+        self.server._resume(params, {
+            'action': 'fulfill',
+            'status': params['responseCode'],
+            'headers': {x['name']: x['value'] for x in params.get('responseHeaders', [])},
+            'body': base64.b64decode(params.get('body', '')).decode('utf8', 'replace'),
+        })
+
+    def _Fetch_getResponseBody(self, params):
+        return {'body': self.server.paused[params['requestId']][2], 'base64Encoded': False}
+
+    def _Input_dispatchMouseEvent(self, params):
+        pass
+
+    def _Input_dispatchKeyEvent(self, params):
+        pass
+
+    def _Input_insertText(self, params):
+        pass
+
+    def _Runtime_evaluate(self, params):
+        dom = self.server.dom
+        expression = params['expression']
+
+        if 'window.__spectronpy_cdp =' in expression:
+            dom.cdp_installed = True
+            return {'result': {'type': 'undefined'}}
+
+        call = _CDP_CALL.fullmatch(expression)
+        if call is None:
+            return {'result': {'type': 'undefined'}}
+        if not dom.cdp_installed:
+            return {'result': {'type': 'string', 'value': cdp._MISSING}}
+
+        op, args = call.groups()
+        try:
+            if op == 'script':
+                script, _, args = args[len('function () {\n'):].rpartition('\n}, ')
+                args, is_async, _ = json.loads(f'[{args}]')
+                value = _execute(self.server, {'script': script, 'args': _unwrap(dom, args)}, None,
+                                 'async' if is_async else 'sync')
+            else:
+                value = getattr(self, f'_cdp_{op}')(dom, *_unwrap(dom, json.loads(f'[{args}]')))
+            rtn = {'value': _wrap(value)}
+        except _WebDriverError as e:
+            rtn = {'error': e.error, 'message': e.message}
+
+        return {'result': {'type': 'object', 'value': rtn}}
+
+    # window.__spectronpy_cdp functions
+
+    @staticmethod
+    def _cdp_find(dom: FakeDOM, using, value, parent, multiple):
+        found = dom.locate(using, value)
+        return found if multiple else found[:1]
+
+    @staticmethod
+    def _cdp_element(dom: FakeDOM, name, element_id, arg=None):
+        element = _element(dom, element_id)
+        if name == 'text':
+            return element.text
+        elif name == 'tag':
+            return element.tag
+        elif name in ('attribute', 'property'):
+            return element.attribute(arg)
+        elif name == 'enabled':
+            return element.enabled
+        elif name == 'rect':
+            return {'x': 0, 'y': 20 * dom.elements.index(element), 'width': 100, 'height': 20}
+        elif name == 'center':
+            return {'x': 50, 'y': 10}
+        return None
+
+    @staticmethod
+    def _cdp_page(dom: FakeDOM, name):
+        return {'title': dom.title, 'url': dom.url, 'source': '<html></html>'}[name]
+
+
+def main(argv: list[str] = None) -> None:
+    # Accepts the arguments of chromedriver (--port) and Electron (--remote-debugging-port), ignores the rest
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--remote-debugging-port', type=int)
+    parser.add_argument('--elements', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0, help='milliseconds added to every request')
+    args, _ = parser.parse_known_args(argv)
+
+    port = args.port or args.remote_debugging_port or 0
+    server = FakeServer(port, FakeDOM(args.elements), args.latency / 1000)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,325 @@
+# run.py
+"""
+Benchmarks finders, assertions, matcher waits and the Application lifecycle against the fake WebDriver server,
+and the import time of the package in a fresh interpreter.
+
+    python -m bench                                   # default grid, prints a table
+    python -m bench --elements 10,1000 --latency 0,5  # elements in the DOM x milliseconds per round trip
+    python -m bench --backend cdp                     # DevTools protocol backend only
+    python -m bench --import-budget 30                # exit code 1 when `import spectronpy` takes longer
+    python -m bench --save baseline.json
+    python -m bench --baseline baseline.json --threshold 1.25   # exit code 1 on regressions
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+
+from spectronpy import Application, Session, SpectronDriver, SpectronService, assert_selector
+from spectronpy import cdp
+from spectronpy import expected
+from spectronpy import finders, matchers
+from spectronpy.logging import basic_config
+
+from . import fake_server
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Differences below this are jitter, whatever the ratio
+NOISE_FLOOR = 0.0005
+
+# Milliseconds each import case may take, median of fresh interpreters
+DEFAULT_IMPORT_BUDGET = 50
+
+# statement: top level packages it must not load
+IMPORT_CASES = {
+    'import spectronpy': ('selenium', 'psutil', 'webdriver_manager', 'urllib3'),
+    'from spectronpy import Configuration, Session': ('selenium', 'psutil', 'webdriver_manager', 'urllib3'),
+}
+
+_IMPORT_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - started
+print(json.dumps({'seconds': seconds, 'loaded': sorted({x.split('.')[0] for x in sys.modules} & set(sys.argv[2:]))}))
+'''
+
+
+class BenchService(SpectronService):
+    """Points the driver at the in-process fake server instead of a chromedriver process."""
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def is_running(self) -> bool:
+        return True
+
+
+def connect(server: fake_server.FakeServer, wait_strategy: str = 'observer',
+            backend: str = 'chromedriver') -> SpectronDriver:
+    address = f'127.0.0.1:{server.port}'
+    session = Session(selector=By.CSS_SELECTOR, wait_strategy=wait_strategy)
+
+    if backend == 'cdp':
+        driver = cdp.CDPDriver(address, session)
+    else:
+        options = Options()
+        options.debugger_address = address
+        driver = SpectronDriver({'options': options, 'service': BenchService('fake-chromedriver', port=server.port)},
+                                session)
+    driver.update_wait(2)
+    session.activate()
+
+    return driver
+
+
+def measure(fn: Callable, repeat: int, setup: Callable = None) -> dict:
+    """Runs fn once to warm up, then `repeat` times. Durations in seconds."""
+    samples = []
+
+    for i in range(repeat + 1):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        if i:
+            samples.append(time.perf_counter() - started)
+
+    return _summary(samples)
+
+
+def driver_cases(dom: fake_server.FakeDOM, elements: int) -> dict[str, tuple[Callable, Callable]]:
+    """name: (setup, fn), run with the session bound to the fake server."""
+    visible = (elements + 1) // 2
+    last = f'#e{elements - 1}'
+
+    def reset_title():
+        dom.set_title('SpectronPy Bench')
+
+    def title_later():
+        reset_title()
+        dom.set_title('Ready', delay=0.02)
+
+    return {
+        'finders.all': (None, lambda: finders.all('.item')),
+        'finders.all[visible]': (None, lambda: finders.all('.item', visible=True)),
+        'finders.all[text]': (None, lambda: finders.all('.item', text=f'Item {elements - 1}')),
+        'finders.element': (None, lambda: finders.element(last)),
+        'finders.all+texts': (None, lambda: finders.all('.item').texts()),
+        'assert_selector[count,visible]': (None, lambda: assert_selector('.item', count=visible, visible=True)),
+        'matchers.Title.has': (reset_title, lambda: matchers.Title.has('bench', case_insensitive=True)),
+        'matchers.Element.to_have_text': (None, lambda: matchers.Element.to_have_text(last, f'Item {elements - 1}')),
+        'matchers.Title.has[after 20ms]': (title_later, lambda: matchers.Title.has('Ready')),
+        'matchers.any_of[after 20ms]': (title_later, lambda: matchers.any_of(
+            expected.title_is('Error'),
+            expected.title_is('Ready'),
+        )),
+    }
+
+
+def run_driver_cases(elements: int, latency: float, repeat: int, strategies: list[str],
+                     backends: list[str] = ('chromedriver',)) -> dict[str, dict]:
+    results = {}
+    server = fake_server.start(elements=elements, latency=latency)
+
+    try:
+        for backend in backends:
+            # Keys without a backend stay comparable with baselines saved before the cdp backend
+            suffix = '' if backend == 'chromedriver' else f' backend={backend}'
+            for strategy in strategies:
+                driver = connect(server, strategy, backend)
+                try:
+                    for name, (setup, fn) in driver_cases(server.dom, elements).items():
+                        key = f'{name} strategy={strategy} elements={elements} latency={latency * 1000:g}ms{suffix}'
+                        requests = server.requests
+                        results[key] = measure(fn, repeat, setup)
+                        results[key]['requests'] = (server.requests - requests) // (repeat + 1)
+                finally:
+                    driver.quit()
+    finally:
+        server.stop()
+
+    return results
+
+
+def run_lifecycle(latency: float, repeat: int, reuse: bool) -> dict[str, dict]:
+    """Application.start/stop with the fake server standing in for the Electron app and chromedriver processes."""
+    folder = tempfile.mkdtemp(prefix='spectronpy-bench-')
+
+    try:
+        electron = _launcher(folder, 'electron', latency)
+        chromedriver = _launcher(folder, 'chromedriver', latency)
+        app = Application(electron, config={
+            'chromedriver_path': chromedriver,
+            'chromedriver_reuse': reuse,
+            'stop_timeout': 2000,
+        })
+
+        key = f'Application.start+stop reuse={reuse} latency={latency * 1000:g}ms'
+        result = measure(lambda: (app.start(), app.stop()), repeat)
+        result['boot_timings'] = app.boot_timings
+        return {key: result}
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def run_imports(repeat: int) -> dict[str, dict]:
+    """Import time of each IMPORT_CASES statement, every sample in a new interpreter so nothing is cached."""
+    results = {}
+    env = os.environ | {'PYTHONPATH': os.pathsep.join([str(ROOT)] + sys.path)}
+
+    for statement, forbidden in IMPORT_CASES.items():
+        samples, loaded = [], set()
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT, statement, *forbidden], env=env,
+                                 capture_output=True, text=True, check=True)
+            sample = json.loads(out.stdout)
+            samples.append(sample['seconds'])
+            loaded.update(sample['loaded'])
+
+        results[statement] = _summary(samples) | {'loaded': sorted(loaded)}
+
+    return results
+
+
+def check_imports(results: dict, budget: float) -> list[str]:
+    """Import cases over the budget in milliseconds, or loading packages they should leave to first use."""
+    failures = []
+
+    for statement in IMPORT_CASES:
+        result = results[statement]
+        if result['median'] * 1000 > budget:
+            failures.append(f'{statement}: {result["median"] * 1000:.2f}ms, budget {budget:g}ms')
+        if result['loaded']:
+            failures.append(f'{statement}: loads {", ".join(result["loaded"])}')
+
+    return failures
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases whose median got slower than `threshold` times the baseline median."""
+    regressions = []
+
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+
+        before, after = baseline[key]['median'], result['median']
+        if after > before * threshold and after - before > NOISE_FLOOR:
+            regressions.append(f'{key}: {before * 1000:.2f}ms -> {after * 1000:.2f}ms ({after / before:.2f}x)')
+
+    return regressions
+
+
+def report(results: dict, baseline: dict = None) -> str:
+    width = max(len(x) for x in results)
+    lines = [f"{'case'.ljust(width)}  {'median':>9}  {'p95':>9}  {'reqs':>5}" + ('  baseline' if baseline else '')]
+
+    for key, result in results.items():
+        line = f"{key.ljust(width)}  {result['median'] * 1000:7.2f}ms  {result['p95'] * 1000:7.2f}ms"
+        line += f"  {result.get('requests', ''):>5}"
+        if baseline and key in baseline:
+            line += f"  {result['median'] / baseline[key]['median']:.2f}x"
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m bench', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--elements', default='10,100,1000', help='comma separated element counts')
+    parser.add_argument('--latency', default='0,2', help='comma separated round trip latencies in milliseconds')
+    parser.add_argument('--strategy', default='observer,poll', help='comma separated wait strategies')
+    parser.add_argument('--backend', default='chromedriver,cdp', help='comma separated backends, chromedriver or cdp')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--lifecycle-repeat', type=int, default=3)
+    parser.add_argument('--no-lifecycle', action='store_true', help='skip Application.start/stop')
+    parser.add_argument('--import-repeat', type=int, default=10, help='fresh interpreters per import case')
+    parser.add_argument('--import-budget', type=float, default=DEFAULT_IMPORT_BUDGET,
+                        help='milliseconds each import case may take')
+    parser.add_argument('--save', help='write the results as JSON')
+    parser.add_argument('--baseline', help='results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio counted as a regression')
+    args = parser.parse_args(argv)
+
+    basic_config()
+    logging.getLogger('spectronpy').setLevel(logging.WARNING)
+
+    latencies = [float(x) / 1000 for x in args.latency.split(',')]
+    strategies = args.strategy.split(',')
+    backends = args.backend.split(',')
+    results = run_imports(args.import_repeat)
+
+    for latency in latencies:
+        for elements in [int(x) for x in args.elements.split(',')]:
+            results |= run_driver_cases(elements, latency, args.repeat, strategies, backends)
+
+        if not args.no_lifecycle:
+            for reuse in (True, False):
+                results |= run_lifecycle(latency, args.lifecycle_repeat, reuse)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    print(report(results, baseline))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'results': results}, f,
+                      indent=2)
+
+    if failures := check_imports(results, args.import_budget):
+        print(f'\n{len(failures)} import budget failure(s):', file=sys.stderr)
+        print('\n'.join(failures), file=sys.stderr)
+        return 1
+
+    if baseline:
+        if regressions := compare(results, baseline, args.threshold):
+            print(f'\n{len(regressions)} regression(s) above {args.threshold}x:', file=sys.stderr)
+            print('\n'.join(regressions), file=sys.stderr)
+            return 1
+        print(f'\nNo regressions above {args.threshold}x.')
+
+    return 0
+
+
+def _launcher(folder: str, name: str, latency: float) -> str:
+    path = os.path.join(folder, name)
+    python_path = os.pathsep.join([str(ROOT)] + sys.path)
+
+    with open(path, 'w') as f:
+        f.write(f'#!/bin/sh\n'
+                f'PYTHONPATH="{python_path}" exec "{sys.executable}" -m bench.fake_server '
+                f'--latency={latency * 1000:g} "$@"\n')
+    os.chmod(path, 0o755)
+
+    return path
+
+
+def _summary(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        'median': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'min': samples[0],
+        'repeat': len(samples),
+    }
@@ -2,18 +2,19 @@
 from datetime import datetime
 from behave.model import Scenario, Step
 from behave.runner import Context
-from lib.application import Application
+from lib import deadline
+from lib.logging import basic_config
+from lib.pool import ApplicationPool
 
 
 # -----------------------------------------------------------------------------
 # HOOKS:
 # -----------------------------------------------------------------------------
-# def before_all(context):
+def before_all(context: Context):
+    basic_config()
 
-# def before_feature(context, feature):
-
-def before_scenario(context: Context, scenario: Scenario):
-    context.app = Application(
+    # Boot the applications once, scenarios lease a warm instance
+    context.pool = ApplicationPool(
         app_path='/Applications/Slack.app/Contents/MacOS/Slack',
         chromedriver_version="96.0.4664.35",
         config={
@@ -21,15 +22,25 @@ def before_scenario(context: Context, scenario: Scenario):
             'electron_log_path': 'logs/electron.log',
             'chromedriver_log_path': 'logs/chrome.log',
             'wait_timeout': 3000,
-        }
+        },
+        size=1
     )
+    context.pool.start()
+
+# def before_feature(context, feature):
+
+def before_scenario(context: Context, scenario: Scenario):
+    context.app = context.pool.lease()
 
 
 # def before_tag(context, tag):
 
-# def before_step(context, step):
+def before_step(context, step: Step):
+    # Every wait of the step shares one wait_timeout budget
+    context.step_deadline = deadline.start()
 
-# def after_all(context):
+def after_all(context: Context):
+    context.pool.stop()
 
 # def after_feature(context, features):
 
@@ -38,11 +49,12 @@ def after_scenario(context: Context, scenario: Scenario):
     time = datetime.now().strftime("%H:%M:%S")
     context.app.take_screenshot(f'{scenario.name}-{time}.png', folder='screenshots')
 
-    # Cleanup
-    context.app.stop()
+    # Reset the application and return it to the pool
+    context.pool.release(context.app)
 
 
 # def after_tag(context, tag):
 
 def after_step(context, step: Step):
+    deadline.reset(context.step_deadline)
     print()
@@ -4,7 +4,8 @@ from behave import Given, When, Then
 
 @Given('the electron application starts')
 def step_impl(context):
-    context.app.start()
+    if not context.app.is_running():
+        context.app.start()
 
 
 @When('the application is visible')
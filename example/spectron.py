@@ -4,6 +4,9 @@ from pathlib import Path
 from selenium.webdriver.common.by import By
 
 from spectronpy import Application, assert_selector
+from spectronpy.logging import basic_config
+
+basic_config()
 
 # Optional
 config = {
@@ -3,6 +3,9 @@
 
 from selenium.webdriver.common.by import By
 from spectronpy import Application, assert_selector
+from spectronpy.logging import basic_config
+
+basic_config()
 
 # Optional
 config = {
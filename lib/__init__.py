@@ -1,31 +1,96 @@
-from .application import Application
-from .assertions import assert_selector, assert_no_selector
-from .configuration import Configuration
-from .driver import SpectronDriver
-from .element import SpectronElement, wrap_element
-from .exception import (
-    POpenError,
-    InvalidArgument,
-    UnsupportedOS,
-    NotInitialized,
-    ClientError,
-    ExpectationNotMet,
-    AmbiguousMatch
-)
-from .expected import title_contains, text_to_be_present_in_element
-from .globals import (
-    get_driver,
-    get_default_wait_time,
-    get_default_selector,
-    initialize
-)
-from .helper import to_seconds, generate_target
-from .result import Result, ResultDict
-
-import logging
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='[%(asctime)s] %(levelname)s [%(name)s:%(lineno)s] %(message)s',
-    datefmt="%Y-%m-%dT%H:%M:%S"
-)
\ No newline at end of file
+# __init__.py
+# Names are loaded on first access (PEP 562), so `import spectronpy` stays cheap and selenium, psutil and the
+# chromedriver downloader are only imported once something uses them.
+import importlib
+import importlib.util
+from typing import TYPE_CHECKING
+
+_attributes = {
+    'Application': 'application',
+    'assert_selector': 'assertions',
+    'assert_no_selector': 'assertions',
+    'Configuration': 'configuration',
+    'SpectronDriver': 'driver',
+    'ElementCollection': 'element',
+    'SpectronElement': 'element',
+    'wrap_element': 'element',
+    'POpenError': 'exception',
+    'InvalidArgument': 'exception',
+    'UnsupportedOS': 'exception',
+    'NotInitialized': 'exception',
+    'ClientError': 'exception',
+    'ExpectationNotMet': 'exception',
+    'AmbiguousMatch': 'exception',
+    'NotReady': 'exception',
+    'DriverNotFound': 'exception',
+    'PortUnavailable': 'exception',
+    'CDPError': 'exception',
+    'title_contains': 'expected',
+    'text_to_be_present_in_element': 'expected',
+    'get_driver': 'globals',
+    'get_default_wait_time': 'globals',
+    'get_default_selector': 'globals',
+    'initialize': 'globals',
+    'to_seconds': 'helper',
+    'generate_target': 'helper',
+    'ApplicationPool': 'pool',
+    'Result': 'result',
+    'ResultDict': 'result',
+    'SpectronService': 'service',
+    'Session': 'session',
+}
+
+__all__ = list(_attributes)
+
+# The `globals` submodule replaces the builtin in this namespace once it is imported
+_namespace = globals()
+
+
+def __getattr__(name):
+    if name in _attributes:
+        value = getattr(importlib.import_module(f'.{_attributes[name]}', __name__), name)
+    elif name.isidentifier() and not name.startswith('_') and importlib.util.find_spec(f'.{name}', __name__):
+        # Submodules, e.g. `spectronpy.finders` after a plain `import spectronpy`
+        value = importlib.import_module(f'.{name}', __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    _namespace[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(_namespace) | set(_attributes))
+
+
+if TYPE_CHECKING:
+    from .application import Application
+    from .assertions import assert_selector, assert_no_selector
+    from .configuration import Configuration
+    from .driver import SpectronDriver
+    from .element import ElementCollection, SpectronElement, wrap_element
+    from .exception import (
+        POpenError,
+        InvalidArgument,
+        UnsupportedOS,
+        NotInitialized,
+        ClientError,
+        ExpectationNotMet,
+        AmbiguousMatch,
+        NotReady,
+        DriverNotFound,
+        PortUnavailable,
+        CDPError
+    )
+    from .expected import title_contains, text_to_be_present_in_element
+    from .globals import (
+        get_driver,
+        get_default_wait_time,
+        get_default_selector,
+        initialize
+    )
+    from .helper import to_seconds, generate_target
+    from .pool import ApplicationPool
+    from .result import Result, ResultDict
+    from .service import SpectronService
+    from .session import Session
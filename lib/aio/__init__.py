@@ -0,0 +1,10 @@
+from . import finders
+from . import matchers
+from .application import AsyncApplication
+from .assertions import assert_selector, assert_no_selector
+from .connection import AsyncConnection
+from .driver import AsyncDriver, AsyncElement, AsyncElementCollection
+from .snapshot import AsyncSnapshot
+
+find = finders
+match = matchers
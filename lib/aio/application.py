@@ -0,0 +1,253 @@
+# application.py
+import asyncio
+import atexit
+import logging
+import time
+from typing import Optional
+
+from selenium.common import JavascriptException
+
+from .. import helper
+from .. import screenshot
+from .. import session
+from ..application import _EXPORT_LOCAL_STORAGE, _IMPORT_LOCAL_STORAGE, LOG_DRAIN_TIMEOUT, BaseApplication
+from ..checkpoint import Checkpoint
+from ..devtools import INITIAL_DELAY, MAX_DELAY
+from ..exception import ClientError, InvalidArgument, NotReady, POpenError
+from ..service import SpectronService
+from .connection import AsyncConnection
+from .driver import AsyncDriver, AsyncElement
+from .snapshot import AsyncSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncApplication(BaseApplication):
+    """
+    Application with an async lifecycle, driven through AsyncDriver on a non-blocking connection.
+
+        app = AsyncApplication(app_path, chromedriver_version, config)
+        await app.start()
+        await app.client.match.Title.has('slack')
+        await app.stop()
+    """
+
+    def __init__(self, app_path: str, chromedriver_version: str = '', config=None):
+        super().__init__(app_path, chromedriver_version, config)
+        self._client: Optional[AsyncDriver] = None
+        self._service: Optional[SpectronService] = None
+
+    async def start(self) -> None:
+        """Start App and Client."""
+        started = time.perf_counter()
+
+        self.start_app()
+        spawned = time.perf_counter()
+
+        try:
+            await self.wait_until_devtools_ready()
+            # Before the session, the sooner the app's requests are intercepted the better
+            await asyncio.to_thread(self.intercept.start, self.port)
+            ready = time.perf_counter()
+
+            await self.start_client()
+            created = time.perf_counter()
+        except BaseException:
+            if self._service is not None and not self.config.chromedriver_reuse:
+                await asyncio.to_thread(self._service.stop)
+            await asyncio.to_thread(self._abort_start)
+            raise
+
+        self.boot_timings = {
+            'spawn': spawned - started,
+            'devtools_ready': ready - spawned,
+            'session_created': created - ready,
+            'total': created - started,
+        }
+        logger.info("Boot timings:: " + ", ".join(f"{k}: {v:.3f}s" for k, v in self.boot_timings.items()))
+
+        await self.client.update_wait(helper.to_seconds(self.config.wait_timeout))
+
+        self._register_close_events()
+        self.running = True
+
+        session.set_default(self.session)
+        self._activation = self.session.activate()
+
+        if self._pending_storage:
+            await self._import_local_storage(self._pending_storage)
+            self._pending_storage = {}
+
+    async def stop(self) -> None:
+        """Close App and Client."""
+        if not self.is_running():
+            return
+
+        await self.switch_to_main_window()
+        await self.client.close()
+        await self.client.quit()
+        self._collect_results()
+        await asyncio.to_thread(self.intercept.stop)
+
+        if not self.config.chromedriver_reuse:
+            await asyncio.to_thread(self._service.stop)
+
+        await self.terminate()
+        await asyncio.to_thread(self.screenshots.flush, helper.to_seconds(self.config.stop_timeout))
+        await asyncio.to_thread(self.logs.close, LOG_DRAIN_TIMEOUT)
+
+        logger.info("Application closed.")
+        self._cleanup()
+
+    async def terminate(self) -> None:
+        """`Application.terminate()` without blocking the event loop."""
+        await asyncio.to_thread(self._terminate)
+
+    async def restart(self) -> None:
+        await self.stop()
+        await self.start()
+
+    async def start_client(self) -> AsyncDriver:
+        if self.is_running():
+            return self.client
+
+        if self.config.backend != 'chromedriver':
+            raise InvalidArgument(f"AsyncApplication only supports the chromedriver backend -- {self.config.backend}")
+
+        self._service = await asyncio.to_thread(self._build_chrome_service)
+        await asyncio.to_thread(self._service.start)
+
+        capabilities = self._build_chrome_options().to_capabilities()
+        connection = AsyncConnection('localhost', self._service.port)
+
+        timeout_seconds = helper.to_seconds(self.config.start_timeout)
+        try:
+            self._client = await asyncio.wait_for(
+                AsyncDriver.create(connection, capabilities, self.session, self.config.metrics),
+                timeout=timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Took longer than {timeout_seconds} seconds to start.")
+            raise
+
+        logger.info("WebDriver started.")
+        logger.info(f"Application Electron version: {await self._electron_version()}")
+
+        return self.client
+
+    async def wait_until_devtools_ready(self) -> dict:
+        """Poll the DevTools endpoint until the renderer accepts connections, without blocking the event loop."""
+        timeout_seconds = helper.to_seconds(self.config.start_timeout)
+        deadline = time.monotonic() + timeout_seconds
+        delay = INITIAL_DELAY
+        connection = AsyncConnection('localhost', self.port, timeout=1)
+
+        try:
+            while True:
+                if self._app.poll() is not None:
+                    raise POpenError(f"Application exited with code {self._app.returncode} before DevTools was ready.")
+
+                try:
+                    if not self.devtools_version:
+                        _, self.devtools_version = await connection.request('GET', '/json/version')
+                    _, targets = await connection.request('GET', '/json/list')
+                    if any(x.get('type') == 'page' for x in targets):
+                        break
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                    pass
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise NotReady(f"DevTools on port {self.port} not ready after {timeout_seconds} seconds.")
+
+                await asyncio.sleep(min(delay, remaining))
+                delay = min(delay * 2, MAX_DELAY)
+        finally:
+            await connection.close()
+
+        logger.info(f"DevTools ready: {self.devtools_version.get('Browser', '')}")
+        return self.devtools_version
+
+    async def checkpoint(self, name: str, local_storage: bool = False, restart: bool = True) -> Checkpoint:
+        """Async `Application.checkpoint()`, the user data directory is copied in a thread."""
+        if not self.user_data_dir:
+            raise InvalidArgument("Checkpoints need the user_data_dir option or a restored checkpoint.")
+
+        running = self.is_running()
+        storage = None
+        if local_storage:
+            if not running:
+                raise ClientError("Exporting localStorage needs a running application.")
+            await self.switch_to_main_window()
+            storage = await self.client.execute_script(_EXPORT_LOCAL_STORAGE)
+
+        await self.stop()
+        rtn = await asyncio.to_thread(self.checkpoints.create, name, self.user_data_dir, storage)
+
+        if running and restart:
+            await self.start()
+        return rtn
+
+    async def restore(self, name: str, start: bool = True) -> Checkpoint:
+        """Async `Application.restore()`, the checkpoint is cloned in a thread."""
+        await self.stop()
+        await asyncio.to_thread(self._discard_instance)
+
+        rtn, instance_dir = await asyncio.to_thread(self.checkpoints.restore, name)
+        self._use_instance(rtn, instance_dir)
+
+        if start:
+            await self.start()
+        return rtn
+
+    async def switch_to_main_window(self) -> None:
+        await self.client.switch_to_window((await self.client.window_handles())[0])
+
+    async def take_screenshot(self, filename=None, folder=None, quality=None, clip=None) -> Optional[str]:
+        """Async `Application.take_screenshot()`, clip may be an AsyncElement."""
+        if self.is_running() is False:
+            return None
+
+        path = self._screenshot_path(filename, folder)
+
+        if isinstance(clip, AsyncElement):
+            clip = await clip.rect()
+
+        logger.info(f'Saving screenshot to "{path}"')
+        data = (await self.client.execute_cdp_cmd(
+            'Page.captureScreenshot',
+            screenshot.capture_params(path, quality, clip)
+        ))['data']
+        # submit() only blocks while the write queue is full
+        await asyncio.to_thread(self.screenshots.submit, path, data)
+
+        return path
+
+    def snapshot(self) -> AsyncSnapshot:
+        """Async `Application.snapshot()`, used with `async with`."""
+        return AsyncSnapshot(self.session)
+
+    # private
+
+    async def _electron_version(self) -> str:
+        try:
+            return await self.client.execute_script("return process.versions.electron;")
+        except JavascriptException as e:
+            logger.warning(e.msg)
+            return "Not available"
+
+    async def _import_local_storage(self, storage: dict) -> None:
+        await self.switch_to_main_window()
+        count = await self.client.execute_script(_IMPORT_LOCAL_STORAGE, storage)
+        logger.info(f"Restored {count} localStorage item(s).")
+
+    def _register_close_events(self):
+        # atexit can't await, only make sure the Electron process tree doesn't outlive the interpreter
+        if not self._close_at_exit:
+            atexit.register(self._terminate_on_exit)
+            self._close_at_exit = True
+
+    def _terminate_on_exit(self):
+        if self.is_running():
+            self._terminate()
+            self._cleanup()
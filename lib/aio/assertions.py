@@ -0,0 +1,49 @@
+# assertions.py
+
+from .. import deadline
+from .. import session
+from ..assertions import _verify_match, _verify_no_match
+from ..evaluate import _filters
+from . import evaluate
+from . import snapshot
+from .driver import AsyncElement
+
+
+async def assert_selector(element_or_locator: AsyncElement | str, by=None, wait=None, **kwargs) -> None:
+    """Async `assertions.assert_selector()`, same parameters."""
+    default_kwargs = {
+        'count': 1,
+        'visible': False
+    }
+    expectations = default_kwargs | kwargs
+    results = await _evaluate(element_or_locator, by, wait, expectations)
+    _verify_match(results, expectations)
+
+
+async def assert_no_selector(element_or_locator: AsyncElement | str, by=None, wait=None, **kwargs) -> None:
+    """Async `assertions.assert_no_selector()`, same parameters."""
+    default_kwargs = {
+        'count': 0,
+        'visible': False
+    }
+    expectations = default_kwargs | kwargs
+    results = await _evaluate(element_or_locator, by, wait, expectations)
+    _verify_no_match(results, expectations)
+
+
+async def _evaluate(element_or_locator, by, wait, expectations):
+    ctx = session.current()
+
+    if by is None:
+        by = ctx.selector
+
+    if wait is None:
+        wait = ctx.wait_time
+
+    if snap := await snapshot.current(ctx):
+        results = snap.verify_all(element_or_locator, by, _filters(expectations))
+        if results is not None:
+            return results
+
+    with deadline.within(wait):
+        return await evaluate.verify_all(ctx.driver, element_or_locator, by, wait, expectations)
@@ -0,0 +1,99 @@
+# connection.py
+import asyncio
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncConnection:
+    """Non-blocking HTTP/1.1 JSON client for chromedriver and DevTools, keeping idle connections alive for reuse."""
+
+    def __init__(self, host: str, port: int, pool_size: int = 8, timeout: float = 120):
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+
+    async def request(self, method: str, path: str, payload: dict = None) -> tuple[int, dict]:
+        """Sends the request and returns the status code and the decoded JSON body."""
+        return await self.send(method, path, self.encode(payload))
+
+    async def send(self, method: str, path: str, body: bytes = b'') -> tuple[int, dict]:
+        """Same as `request()` with the body serialized by `encode()` already."""
+        head = f"{method} {path} HTTP/1.1\r\n" \
+               f"Host: {self.host}:{self.port}\r\n" \
+               f"Accept: application/json\r\n" \
+               f"Content-Type: application/json;charset=UTF-8\r\n" \
+               f"Content-Length: {len(body)}\r\n" \
+               f"Connection: keep-alive\r\n\r\n"
+
+        reused = bool(self._idle)
+        reader, writer = await self._acquire()
+
+        try:
+            writer.write(head.encode('latin-1') + body)
+            await writer.drain()
+            status, headers, data = await asyncio.wait_for(self._read_response(reader), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            writer.close()
+            if not reused:
+                raise
+            # The server closed the idle connection, retry once on a new one
+            logger.debug(f"Keep-alive connection closed by server, reconnecting. {e}")
+            self._close_idle()
+            return await self.send(method, path, body)
+        except BaseException:
+            writer.close()
+            raise
+
+        if headers.get('connection', '').lower() == 'close' or len(self._idle) >= self.pool_size:
+            writer.close()
+        else:
+            self._idle.append((reader, writer))
+
+        return status, json.loads(data.decode('utf8')) if data else {}
+
+    @staticmethod
+    def encode(payload: dict = None) -> bytes:
+        return json.dumps(payload).encode('utf8') if payload is not None else b''
+
+    async def close(self) -> None:
+        self._close_idle()
+
+    # private
+
+    async def _acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._idle:
+            return self._idle.pop()
+
+        return await asyncio.open_connection(self.host, self.port)
+
+    def _close_idle(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    @staticmethod
+    async def _read_response(reader: asyncio.StreamReader) -> tuple[int, dict, bytes]:
+        status_line = await reader.readuntil(b'\r\n')
+        if not status_line.strip():
+            raise asyncio.IncompleteReadError(status_line, None)
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while (line := await reader.readuntil(b'\r\n')) != b'\r\n':
+            key, _, value = line.decode('latin-1').partition(':')
+            headers[key.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = b''
+            while size := int((await reader.readuntil(b'\r\n')).split(b';')[0], 16):
+                data += await reader.readexactly(size)
+                await reader.readexactly(2)
+            await reader.readuntil(b'\r\n')
+        else:
+            data = await reader.readexactly(int(headers.get('content-length', 0)))
+
+        return status, headers, data
@@ -0,0 +1,297 @@
+# driver.py
+import base64
+import logging
+import re
+import time
+from typing import Optional
+
+from selenium.common import StaleElementReferenceException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+
+from .. import snapshot
+from ..element import BaseElementCollection, Locator, _count, _found_ids, _pick
+from ..metrics import CommandMetrics
+from ..session import Session
+from . import evaluate
+from .connection import AsyncConnection
+
+logger = logging.getLogger(__name__)
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+_error_handler = ErrorHandler()
+
+_ELEMENT_ID = re.compile(r'(?<=/element/)[^/]+')
+
+
+class AsyncDriver:
+    """W3C WebDriver session on a non-blocking connection. Mirrors the subset of WebDriver SpectronPy uses."""
+
+    def __init__(self, connection: AsyncConnection, session_id: str, capabilities: dict, session: Session = None,
+                 metrics: bool = False):
+        from . import finders
+        from . import matchers
+
+        self.connection = connection
+        self.session_id = session_id
+        self.capabilities = capabilities
+        self.session = session or Session()
+        self.session.driver = self
+        self.script_timeout = None
+        self.metrics: Optional[CommandMetrics] = CommandMetrics() if metrics else None
+        self.find = finders
+        self.match = matchers
+
+    @classmethod
+    async def create(cls, connection: AsyncConnection, capabilities: dict, session: Session = None,
+                     metrics: bool = False) -> 'AsyncDriver':
+        payload = {'capabilities': {'firstMatch': [{}], 'alwaysMatch': capabilities}}
+        value = await _execute(connection, 'POST', '/session', connection.encode(payload))
+
+        return cls(connection, value['sessionId'], value.get('capabilities', {}), session, metrics)
+
+    async def execute(self, method: str, path: str = '', payload: dict = None):
+        """Sends a command of this session, e.g. `execute('GET', '/title')`."""
+        payload = self._wrap_value(payload) if payload is not None else None
+        if self.session.snapshot is not None and _mutates(method, path, payload):
+            self.session.snapshot.invalidate()
+        body = self.connection.encode(payload)
+        started = time.perf_counter()
+
+        try:
+            value = await _execute(self.connection, method, f"/session/{self.session_id}{path}", body)
+        finally:
+            if self.metrics is not None:
+                # Recorded by endpoint, e.g. "GET /element/:id/text"
+                command = f"{method} {_ELEMENT_ID.sub(':id', path) or '/'}"
+                self.metrics.record(command, time.perf_counter() - started, size=len(body))
+
+        return self._unwrap_value(value)
+
+    async def quit(self) -> None:
+        try:
+            await self.execute('DELETE')
+        finally:
+            await self.connection.close()
+
+    async def update_wait(self, wait_time: float) -> None:
+        ms = int(wait_time * 1000)
+        await self.execute('POST', '/timeouts', {'implicit': 0, 'pageLoad': ms, 'script': ms})
+        self.script_timeout = wait_time
+        self.session.wait_time = wait_time
+
+    async def execute_script(self, script: str, *args):
+        return await self.execute('POST', '/execute/sync', {'script': script, 'args': list(args)})
+
+    async def execute_async_script(self, script: str, *args):
+        return await self.execute('POST', '/execute/async', {'script': script, 'args': list(args)})
+
+    async def find_elements(self, by: str, value: str) -> list['AsyncElement']:
+        by, value = _w3c_locator(by, value)
+        return await self.execute('POST', '/elements', {'using': by, 'value': value})
+
+    async def find_element(self, by: str, value: str) -> 'AsyncElement':
+        by, value = _w3c_locator(by, value)
+        return await self.execute('POST', '/element', {'using': by, 'value': value})
+
+    async def title(self) -> str:
+        return await self.execute('GET', '/title')
+
+    async def current_url(self) -> str:
+        return await self.execute('GET', '/url')
+
+    async def get(self, url: str) -> None:
+        await self.execute('POST', '/url', {'url': url})
+
+    async def refresh(self) -> None:
+        await self.execute('POST', '/refresh', {})
+
+    async def window_handles(self) -> list[str]:
+        return await self.execute('GET', '/window/handles')
+
+    async def switch_to_window(self, handle: str) -> None:
+        await self.execute('POST', '/window', {'handle': handle})
+
+    async def close(self) -> None:
+        await self.execute('DELETE', '/window')
+
+    async def execute_cdp_cmd(self, cmd: str, cmd_args: dict = None) -> dict:
+        return await self.execute('POST', '/goog/cdp/execute', {'cmd': cmd, 'params': cmd_args or {}})
+
+    async def get_screenshot_as_png(self) -> bytes:
+        return base64.b64decode(await self.execute('GET', '/screenshot'))
+
+    def create_element(self, element_id: str) -> 'AsyncElement':
+        return AsyncElement(self, element_id)
+
+    # private
+
+    def _wrap_value(self, value):
+        if isinstance(value, dict):
+            return {k: self._wrap_value(v) for k, v in value.items()}
+        elif isinstance(value, AsyncElement):
+            return {ELEMENT_KEY: value.id}
+        elif isinstance(value, (list, tuple)):
+            return [self._wrap_value(x) for x in value]
+
+        return value
+
+    def _unwrap_value(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return self.create_element(value[ELEMENT_KEY])
+            return {k: self._unwrap_value(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self._unwrap_value(x) for x in value]
+
+        return value
+
+
+class AsyncElement:
+    """
+    Element reference of an AsyncDriver session. Like SpectronElement, elements returned by finders remember their
+    locator and index, a command failing on a stale element finds it again once and is retried.
+    """
+
+    def __init__(self, parent: AsyncDriver, id_: str, locator: Optional[Locator] = None, index: int = 0):
+        self.parent = parent
+        self.id = id_
+        self.locator = locator
+        self.index = index
+
+    async def text(self) -> str:
+        return await self._execute('GET', '/text')
+
+    async def click(self) -> None:
+        await self._execute('POST', '/click', {})
+
+    async def clear(self) -> None:
+        await self._execute('POST', '/clear', {})
+
+    async def send_keys(self, *value: str) -> None:
+        text = ''.join(value)
+        await self._execute('POST', '/value', {'text': text, 'value': list(text)})
+
+    async def get_attribute(self, name: str) -> Optional[str]:
+        return await self._execute('GET', f'/attribute/{name}')
+
+    async def get_property(self, name: str):
+        return await self._execute('GET', f'/property/{name}')
+
+    async def is_displayed(self) -> bool:
+        return bool(await evaluate.call(self.parent, 'isDisplayed', self))
+
+    async def is_enabled(self) -> bool:
+        return await self._execute('GET', '/enabled')
+
+    async def rect(self) -> dict:
+        return await self._execute('GET', '/rect')
+
+    def __eq__(self, element):
+        return hasattr(element, 'id') and self.id == element.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f'<{type(self).__module__}.{type(self).__name__} (session="{self.parent.session_id}", element="{self.id}")>'
+
+    async def reresolve(self) -> bool:
+        """Async `SpectronElement.reresolve()`."""
+        if self.locator is None:
+            return False
+
+        ids = _pick(self.parent, await _select(self.parent, self.locator), (self.index,))
+        if ids is None:
+            return False
+
+        self.id = ids[0]
+        return True
+
+    async def _execute(self, method: str, path: str, payload: dict = None):
+        try:
+            return await self.parent.execute(method, f'/element/{self.id}{path}', payload)
+        except StaleElementReferenceException:
+            _count(self.parent, 'stale')
+            if not await self.reresolve():
+                raise
+        return await self.parent.execute(method, f'/element/{self.id}{path}', payload)
+
+
+class AsyncElementCollection(BaseElementCollection):
+    """Elements returned by `aio.finders.all()`, the bulk operations of ElementCollection as coroutines."""
+    __slots__ = ()
+
+    async def texts(self) -> list[str]:
+        return await self._call('texts')
+
+    async def attributes(self, name: str) -> list[Optional[str]]:
+        return await self._call('attributes', name)
+
+    async def rects(self) -> list[dict]:
+        return await self._call('rects')
+
+    async def click_all(self) -> None:
+        await self._call('clickAll')
+
+    def _element(self, id_: str, index: int) -> AsyncElement:
+        return AsyncElement(self._driver, id_, self._locator, index)
+
+    async def _call(self, name: str, *args) -> list:
+        if not self._ids:
+            return []
+
+        try:
+            return await evaluate.call(self._driver, name, self._args(), *args)
+        except StaleElementReferenceException:
+            _count(self._driver, 'stale')
+            if self._locator is None or not self._found_again(await _select(self._driver, self._locator)):
+                raise
+        return await evaluate.call(self._driver, name, self._args(), *args)
+
+
+async def _execute(connection: AsyncConnection, method: str, path: str, body: bytes = b''):
+    status, response = await connection.send(method, path, body)
+    value = response.get('value', None)
+
+    if status >= 400 or (isinstance(value, dict) and 'error' in value):
+        if not isinstance(value, dict):
+            raise WebDriverException(f"Unexpected response {status}: {response}")
+        _error_handler.check_response({'status': value['error'], 'value': value})
+
+    return value
+
+
+async def _select(driver: AsyncDriver, locator: Locator) -> Optional[list[str]]:
+    """Async `element._select()`."""
+    by, value, filters = locator
+    try:
+        found = await evaluate.call(driver, 'select', by, value, filters)
+    except WebDriverException:
+        return None
+    return _found_ids(found)
+
+
+def _mutates(method: str, path: str, payload: Optional[dict]) -> bool:
+    """`snapshot.mutates()` for the endpoints AsyncDriver sends"""
+    if method == 'GET' or path in ('/element', '/elements', '/timeouts'):
+        return False
+    if path.startswith('/execute/'):
+        return snapshot.mutates('w3cExecuteScript', payload)
+    if path == '/goog/cdp/execute':
+        return snapshot.mutates('executeCdpCommand', payload)
+
+    return True
+
+
+def _w3c_locator(by: str, value: str) -> tuple[str, str]:
+    """Same conversion selenium applies, W3C only knows css, xpath, tag name and link texts."""
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    elif by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f'.{value}'
+    elif by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+
+    return by, value
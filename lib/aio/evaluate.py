@@ -0,0 +1,141 @@
+# evaluate.py
+import asyncio
+import logging
+import time
+
+from selenium.common import JavascriptException, StaleElementReferenceException, TimeoutException
+
+from .. import deadline
+from .. import session
+from ..element import _count
+from ..evaluate import MIN_POLL_FREQUENCY, POLL_FREQUENCY, SCRIPT_TIMEOUT_MARGIN, _MISSING, _call_async_script, \
+    _call_script, _expectations, _filters, _flatten, _runtime, _runtime_condition
+from ..exception import InvalidArgument
+from ..result import ResultDict
+
+logger = logging.getLogger(__name__)
+
+
+async def call(driver, name: str, *args):
+    """Async `evaluate.call()`."""
+    script = _call_script(name)
+
+    rtn = await _healing(driver.execute_script, script, args)
+    if rtn == _MISSING:
+        logger.debug('Installing SpectronPy runtime into the renderer.')
+        await driver.execute_script(_runtime())
+        rtn = await _healing(driver.execute_script, script, args)
+
+    return rtn
+
+
+async def call_async(driver, name: str, *args):
+    """Async `evaluate.call_async()`."""
+    script = _call_async_script(name)
+
+    rtn = await _healing(driver.execute_async_script, script, args)
+    if rtn == _MISSING:
+        logger.debug('Installing SpectronPy runtime into the renderer.')
+        await driver.execute_script(_runtime())
+        rtn = await _healing(driver.execute_async_script, script, args)
+
+    return rtn
+
+
+async def until(driver, condition, wait: float, strategy: str = None):
+    """
+    Async `evaluate.until()`, the condition must have a runtime predicate (see `expected.scripted()`).
+    Other tasks keep running while the renderer observes the DOM or between polls.
+    """
+    script = getattr(condition, 'script', None)
+    if script is None:
+        raise InvalidArgument(f"Async waits take conditions with a runtime predicate, see spectronpy.expected "
+                              f"-- {condition}")
+
+    if strategy is None:
+        strategy = session.current().wait_strategy
+
+    # Within `deadline.within()`, whatever is left of the step's budget
+    wait = deadline.remaining(wait)
+
+    script_timeout = driver.script_timeout
+    if strategy == 'observer' and script_timeout and script_timeout > SCRIPT_TIMEOUT_MARGIN:
+        return await observe(driver, script, wait, script_timeout - SCRIPT_TIMEOUT_MARGIN)
+
+    name, args = script
+    poll = max(min(POLL_FREQUENCY, wait), MIN_POLL_FREQUENCY)
+    end = time.monotonic() + wait
+    while True:
+        if rtn := await call(driver, name, *args):
+            return rtn
+
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutException(f"Condition {name} not met within {wait} seconds.")
+
+        await asyncio.sleep(min(poll, remaining))
+
+
+async def observe(driver, script: tuple, wait: float, max_slice: float):
+    """Async `evaluate.observe()`."""
+    name, args = script
+    end = time.monotonic() + wait
+
+    while True:
+        remaining = max(end - time.monotonic(), 0)
+
+        try:
+            rtn = await call_async(driver, 'observe', name, args, int(min(remaining, max_slice) * 1000))
+        except JavascriptException as e:
+            if 'unloaded' not in (e.msg or ''):
+                raise
+            logger.debug(f"Document unloaded while observing {name}, observing again.")
+            rtn = False
+
+        if isinstance(rtn, dict) and '__spectronpy_error__' in rtn:
+            raise JavascriptException(rtn['__spectronpy_error__'])
+
+        if rtn:
+            return rtn
+
+        if time.monotonic() >= end:
+            raise TimeoutException(f"Condition {name} not met within {wait} seconds.")
+
+
+async def verify_all(driver, element_or_locator, by: str, wait: float, expectations: dict) -> list[ResultDict]:
+    """Async `evaluate.verify_all()`."""
+    payload = _expectations(expectations)
+
+    if not isinstance(element_or_locator, str):
+        results = await call(driver, 'verify', None, None, payload, [element_or_locator])
+    else:
+        try:
+            results = await until(driver, _runtime_condition('verify', by, element_or_locator, payload), wait)
+        except TimeoutException:
+            logger.info(f"Wait time expired:: {(element_or_locator, by)}, wait time: {wait}")
+            results = []
+
+    return [ResultDict(x) for x in results]
+
+
+async def select(driver, locator: str, by: str, wait: float, filters: dict) -> list:
+    """Async `evaluate.select()`."""
+    try:
+        return (await until(driver, _runtime_condition('select', by, locator, _filters(filters)), wait))['elements']
+    except TimeoutException:
+        logger.info(f"Wait time expired:: {(locator, by)}, wait time: {wait}")
+        return []
+
+
+async def _healing(execute, script: str, args: tuple):
+    """Async `evaluate._healing()`."""
+    try:
+        return await execute(script, *args)
+    except StaleElementReferenceException:
+        elements = [x for x in _flatten(args) if getattr(x, 'locator', None) is not None]
+        if not elements:
+            raise
+        _count(elements[0].parent, 'stale')
+        if not all([await x.reresolve() for x in elements]):
+            raise
+    return await execute(script, *args)
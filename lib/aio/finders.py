@@ -0,0 +1,92 @@
+# finders.py
+import logging
+
+from selenium.common import TimeoutException
+from selenium.webdriver.common.by import By
+
+from .. import deadline
+from .. import expected as SpectronExpected
+from .. import session
+from ..evaluate import _filters
+from ..finders import _verify_found, _wait_time_expired
+from . import evaluate
+from . import snapshot
+from .driver import AsyncElement, AsyncElementCollection
+
+logger = logging.getLogger(__name__)
+
+
+async def by_css(css: str, wait: int = None, **kwargs) -> AsyncElement:
+    return await element(css, By.CSS_SELECTOR, wait, **kwargs)
+
+
+async def by_name(name: str, wait: int = None) -> AsyncElement:
+    return await element(name, By.NAME, wait)
+
+
+async def by_class(cls: str, wait: int = None) -> AsyncElement:
+    return await element(cls, By.CLASS_NAME, wait)
+
+
+async def by_id(id: str, wait: int = None) -> AsyncElement:
+    return await element(id, By.ID, wait)
+
+
+async def by_xpath(xpath: str, wait: int = None) -> AsyncElement:
+    return await element(xpath, By.XPATH, wait)
+
+
+async def by_tag(tag: str, wait: int = None) -> AsyncElement:
+    return await element(tag, By.TAG_NAME, wait)
+
+
+async def by_link_text(text: str, wait: int = None) -> AsyncElement:
+    return await element(text, By.LINK_TEXT, wait)
+
+
+async def by_partial_link_text(text: str, wait: int = None) -> AsyncElement:
+    return await element(text, By.PARTIAL_LINK_TEXT, wait)
+
+
+async def all(locator: str, by=None, wait: int = None, **kwargs) -> AsyncElementCollection:
+    ctx = session.current()
+
+    if by is None:
+        by = ctx.selector
+
+    if wait is None:
+        wait = ctx.wait_time
+
+    elems = []
+
+    filters = _filters(kwargs)
+    snap = await snapshot.current(ctx)
+    found = snap.select(locator, by, filters) if snap else None
+    if found is not None:
+        elems = found
+    elif any(filters.values()):
+        with deadline.within(wait):
+            elems = await evaluate.select(ctx.driver, locator, by, wait, filters)
+    else:
+        try:
+            with deadline.within(wait):
+                elems = await evaluate.until(
+                    ctx.driver,
+                    SpectronExpected.presence_of_all_elements_located((by, locator)),
+                    wait
+                )
+        except TimeoutException:
+            logger.info(_wait_time_expired((locator, by), wait))
+
+    rtn = AsyncElementCollection.of(ctx.driver, elems, (by, locator, filters))
+    _verify_found(rtn, locator, by, **kwargs)
+
+    return rtn
+
+
+async def first(locator: str, by=None, wait: int = None, **kwargs) -> AsyncElement:
+    return (await all(locator, by=by, wait=wait, minimum=1, **kwargs))[0]
+
+
+async def element(locator: str, by=None, wait: int = None, **kwargs) -> AsyncElement:
+    return (await all(locator, by, wait, count=1, ambiguous_check=True, **kwargs))[0]
@@ -0,0 +1,90 @@
+# matchers.py
+import logging
+
+from selenium.common import TimeoutException
+
+from .. import deadline
+from .. import expected as SpectronExpected
+from .. import session
+from ..helper import generate_target
+from ..matchers import _combined_repr, _repr, _timeout_str
+from . import evaluate
+from .driver import AsyncElement
+
+logger = logging.getLogger(__name__)
+
+
+class Title:
+    @classmethod
+    async def has(cls, title: str, case_insensitive=False, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.title_contains(title, case_insensitive), wait, _repr(cls, title))
+
+    @classmethod
+    async def equals(cls, title: str, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.title_is(title), wait, _repr(cls, title))
+
+
+class URL:
+    @classmethod
+    async def has(cls, url: str, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.url_contains(url), wait, _repr(cls, url))
+
+    @classmethod
+    async def equals(cls, url: str, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.url_to_be(url), wait, _repr(cls, url))
+
+    @classmethod
+    async def matches(cls, url: str, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.url_matches(url), wait, _repr(cls, url))
+
+    @classmethod
+    async def changes(cls, url: str, wait=None) -> bool:
+        return await _wait_until(SpectronExpected.url_changes(url), wait, _repr(cls, url))
+
+
+class Element:
+
+    @classmethod
+    async def to_be_clickable(cls, element_or_locator: AsyncElement | str, by=None, wait=None) -> AsyncElement | bool:
+        return await _wait_until(
+            SpectronExpected.element_to_be_clickable(generate_target(element_or_locator, by)),
+            wait,
+            _repr(cls, element_or_locator)
+        )
+
+    @classmethod
+    async def to_have_text(cls, element_or_locator: AsyncElement | str, text: str, wait=None, by=None) -> bool:
+        return await _wait_until(
+            SpectronExpected.text_to_be_present_in_element(generate_target(element_or_locator, by), text),
+            wait,
+            _repr(cls, text)
+        )
+
+
+async def any_of(*conditions, wait=None) -> tuple[int, object] | bool:
+    """Async `matchers.any_of()`, the conditions must have a runtime predicate."""
+    rtn = await _wait_until(SpectronExpected.any_of(*conditions), wait, _combined_repr('any_of', conditions))
+
+    return tuple(rtn) if rtn else False
+
+
+async def all_of(*conditions, wait=None) -> list | bool:
+    """Async `matchers.all_of()`, the conditions must have a runtime predicate."""
+    return await _wait_until(SpectronExpected.all_of(*conditions), wait, _combined_repr('all_of', conditions))
+
+
+# Private
+async def _wait_until(condition, wait: int = None, debug_str=None) -> AsyncElement | bool:
+    ctx = session.current()
+
+    if wait is None:
+        wait = ctx.wait_time
+
+    rtn = False
+    try:
+        with deadline.within(wait):
+            rtn = await evaluate.until(ctx.driver, condition, wait, ctx.wait_strategy)
+    except TimeoutException:
+        logger.info(_timeout_str(condition, wait, debug_str))
+
+    return rtn
@@ -0,0 +1,46 @@
+# snapshot.py
+from typing import Optional
+
+from ..session import Session
+from ..snapshot import Snapshot
+from . import evaluate
+
+
+class AsyncSnapshot:
+    """
+    Scope of `AsyncApplication.snapshot()`, the `async with` counterpart of Snapshot:
+
+        async with app.snapshot():
+            await assert_selector('.row', count=500)
+            rows = await find.all('.row', text='Total')
+
+    The snapshot is taken on entry. After a command which may change the page, the next finder or assertion takes
+    a new one.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+        self.snapshot = Snapshot(session)
+        self._previous: Optional[Snapshot] = None
+
+    async def __aenter__(self) -> Snapshot:
+        self._previous = self.session.snapshot
+        self.session.snapshot = self.snapshot
+        await _refresh(self.snapshot)
+        return self.snapshot
+
+    async def __aexit__(self, exc_type, exc_val, traceback):
+        self.session.snapshot = self._previous
+        self.snapshot.invalidate()
+
+
+async def current(session: Session) -> Optional[Snapshot]:
+    """The session's snapshot, taken again first if a command invalidated it. None outside a snapshot scope."""
+    if session.snapshot is not None and not session.snapshot.valid:
+        await _refresh(session.snapshot)
+
+    return session.snapshot
+
+
+async def _refresh(snapshot: Snapshot) -> None:
+    snapshot.load(await evaluate.call(snapshot.session.driver, 'snapshot'))
@@ -6,8 +6,12 @@ import logging
 import os
 import platform
 import shlex
+import shutil
 import signal
 import subprocess
+import time
+from collections import deque
+from contextvars import Token
 from threading import Event
 from pathlib import Path
 from subprocess import Popen
@@ -16,35 +20,70 @@ from typing import Optional
 import psutil
 from selenium.common import JavascriptException
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
-from webdriver_manager.chrome import ChromeDriverManager
 
-from . import globals as world
+from . import chromedriver
+from . import devtools
 from . import helper
+from . import logs
+from . import ports
+from . import screenshot
+from . import service
+from . import session
+from . import snapshot
+from .cdp import CDPDriver
+from .checkpoint import Checkpoint, CheckpointStore
+from .intercept import Interceptor
 from .configuration import Configuration
 from .driver import SpectronDriver
-from .exception import POpenError, UnsupportedOS, NotInitialized, ClientError
+from .service import SpectronService
+from .exception import POpenError, UnsupportedOS, NotInitialized, ClientError, InvalidArgument
 
 logger = logging.getLogger(__name__)
 
+LOG_DRAIN_TIMEOUT = 1
 
-class Application:
+# SIGTERM grace period, a multiple of the slowest of the recent clean exits, capped by stop_timeout
+DEFAULT_TERM_GRACE = 1.0
+MIN_TERM_GRACE = 0.25
+TERM_GRACE_FACTOR = 3
+KILL_TIMEOUT = 1.0
+EXIT_POLL_INITIAL = 0.001
+EXIT_POLL_MAX = 0.05
 
-    def __init__(self, app_path: str, chromedriver_version: str, config=None):
+_exit_history: deque[float] = deque(maxlen=20)
+
+# {origin: {key: value}} of the current window
+_EXPORT_LOCAL_STORAGE = "var rtn = {}; rtn[location.origin] = Object.assign({}, localStorage); return rtn;"
+_IMPORT_LOCAL_STORAGE = (
+    "var items = arguments[0][location.origin] || {};"
+    "Object.keys(items).forEach(function (k) { localStorage.setItem(k, items[k]); });"
+    "return Object.keys(items).length;"
+)
+
+
+class BaseApplication:
+    """
+    Electron process, ports, user data and configuration of an application, shared by Application and
+    AsyncApplication. The lifecycle (start, stop, checkpoints, screenshots) is up to the subclass.
+    """
+
+    def __init__(self, app_path: str, chromedriver_version: str = '', config=None):
         """
         Creates a new instance of Application.
 
         :Args:
          - app_path : Path to the Electron application.
          - chromedriver_version : Specify the exact chromedriver version. https://chromedriver.chromium.org/downloads
+           Inferred from the Chromium version bundled with the app when empty.
          - config : List of optional configurations for webdriver, chromedriver, and electron. Refer to Configuration class for details.
          """
         if config is None:
             config = {}
 
-        config.update({'chromedriver_version': chromedriver_version})
+        if chromedriver_version:
+            config.update({'chromedriver_version': chromedriver_version})
         config.update({'app_path': app_path})
         self.config = Configuration(**config)
 
@@ -52,9 +91,24 @@ class Application:
         self.return_code = None
         self.running = False
         self.results = None
+        self.boot_timings: dict[str, float] = {}
+        self.teardown_timings: dict = {}
+        self.devtools_version: dict = {}
+        self.port: Optional[int] = None
+        self.session = session.Session(wait_strategy=self.config.wait_strategy)
+        self.screenshots = screenshot.ScreenshotWriter(self.config.screenshot_queue_size)
+        self.logs = logs.LogTail(self.config.electron_log_buffer)
+        self.checkpoints = CheckpointStore(self.config.checkpoint_dir, self.config.checkpoint_clone)
+        self.intercept = Interceptor()
+        self._instance_dir: Optional[str] = None
+        self._discard_at_exit = False
+        self._close_at_exit = False
+        self._pending_storage: dict = {}
         self._client: Optional[SpectronDriver] = None
         self._app: Optional[Popen] = None
         self._thread_wait: Optional[Event] = None
+        # Binding of the session to the thread or task which started the app, undone on stop
+        self._activation: Optional[Token] = None
 
     @property
     def client(self) -> SpectronDriver:
@@ -65,123 +119,29 @@ class Application:
 
         return self._client
 
-    def start(self) -> None:
-        """Start App and Client."""
-        world.initialize()
-        self.start_app()
-
-        world.driver = asyncio.run(self.start_client())
-
-        wait_time = helper.to_seconds(self.config.wait_timeout)
-        self.client.update_wait(wait_time)
-
-        self._register_close_events()
-        self.running = True
-
-    def stop(self) -> None:
-        """Close App and Client."""
-        if not self.is_running():
-            return
-
-        if self._app.stdout:
-            logger.info(f'Closed log file.')
-            self._app.stdout.close()
-
-        self.switch_to_main_window()
-        self.client.close()
-        self.client.quit()
-
-        self.terminate()
-
-        logger.info("Application closed.")
-        self._cleanup()
-
-    def terminate(self) -> None:
-        """Close Electron process tree using OS-specific functions."""
-        if not self._app:
-            return
-
-        timeout_seconds = helper.to_seconds(self.config.stop_timeout)
-        process = psutil.Process(self._app.pid)
-        child_processes = process.children(recursive=True)
-
-        try:
-            def on_terminate(proc):
-                logger.info(f"process {proc} terminated.")
-
-            process.terminate()
-
-            gone, alive = psutil.wait_procs(
-                [process] + child_processes,
-                timeout=timeout_seconds,
-                callback=on_terminate
-            )
-
-            for p in alive:
-                p.kill()
-
-        except psutil.NoSuchProcess as e:
-            logger.warning(f"Process [{process}] already closed.")
-            logger.warning(e, exc_info=True)
-
-    def restart(self) -> None:
-        self.stop()
-        self.start()
-
-    async def start_client(self) -> WebDriver:
-        if self.is_running():
-            return self.client
-
-        # Options
-        client_options = self._build_chrome_options()
-
-        # Service
-        chrome_service = self._build_chrome_service()
-
-        # Chromedriver has an unconfigurable default timeout of 60 seconds.
-        # We add a configurable timeout to it via asyncio.
-        def start_webdriver(wb_args):
-            return SpectronDriver(wb_args)
-
-        webdriver_args = self.config.webdriver_options
-        kwargs = {
-                     'options': client_options,
-                     'service': chrome_service
-                 } | webdriver_args
-
-        timeout_seconds = helper.to_seconds(self.config.start_timeout)
-        try:
-            self._client: WebDriver = await asyncio.wait_for(
-                asyncio.to_thread(start_webdriver, kwargs),
-                timeout=timeout_seconds
-            )
-        except asyncio.TimeoutError:
-            logger.error(f"Took longer than {timeout_seconds} seconds to start.")
-            raise
-
-        logger.info("WebDriver started.")
-        logger.info(f"Application Electron version: {self._electron_version()}")
-
-        return self.client
-
     def start_app(self) -> Popen:
         """Open Electron app."""
         if self.is_running():
             return self._app
 
-        if self.os == "Darwin":
+        if self.os in ("Darwin", "Linux"):
             cmd = shlex.split(f'{self.config.app_path}')
         elif self.os == "Windows":
             raise NotImplementedError
-        elif self.os == "Linux":
-            raise NotImplementedError
         else:
             raise UnsupportedOS(f"Unsupported OS - {self.os}")
 
-        debugger_arg = f'--remote-debugging-port={self.config.app_port}'
+        self._resolve_port()
+        debugger_arg = f'--remote-debugging-port={self.port}'
         args = self.config.electron_args.copy() + [debugger_arg]
+        if self.user_data_dir:
+            args.append(f'--user-data-dir={self.user_data_dir}')
 
-        if self.config.electron_log_path:
+        if self.config.electron_log_buffer:
+            # Read by self.logs, which copies the output to electron_log_path
+            stdout = subprocess.PIPE
+            stderr = subprocess.STDOUT
+        elif self.config.electron_log_path:
             file_name = self.config.electron_log_path
             stdout = open(file_name, "w")
             stderr = subprocess.STDOUT
@@ -192,8 +152,11 @@ class Application:
         kwargs = {
             'stdout': stdout,
             'stderr': stderr,
-            'universal_newlines': True,
-            'cwd': self.config.working_directory
+            'encoding': 'utf-8',
+            'errors': 'replace',
+            'cwd': self.config.working_directory,
+            # Own process group, so terminate() can signal all Electron helpers at once
+            'start_new_session': True
         }
 
         try:
@@ -204,6 +167,9 @@ class Application:
             logger.exception(f"Error opening App! {e}")
             raise POpenError
 
+        if self._app.stdout:
+            self.logs.attach(self._app.stdout, self.config.electron_log_path or None)
+
         logger.info("Application started.")
 
         return self._app
@@ -217,25 +183,14 @@ class Application:
     def get_settings(self) -> Configuration:
         return self.config
 
-    def switch_to_main_window(self) -> None:
-        self.client.switch_to.window(self.client.window_handles[0])
-
-    def take_screenshot(self, filename=None, folder=None) -> None:
-        if self.is_running() is False:
-            return
-
-        file_path = []
-
-        if folder:
-            file_path.append(folder)
-
-        if filename is None:
-            filename = 'screenshot.png'
-
-        file_path.append(filename)
+    @property
+    def user_data_dir(self) -> str:
+        """Electron's user data directory, the clone of the checkpoint after `restore()`. Empty for the app default."""
+        return self._instance_dir or self.config.user_data_dir
 
-        logger.info(f'Saving screenshot to "{"/".join(file_path)}"')
-        self.client.save_screenshot("/".join(file_path))
+    def activate(self) -> None:
+        """Make this Application the target of finders, matchers and assertions in the current thread or task."""
+        self.session.activate()
 
     def devtools_url(self) -> str:
         return f"http://{self._debugger_address()}"
@@ -261,7 +216,7 @@ class Application:
 
     def default_selector(self, by: By) -> None:
         """Sets the default selector for all(), first(), element() finders"""
-        world.default_selector = by
+        self.session.selector = by
 
     def start_debug_mode(self, timeout=None) -> None:
         logger.info("Starting debugger mode.")
@@ -278,36 +233,104 @@ class Application:
 
         return self.client.capabilities['browserVersion']
 
+    def _bundled_chromium_version(self) -> str:
+        if not self.devtools_version:
+            self.devtools_version = devtools.version(self.port)
+
+        version = chromedriver.version_from_browser(self.devtools_version.get('Browser', ''))
+        logger.info(f"Using chromedriver for bundled Chromium {version}")
+
+        return version
+
     def _debugger_address(self) -> str:
-        return f"localhost:{self.config.app_port}"
+        return f"localhost:{self.port}"
+
+    def _resolve_port(self) -> None:
+        if self.port is not None:
+            return
+
+        if self.config.app_port == 'auto':
+            self.port = ports.allocate()
+        else:
+            self.port = self.config.app_port
+
+    def _release_port(self) -> None:
+        if self.config.app_port == 'auto' and self.port is not None:
+            ports.release(self.port)
+
+        self.port = None
+
+    @staticmethod
+    def _screenshot_path(filename=None, folder=None) -> str:
+        file_path = []
+
+        if folder:
+            file_path.append(folder)
+
+        if filename is None:
+            filename = 'screenshot.png'
+
+        file_path.append(filename)
+
+        return "/".join(file_path)
+
+    def _collect_results(self) -> None:
+        if self.client.metrics is not None:
+            self.results = self.client.metrics.summary()
+
+    def _abort_start(self) -> None:
+        """Undo a start that failed after the app was spawned, so a retry starts from scratch."""
+        logger.error("Start failed, terminating the application.")
+        self.intercept.stop()
+        self._terminate()
+        self.logs.close(LOG_DRAIN_TIMEOUT)
+        self._cleanup()
 
     def _cleanup(self) -> None:
+        self._release_port()
         self.running = False
         self._app = None
         self._client = None
-
-    def _electron_version(self) -> str:
-        try:
-            return self.client.execute_script("return process.versions.electron;")
-        except JavascriptException as e:
-            logger.warning(e.msg)
-            return "Not available"
-
-    def _build_chrome_service(self) -> ChromeService:
+        self.session.driver = None
+        if self._activation is not None:
+            self.session.deactivate(self._activation)
+            self._activation = None
+
+    def _use_instance(self, checkpoint: Checkpoint, instance_dir: str) -> None:
+        """Boot from the clone of the checkpoint from now on, and write its localStorage back after start."""
+        self._instance_dir = instance_dir
+        if not self._discard_at_exit:
+            # One handler per Application, it removes whichever clone is current at exit
+            atexit.register(self._discard_instance)
+            self._discard_at_exit = True
+        self._pending_storage = checkpoint.local_storage
+
+    def _discard_instance(self) -> None:
+        if self._instance_dir:
+            shutil.rmtree(self._instance_dir, ignore_errors=True)
+            self._instance_dir = None
+
+    def _build_chrome_service(self) -> SpectronService:
         if self.config.chromedriver_path:
             self.config.chromedriver_path = os.path.join(Path.cwd(), self.config.chromedriver_path)
         else:
-            version = self.config.chromedriver_version
-            self.config.chromedriver_path = ChromeDriverManager(
+            inferred = not self.config.chromedriver_version
+            version = self.config.chromedriver_version or self._bundled_chromium_version()
+            self.config.chromedriver_path = chromedriver.resolve(
                 version,
-                cache_valid_range=self.config.chromedriver_cache
-            ).install()
+                cache_valid_range=self.config.chromedriver_cache,
+                offline=self.config.chromedriver_offline,
+                inferred=inferred
+            )
 
         args = []
         if self.config.chromedriver_verbose:
             args.append('--verbose')
 
-        return ChromeService(
+        if self.config.chromedriver_reuse:
+            return service.shared(self.config.chromedriver_path, self.config.chromedriver_log_path, args)
+
+        return SpectronService(
             self.config.chromedriver_path,
             log_path=self.config.chromedriver_log_path,
             service_args=args
@@ -323,5 +346,348 @@ class Application:
 
         return options
 
+    def _terminate(self) -> None:
+        """Blocking process tree teardown behind `terminate()` of either lifecycle."""
+        if not self._app:
+            return
+
+        started = time.perf_counter()
+        processes = _process_tree(self._app.pid)
+        if not processes:
+            logger.warning(f"Process [{self._app.pid}] and its process group already closed.")
+            self._app.poll()
+            return
+
+        names = {p.pid: _process_name(p) for p in processes}
+        exited: dict[int, float] = {}
+
+        grace = _term_grace(helper.to_seconds(self.config.stop_timeout))
+        _signal_tree(self._app.pid, processes, signal.SIGTERM)
+        alive = _wait_exit(processes, grace, started, exited)
+        killed = len(alive)
+
+        if alive:
+            logger.warning(f"{len(alive)} process(es) still running {grace:.3f}s after SIGTERM, sending SIGKILL: "
+                           + ", ".join(names[p.pid] for p in alive))
+            _signal_tree(self._app.pid, alive, signal.SIGKILL)
+            alive = _wait_exit(alive, KILL_TIMEOUT, started, exited)
+        else:
+            _exit_history.append(time.perf_counter() - started)
+
+        # Reap the direct child
+        self._app.poll()
+
+        for p in alive:
+            logger.error(f"process {names[p.pid]} did not exit after SIGKILL.")
+
+        self.teardown_timings = {
+            'total': time.perf_counter() - started,
+            'grace': grace,
+            'killed': killed,
+            'processes': {names[p.pid]: exited.get(p.pid) for p in processes},
+        }
+        logger.info(f"Process tree closed in {self.teardown_timings['total']:.3f}s:: "
+                    + ", ".join(f"{k}: {v:.3f}s" if v is not None else f"{k}: running"
+                                for k, v in self.teardown_timings['processes'].items()))
+
+
+class Application(BaseApplication):
+
+    def start(self) -> None:
+        """Start App and Client."""
+        started = time.perf_counter()
+
+        self.start_app()
+        spawned = time.perf_counter()
+
+        try:
+            self.wait_until_devtools_ready()
+            # Before the session, the sooner the app's requests are intercepted the better
+            self.intercept.start(self.port)
+            ready = time.perf_counter()
+
+            asyncio.run(self.start_client())
+            created = time.perf_counter()
+        except BaseException:
+            self._abort_start()
+            raise
+
+        self.boot_timings = {
+            'spawn': spawned - started,
+            'devtools_ready': ready - spawned,
+            'session_created': created - ready,
+            'total': created - started,
+        }
+        logger.info("Boot timings:: " + ", ".join(f"{k}: {v:.3f}s" for k, v in self.boot_timings.items()))
+
+        wait_time = helper.to_seconds(self.config.wait_timeout)
+        self.client.update_wait(wait_time)
+
+        self._register_close_events()
+        self.running = True
+
+        session.set_default(self.session)
+        self._activation = self.session.activate()
+
+        if self._pending_storage:
+            self._import_local_storage(self._pending_storage)
+            self._pending_storage = {}
+
+    def stop(self) -> None:
+        """Close App and Client."""
+        if not self.is_running():
+            return
+
+        self.switch_to_main_window()
+        self.client.close()
+        self.client.quit()
+        self._collect_results()
+        self.intercept.stop()
+
+        self.terminate()
+        self.screenshots.flush(helper.to_seconds(self.config.stop_timeout))
+
+        # The output ends with the process tree, leave the reader a moment to drain the pipe
+        self.logs.close(LOG_DRAIN_TIMEOUT)
+
+        logger.info("Application closed.")
+        self._cleanup()
+
+    def terminate(self) -> None:
+        """
+        Close the Electron process tree. SIGTERM goes to the whole process group at once, whatever is still running
+        after a grace period adapted to previous exits (bounded by stop_timeout) gets SIGKILL.
+        Per process exit times are stored in `teardown_timings`.
+        """
+        self._terminate()
+
+    def restart(self) -> None:
+        """Restart the Electron process and session. A shared chromedriver service keeps running."""
+        self.stop()
+        self.start()
+
+    async def start_client(self) -> WebDriver:
+        if self.is_running():
+            return self.client
+
+        if self.config.backend == 'cdp':
+            def start_webdriver(_):
+                return CDPDriver(self._debugger_address(), self.session, self.config.metrics)
+
+            kwargs = None
+        else:
+            # Options
+            client_options = self._build_chrome_options()
+
+            # Service
+            chrome_service = self._build_chrome_service()
+
+            # Chromedriver has an unconfigurable default timeout of 60 seconds.
+            # We add a configurable timeout to it via asyncio.
+            def start_webdriver(wb_args):
+                return SpectronDriver(wb_args, self.session, self.config.metrics)
+
+            webdriver_args = self.config.webdriver_options
+            kwargs = {
+                         'options': client_options,
+                         'service': chrome_service
+                     } | webdriver_args
+
+        timeout_seconds = helper.to_seconds(self.config.start_timeout)
+        try:
+            self._client: WebDriver = await asyncio.wait_for(
+                asyncio.to_thread(start_webdriver, kwargs),
+                timeout=timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.error(f"Took longer than {timeout_seconds} seconds to start.")
+            raise
+
+        logger.info("WebDriver started.")
+        logger.info(f"Application Electron version: {self._electron_version()}")
+
+        return self.client
+
+    def wait_until_devtools_ready(self) -> dict:
+        """Poll the DevTools endpoint until the renderer accepts connections."""
+        timeout_seconds = helper.to_seconds(self.config.start_timeout)
+        self.devtools_version = devtools.wait_until_ready(self.port, timeout_seconds, self._app)
+        logger.info(f"DevTools ready: {self.devtools_version.get('Browser', '')}")
+
+        return self.devtools_version
+
+    def checkpoint(self, name: str, local_storage: bool = False, restart: bool = True) -> Checkpoint:
+        """
+        Saves the user data directory as checkpoint `name`, for `restore()` to boot into later.
+        A running app is stopped first, so Chromium flushes its stores to disk, and started again with `restart`.
+        `local_storage` also exports the main window's localStorage, which `restore()` writes back after start.
+        """
+        if not self.user_data_dir:
+            raise InvalidArgument("Checkpoints need the user_data_dir option or a restored checkpoint.")
+
+        running = self.is_running()
+        storage = None
+        if local_storage:
+            if not running:
+                raise ClientError("Exporting localStorage needs a running application.")
+            self.switch_to_main_window()
+            storage = self.client.execute_script(_EXPORT_LOCAL_STORAGE)
+
+        self.stop()
+        rtn = self.checkpoints.create(name, self.user_data_dir, storage)
+
+        if running and restart:
+            self.start()
+        return rtn
+
+    def restore(self, name: str, start: bool = True) -> Checkpoint:
+        """
+        Clones checkpoint `name` into a new user data directory and starts the app from it.
+        A running app is stopped first. The clone of a previous `restore()` is removed.
+        """
+        self.stop()
+        self._discard_instance()
+
+        rtn, instance_dir = self.checkpoints.restore(name)
+        self._use_instance(rtn, instance_dir)
+
+        if start:
+            self.start()
+        return rtn
+
+    def switch_to_main_window(self) -> None:
+        self.client.switch_to.window(self.client.window_handles[0])
+
+    def take_screenshot(self, filename=None, folder=None, quality=None, clip=None) -> Optional[str]:
+        """
+        Captures the window through CDP `Page.captureScreenshot` and returns the file path. The image is decoded and
+        written by a background worker, `screenshots.flush()` waits for pending writes, `stop()` flushes as well.
+
+        The format follows the extension of filename (.png, .jpg, .webp), quality (0-100) applies to jpeg and webp.
+        clip is a {x, y, width, height} dict or an element to capture only that area.
+        """
+        if self.is_running() is False:
+            return None
+
+        path = self._screenshot_path(filename, folder)
+
+        logger.info(f'Saving screenshot to "{path}"')
+        self.screenshots.submit(path, screenshot.capture(self.client, path, quality, clip))
+
+        return path
+
+    def snapshot(self) -> snapshot.Snapshot:
+        """
+        Read-only scope for many finders and assertions in a row:
+
+            with app.snapshot() as dom:
+                assert_selector('.row', count=500)
+                rows = finders.all('.row', text='Total')
+
+        The DOM is serialized once and locators are evaluated against the copy in Python, without waiting.
+        Any command which may change the page (click, send_keys, navigation, scripts) invalidates it, the next
+        finder or assertion takes a new one. Unsupported selectors fall back to the renderer.
+        """
+        return snapshot.Snapshot(self.session)
+
+    # private
+
+    def _import_local_storage(self, storage: dict) -> None:
+        self.switch_to_main_window()
+        count = self.client.execute_script(_IMPORT_LOCAL_STORAGE, storage)
+        logger.info(f"Restored {count} localStorage item(s).")
+
+    def _electron_version(self) -> str:
+        try:
+            return self.client.execute_script("return process.versions.electron;")
+        except JavascriptException as e:
+            logger.warning(e.msg)
+            return "Not available"
+
     def _register_close_events(self):
-        atexit.register(self.stop)
+        if not self._close_at_exit:
+            # Once per Application, stop() is a no-op for an app which is not running
+            atexit.register(self.stop)
+            self._close_at_exit = True
+
+
+def _term_grace(stop_timeout: float) -> float:
+    if not _exit_history:
+        return min(DEFAULT_TERM_GRACE, stop_timeout)
+
+    return min(max(MIN_TERM_GRACE, TERM_GRACE_FACTOR * max(_exit_history)), stop_timeout)
+
+
+def _signal_tree(pgid: int, processes: list[psutil.Process], sig: int) -> None:
+    """Signals the process group, and processes of the tree which left it."""
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+    for p in processes:
+        try:
+            if os.getpgid(p.pid) != pgid:
+                p.send_signal(sig)
+        except (ProcessLookupError, psutil.NoSuchProcess):
+            pass
+
+
+def _process_tree(pgid: int) -> list[psutil.Process]:
+    """
+    The group leader with its descendants, and the rest of its process group. Helpers which outlived the leader are
+    reparented, only their group still ties them to the app.
+    """
+    processes: dict[int, psutil.Process] = {}
+    try:
+        leader = psutil.Process(pgid)
+        processes = {p.pid: p for p in [leader] + leader.children(recursive=True)}
+    except psutil.NoSuchProcess:
+        logger.warning(f"Process [{pgid}] already closed, closing the rest of its process group.")
+
+    for p in psutil.process_iter():
+        try:
+            if p.pid not in processes and os.getpgid(p.pid) == pgid:
+                processes[p.pid] = p
+        except (ProcessLookupError, psutil.NoSuchProcess):
+            pass
+
+    return list(processes.values())
+
+
+def _wait_exit(processes: list[psutil.Process], timeout: float, started: float, exited: dict) -> list[psutil.Process]:
+    """Polls all processes with a short backoff, records exit times since started. Returns those still running."""
+    deadline = time.monotonic() + timeout
+    delay = EXIT_POLL_INITIAL
+    alive = processes
+
+    while True:
+        running = []
+        for p in alive:
+            if _has_exited(p):
+                exited[p.pid] = time.perf_counter() - started
+            else:
+                running.append(p)
+        alive = running
+
+        remaining = deadline - time.monotonic()
+        if not alive or remaining <= 0:
+            return alive
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, EXIT_POLL_MAX)
+
+
+def _has_exited(process: psutil.Process) -> bool:
+    # Zombies have exited, they only wait for their parent (or init) to reap them
+    try:
+        return not process.is_running() or process.status() == psutil.STATUS_ZOMBIE
+    except psutil.NoSuchProcess:
+        return True
+
+
+def _process_name(process: psutil.Process) -> str:
+    try:
+        return f"{process.name()}[{process.pid}]"
+    except psutil.Error:
+        return f"[{process.pid}]"
@@ -2,10 +2,11 @@
 
 from selenium.webdriver.remote.webelement import WebElement
 
-from . import finders
+from . import deadline
+from . import evaluate
+from . import session
 import logging
 from .exception import ExpectationNotMet
-from .result import _verify_match
 
 logger = logging.getLogger(__name__)
 
@@ -31,21 +32,8 @@ def assert_selector(element_or_locator: WebElement | str, by=None, wait=None, **
         'visible': False
     }
     expectations = default_kwargs | kwargs
-    expected_count = expectations.get('count', None)
-    results = []
-
-    for element in finders.all(element_or_locator, by, wait):
-        results.append(_verify_match(element, expectations))
-
-    summarized_results = [x.summarize_all() for x in results]
-
-    if not any(summarized_results) or \
-            (expected_count and expected_count != summarized_results.count(True)):
-        msg = "Assertion failed!\n"
-        msg += f"Found {len(summarized_results)} elements.\n"
-        msg += f"{summarized_results.count(True)} elements matched expectations.\n"
-        msg += _expectation_not_met(expectations)
-        raise ExpectationNotMet(msg)
+    results = _evaluate(element_or_locator, by, wait, expectations)
+    _verify_match(results, expectations)
 
 
 def assert_no_selector(element_or_locator: WebElement | str, by=None, wait=None, **kwargs) -> None:
@@ -60,12 +48,25 @@ def assert_no_selector(element_or_locator: WebElement | str, by=None, wait=None,
         'visible': False
     }
     expectations = default_kwargs | kwargs
+    results = _evaluate(element_or_locator, by, wait, expectations)
+    _verify_no_match(results, expectations)
+
+
+def _verify_match(results: list, expectations: dict) -> None:
     expected_count = expectations.get('count', None)
-    results = []
+    summarized_results = [x.summarize_all() for x in results]
+
+    if not any(summarized_results) or \
+            (expected_count and expected_count != summarized_results.count(True)):
+        msg = "Assertion failed!\n"
+        msg += f"Found {len(summarized_results)} elements.\n"
+        msg += f"{summarized_results.count(True)} elements matched expectations.\n"
+        msg += _expectation_not_met(expectations)
+        raise ExpectationNotMet(msg)
 
-    for element in finders.all(element_or_locator, by, wait):
-        results.append(_verify_match(element, expectations))
 
+def _verify_no_match(results: list, expectations: dict) -> None:
+    expected_count = expectations.get('count', None)
     summarized_results = [x.summarize_all() for x in results]
 
     if (not expected_count and any(summarized_results)) or \
@@ -77,6 +78,25 @@ def assert_no_selector(element_or_locator: WebElement | str, by=None, wait=None,
         raise ExpectationNotMet(msg)
 
 
+def _evaluate(element_or_locator, by, wait, expectations):
+    """Evaluates all expectations for all matching elements in the renderer, one script call per poll"""
+    ctx = session.current()
+
+    if by is None:
+        by = ctx.selector
+
+    if wait is None:
+        wait = ctx.wait_time
+
+    if ctx.snapshot is not None:
+        results = ctx.snapshot.verify_all(element_or_locator, by, evaluate._filters(expectations))
+        if results is not None:
+            return results
+
+    with deadline.within(wait):
+        return evaluate.verify_all(ctx.driver, element_or_locator, by, wait, expectations)
+
+
 def _negative_expectation_not_met(expectation):
     return f"Found an element that matched all expectations:: \n\tExpected no match: {expectation}"
 
@@ -0,0 +1,867 @@
+# cdp.py
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import os
+import platform
+import queue
+import socket
+import struct
+import threading
+import time
+import uuid
+from typing import Callable, Optional
+from urllib import parse
+
+from selenium.common import (
+    ElementNotInteractableException,
+    InvalidArgumentException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    UnknownMethodException,
+    WebDriverException
+)
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from . import devtools
+from .driver import SpectronDriver
+from .exception import CDPError
+from .session import Session
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a response to commands without a WebDriver timeout of their own
+COMMAND_TIMEOUT = 10
+
+# Added to the script timeout while waiting for the renderer to report the timeout itself
+RESPONSE_MARGIN = 1
+
+FIND_POLL_INTERVAL = 0.05
+
+_MISSING = '__spectronpy_cdp_missing__'
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_TEXT = 0x1
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+
+# WebSocket (RFC 6455), only what the DevTools endpoint needs: unfragmented text messages out, any messages in.
+
+def accept_key(key: str) -> str:
+    """Sec-WebSocket-Accept for the Sec-WebSocket-Key of a handshake."""
+    return base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool = True) -> bytes:
+    """A final frame. Clients mask their frames, servers don't."""
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+
+    header = bytearray([0x80 | opcode])
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack('!Q', length)
+
+    if not mask:
+        return bytes(header) + payload
+
+    key = os.urandom(4)
+    return bytes(header) + key + _mask(payload, key)
+
+
+def read_frame(stream) -> tuple[bool, int, bytes]:
+    """(final, opcode, payload) of the next frame of a buffered binary stream. Raises ConnectionError at EOF."""
+    head = _read_exact(stream, 2)
+    final, opcode = bool(head[0] & 0x80), head[0] & 0x0F
+    masked, length = head[1] & 0x80, head[1] & 0x7F
+
+    if length == 126:
+        length = struct.unpack('!H', _read_exact(stream, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', _read_exact(stream, 8))[0]
+
+    key = _read_exact(stream, 4) if masked else None
+    payload = _read_exact(stream, length)
+
+    return final, opcode, _mask(payload, key) if key else payload
+
+
+def _mask(payload: bytes, key: bytes) -> bytes:
+    if not payload:
+        return b''
+
+    # XOR as one big integer, a lot faster than byte by byte in Python
+    length = len(payload)
+    repeated = (key * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(repeated, 'little')).to_bytes(length, 'little')
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) < size:
+        raise ConnectionError('WebSocket closed.')
+    return data
+
+
+class WebSocket:
+    """Blocking WebSocket client. `send()` is thread-safe, `recv()` is meant for one reader thread."""
+
+    def __init__(self, url: str, timeout: float = COMMAND_TIMEOUT):
+        parts = parse.urlparse(url)
+        self.url = url
+        self.closed = False
+        self._send_lock = threading.Lock()
+        self._sock = socket.create_connection((parts.hostname, parts.port or 80), timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._stream = self._sock.makefile('rb')
+
+        try:
+            self._handshake(parts)
+        except (OSError, ConnectionError):
+            self._sock.close()
+            raise
+
+        self._sock.settimeout(None)
+
+    def send(self, text: str) -> None:
+        self._send_frame(OP_TEXT, text.encode('utf8'))
+
+    def recv(self) -> Optional[str]:
+        """The next text message, None once the connection is closed."""
+        fragments = []
+
+        while True:
+            try:
+                final, opcode, payload = read_frame(self._stream)
+            except (OSError, ConnectionError, ValueError):
+                self.closed = True
+                return None
+
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+            elif opcode == OP_CLOSE:
+                self.close()
+                return None
+            elif opcode != OP_PONG:
+                fragments.append(payload)
+                if final:
+                    return b''.join(fragments).decode('utf8')
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            try:
+                self._send_frame(OP_CLOSE, struct.pack('!H', 1000))
+            except OSError:
+                pass
+
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+    def _send_frame(self, opcode: int, payload: bytes) -> None:
+        frame = encode_frame(opcode, payload)
+        with self._send_lock:
+            self._sock.sendall(frame)
+
+    def _handshake(self, parts: parse.ParseResult) -> None:
+        key = base64.b64encode(os.urandom(16)).decode()
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+
+        self._sock.sendall((
+            f'GET {path} HTTP/1.1\r\n'
+            f'Host: {parts.netloc}\r\n'
+            f'Upgrade: websocket\r\n'
+            f'Connection: Upgrade\r\n'
+            f'Sec-WebSocket-Key: {key}\r\n'
+            f'Sec-WebSocket-Version: 13\r\n\r\n'
+        ).encode())
+
+        status = self._stream.readline().decode('latin-1').strip()
+        headers = {}
+        while (line := self._stream.readline()) not in (b'\r\n', b'\n', b''):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if status.split(' ')[1:2] != ['101'] or headers.get('sec-websocket-accept') != accept_key(key):
+            raise ConnectionError(f"WebSocket handshake with {self.url} failed: {status}")
+
+
+class CDPConnection:
+    """
+    DevTools protocol session over a WebSocket. Responses are matched to commands by id, so several threads can send
+    commands at once. Events go to the listeners on a separate thread, which may send commands themselves.
+    """
+
+    def __init__(self, url: str, timeout: float = COMMAND_TIMEOUT):
+        self.url = url
+        self._ws = WebSocket(url, timeout)
+        self._ids = itertools.count(1)
+        self._pending: dict[int, list] = {}
+        self._listeners: dict[str, list[Callable[[dict], None]]] = {}
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._reader = threading.Thread(target=self._read, name='spectronpy-cdp', daemon=True)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='spectronpy-cdp-events', daemon=True)
+        self._reader.start()
+        self._dispatcher.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def send(self, method: str, params: dict = None, timeout: float = COMMAND_TIMEOUT) -> dict:
+        """Sends the command and waits for its result. Raises CDPError for protocol errors."""
+        message_id = next(self._ids)
+        waiter = [threading.Event(), None]
+
+        with self._lock:
+            if self._closed:
+                raise CDPError(f"Connection to {self.url} is closed, can't send {method}.")
+            self._pending[message_id] = waiter
+
+        try:
+            self._ws.send(json.dumps({'id': message_id, 'method': method, 'params': params or {}}))
+        except OSError as e:
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise CDPError(f"Could not send {method}: {e}")
+
+        if not waiter[0].wait(timeout):
+            with self._lock:
+                self._pending.pop(message_id, None)
+            raise TimeoutException(f"No response to {method} within {timeout} seconds.")
+
+        message = waiter[1]
+        if message is None:
+            raise CDPError(f"Connection to {self.url} closed while waiting for {method}.")
+        if 'error' in message:
+            raise CDPError(f"{method}: {message['error'].get('message')} ({message['error'].get('code')})")
+
+        return message.get('result', {})
+
+    def add_listener(self, event: str, callback: Callable[[dict], None]) -> None:
+        """Calls callback with the params of every `event`, e.g. 'Page.loadEventFired'."""
+        with self._lock:
+            self._listeners.setdefault(event, []).append(callback)
+
+    def remove_listener(self, event: str, callback: Callable[[dict], None]) -> None:
+        with self._lock:
+            if callback in self._listeners.get(event, []):
+                self._listeners[event].remove(callback)
+
+    def close(self) -> None:
+        self._ws.close()
+        if threading.current_thread() is not self._reader:
+            self._reader.join(1)
+
+    def _read(self) -> None:
+        while (text := self._ws.recv()) is not None:
+            message = json.loads(text)
+
+            if 'id' in message:
+                with self._lock:
+                    waiter = self._pending.pop(message['id'], None)
+                if waiter:
+                    waiter[1] = message
+                    waiter[0].set()
+            elif 'method' in message:
+                self._events.put(message)
+
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+
+        for waiter in pending.values():
+            waiter[0].set()
+        self._events.put(None)
+        logger.debug(f"DevTools connection to {self.url} closed.")
+
+    def _dispatch(self) -> None:
+        while (message := self._events.get()) is not None:
+            with self._lock:
+                listeners = list(self._listeners.get(message['method'], []))
+
+            for callback in listeners:
+                try:
+                    callback(message.get('params', {}))
+                except Exception as e:
+                    logger.error(f"Listener of {message['method']} failed: {e}", exc_info=True)
+
+
+# Installed once per document as `window.__spectronpy_cdp`, the counterpart of chromedriver's in-page helpers:
+# element references, argument and result conversion and the element commands.
+_PAGE_JS = """
+window.__spectronpy_cdp = (function () {
+    var ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf';
+    // References hold elements weakly, elements the page drops are collected and their references go stale
+    var weak = typeof WeakRef === 'function';
+    var elements = new Map();
+    var ids = new WeakMap();
+    var collected = weak && typeof FinalizationRegistry === 'function' ? new FinalizationRegistry(function (id) {
+        elements.delete(id);
+    }) : null;
+    var next = 0;
+
+    function Failure(error, message) {
+        this.error = error;
+        this.message = message;
+    }
+
+    function ref(el) {
+        var id = ids.get(el);
+        if (id === undefined) {
+            id = 'cdp-' + (++next);
+            ids.set(el, id);
+            elements.set(id, weak ? new WeakRef(el) : el);
+            if (collected) {
+                collected.register(el, id);
+            }
+        }
+        var rtn = {};
+        rtn[ELEMENT_KEY] = id;
+        return rtn;
+    }
+
+    function element(id) {
+        var el = elements.get(id);
+        if (el && weak) {
+            el = el.deref();
+        }
+        if (!el || !el.isConnected) {
+            throw new Failure('stale element reference', 'stale element reference: element ' + id + ' is not attached to the page document');
+        }
+        return el;
+    }
+
+    function serialize(value, seen) {
+        if (value === undefined || value === null || typeof value === 'function' || typeof value === 'symbol') {
+            return null;
+        }
+        if (typeof value !== 'object') {
+            return value;
+        }
+        if (value instanceof Element) {
+            return ref(value);
+        }
+        if (value instanceof Node || value === window) {
+            return null;
+        }
+        if (seen.indexOf(value) !== -1) {
+            throw new Failure('javascript error', 'javascript error: cyclic object value');
+        }
+        seen = seen.concat([value]);
+        if (Array.isArray(value) || value instanceof NodeList || value instanceof HTMLCollection) {
+            return Array.prototype.map.call(value, function (x) {
+                return serialize(x, seen);
+            });
+        }
+        if (typeof value.toJSON === 'function') {
+            return value.toJSON();
+        }
+        var rtn = {};
+        Object.keys(value).forEach(function (k) {
+            rtn[k] = serialize(value[k], seen);
+        });
+        return rtn;
+    }
+
+    function deserialize(value) {
+        if (Array.isArray(value)) {
+            return value.map(deserialize);
+        }
+        if (value && typeof value === 'object') {
+            if (ELEMENT_KEY in value) {
+                return element(value[ELEMENT_KEY]);
+            }
+            var rtn = {};
+            Object.keys(value).forEach(function (k) {
+                rtn[k] = deserialize(value[k]);
+            });
+            return rtn;
+        }
+        return value;
+    }
+
+    // {value} or {error, message}, like a WebDriver response
+    function run(fn) {
+        return Promise.resolve().then(fn).then(function (value) {
+            return {value: serialize(value, [])};
+        }).catch(function (e) {
+            if (e instanceof Failure) {
+                return {error: e.error, message: e.message};
+            }
+            return {error: 'javascript error', message: 'javascript error: ' + (e && e.message || String(e))};
+        });
+    }
+
+    function toArray(list) {
+        return Array.prototype.slice.call(list);
+    }
+
+    function locate(root, using, value) {
+        try {
+            switch (using) {
+                case 'css selector':
+                    return toArray(root.querySelectorAll(value));
+                case 'tag name':
+                    return toArray(root.getElementsByTagName(value));
+                case 'link text':
+                case 'partial link text':
+                    return toArray(root.querySelectorAll('a')).filter(function (a) {
+                        var text = a.innerText || '';
+                        return using === 'link text' ? text.trim() === value : text.indexOf(value) !== -1;
+                    });
+                case 'xpath':
+                    var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    var nodes = [];
+                    for (var i = 0; i < snapshot.snapshotLength; i++) {
+                        if (snapshot.snapshotItem(i).nodeType === Node.ELEMENT_NODE) {
+                            nodes.push(snapshot.snapshotItem(i));
+                        }
+                    }
+                    return nodes;
+            }
+        } catch (e) {
+            throw new Failure('invalid selector', 'invalid selector: ' + e.message);
+        }
+        throw new Failure('invalid argument', 'invalid argument: unsupported locator strategy ' + using);
+    }
+
+    function rect(el) {
+        var r = el.getBoundingClientRect();
+        return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+    }
+
+    return {
+        script: function (fn, args, async, timeout) {
+            return run(function () {
+                args = deserialize(args);
+                if (!async) {
+                    return fn.apply(null, args);
+                }
+                return new Promise(function (resolve, reject) {
+                    if (timeout !== null) {
+                        setTimeout(function () {
+                            reject(new Failure('script timeout', 'script timeout: result was not received in ' + timeout / 1000 + ' seconds'));
+                        }, timeout);
+                    }
+                    fn.apply(null, args.concat([resolve]));
+                });
+            });
+        },
+        find: function (using, value, parent, multiple) {
+            return run(function () {
+                var found = locate(parent ? element(parent) : document, using, value);
+                return multiple ? found : found.slice(0, 1);
+            });
+        },
+        element: function (name, id, arg) {
+            return run(function () {
+                var el = element(id);
+                switch (name) {
+                    case 'text':
+                        return el.innerText;
+                    case 'tag':
+                        return el.tagName.toLowerCase();
+                    case 'rect':
+                        return rect(el);
+                    case 'attribute':
+                        return el.getAttribute(arg);
+                    case 'property':
+                        return el[arg];
+                    case 'css':
+                        return getComputedStyle(el).getPropertyValue(arg);
+                    case 'enabled':
+                        return !el.disabled;
+                    case 'selected':
+                        return Boolean(el.checked || el.selected);
+                    case 'clear':
+                        if (el.isContentEditable) {
+                            el.innerHTML = '';
+                        } else {
+                            el.value = '';
+                        }
+                        el.dispatchEvent(new Event('input', {bubbles: true}));
+                        el.dispatchEvent(new Event('change', {bubbles: true}));
+                        return null;
+                    case 'focus':
+                        if (document.activeElement !== el) {
+                            el.focus();
+                            if (typeof el.value === 'string' && el.setSelectionRange) {
+                                try {
+                                    el.setSelectionRange(el.value.length, el.value.length);
+                                } catch (e) {
+                                    // Not a text input
+                                }
+                            }
+                        }
+                        return null;
+                    case 'center':
+                        el.scrollIntoView({block: 'center', inline: 'center'});
+                        var r = el.getClientRects()[0];
+                        if (!r || (!r.width && !r.height)) {
+                            throw new Failure('element not interactable', 'element not interactable: element has no size and location');
+                        }
+                        return {x: r.left + r.width / 2, y: r.top + r.height / 2};
+                }
+            });
+        },
+        page: function (name) {
+            return run(function () {
+                switch (name) {
+                    case 'title':
+                        return document.title;
+                    case 'url':
+                        return location.href;
+                    case 'source':
+                        return document.documentElement.outerHTML;
+                }
+            });
+        }
+    };
+})();
+"""
+
+_CALL = 'window.__spectronpy_cdp ? window.__spectronpy_cdp.{op}({args}) : "' + _MISSING + '"'
+
+_ERRORS = {
+    'stale element reference': StaleElementReferenceException,
+    'javascript error': JavascriptException,
+    'script timeout': TimeoutException,
+    'no such element': NoSuchElementException,
+    'invalid selector': InvalidSelectorException,
+    'invalid argument': InvalidArgumentException,
+    'element not interactable': ElementNotInteractableException,
+}
+
+# Special keys of selenium's Keys: (key, code, windowsVirtualKeyCode, text)
+_KEYS = {
+    Keys.ENTER: ('Enter', 'Enter', 13, '\r'),
+    Keys.RETURN: ('Enter', 'Enter', 13, '\r'),
+    Keys.TAB: ('Tab', 'Tab', 9, ''),
+    Keys.BACKSPACE: ('Backspace', 'Backspace', 8, ''),
+    Keys.DELETE: ('Delete', 'Delete', 46, ''),
+    Keys.ESCAPE: ('Escape', 'Escape', 27, ''),
+    Keys.HOME: ('Home', 'Home', 36, ''),
+    Keys.END: ('End', 'End', 35, ''),
+    Keys.LEFT: ('ArrowLeft', 'ArrowLeft', 37, ''),
+    Keys.UP: ('ArrowUp', 'ArrowUp', 38, ''),
+    Keys.RIGHT: ('ArrowRight', 'ArrowRight', 39, ''),
+    Keys.DOWN: ('ArrowDown', 'ArrowDown', 40, ''),
+}
+
+
+class CDPCommandExecutor:
+    """
+    Executes WebDriver commands over the DevTools protocol in place of selenium's RemoteConnection, i.e. does in
+    process what chromedriver does. Responses have the shape RemoteWebDriver.execute expects, failures raise the
+    selenium exceptions chromedriver's errors would. Unsupported commands raise UnknownMethodException.
+    """
+
+    def __init__(self, port: int, host: str = 'localhost', timeout: float = COMMAND_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.connection: Optional[CDPConnection] = None
+        self.target_id: Optional[str] = None
+        self.timeouts = {'implicit': 0, 'pageLoad': 300_000, 'script': 30_000}
+        self._loaded = threading.Event()
+
+        self._handlers: dict[str, Callable[[dict], object]] = {
+            Command.NEW_SESSION: self._new_session,
+            Command.QUIT: lambda p: self.close(),
+            Command.GET_TIMEOUTS: lambda p: dict(self.timeouts),
+            Command.SET_TIMEOUTS: self._set_timeouts,
+            Command.GET: lambda p: self._navigate('Page.navigate', {'url': p['url']}),
+            Command.REFRESH: lambda p: self._navigate('Page.reload'),
+            Command.GO_BACK: lambda p: self._history(-1),
+            Command.GO_FORWARD: lambda p: self._history(1),
+            Command.GET_TITLE: lambda p: self._call('page', 'title'),
+            Command.GET_CURRENT_URL: lambda p: self._call('page', 'url'),
+            Command.GET_PAGE_SOURCE: lambda p: self._call('page', 'source'),
+            Command.W3C_EXECUTE_SCRIPT: lambda p: self._script(p['script'], p['args'], False),
+            Command.W3C_EXECUTE_SCRIPT_ASYNC: lambda p: self._script(p['script'], p['args'], True),
+            Command.FIND_ELEMENT: lambda p: self._find(p, None, False),
+            Command.FIND_ELEMENTS: lambda p: self._find(p, None, True),
+            Command.FIND_CHILD_ELEMENT: lambda p: self._find(p, p['id'], False),
+            Command.FIND_CHILD_ELEMENTS: lambda p: self._find(p, p['id'], True),
+            Command.GET_ELEMENT_TEXT: lambda p: self._call('element', 'text', p['id']),
+            Command.GET_ELEMENT_TAG_NAME: lambda p: self._call('element', 'tag', p['id']),
+            Command.GET_ELEMENT_RECT: lambda p: self._call('element', 'rect', p['id']),
+            Command.GET_ELEMENT_ATTRIBUTE: lambda p: self._call('element', 'attribute', p['id'], p['name']),
+            Command.GET_ELEMENT_PROPERTY: lambda p: self._call('element', 'property', p['id'], p['name']),
+            Command.GET_ELEMENT_VALUE_OF_CSS_PROPERTY:
+                lambda p: self._call('element', 'css', p['id'], p['propertyName']),
+            Command.IS_ELEMENT_ENABLED: lambda p: self._call('element', 'enabled', p['id']),
+            Command.IS_ELEMENT_SELECTED: lambda p: self._call('element', 'selected', p['id']),
+            Command.CLEAR_ELEMENT: lambda p: self._call('element', 'clear', p['id']),
+            Command.CLICK_ELEMENT: self._click,
+            Command.SEND_KEYS_TO_ELEMENT: self._send_keys,
+            Command.SCREENSHOT: lambda p: self._screenshot(),
+            Command.ELEMENT_SCREENSHOT: lambda p: self._screenshot(self._call('element', 'rect', p['id'])),
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: lambda p: self.target_id,
+            Command.W3C_GET_WINDOW_HANDLES: lambda p: [x['id'] for x in self._pages()],
+            Command.SWITCH_TO_WINDOW: lambda p: self._switch_to(p['handle']),
+            Command.CLOSE: lambda p: self._close_window(),
+            'executeCdpCommand': lambda p: self.connection.send(p['cmd'], p.get('params'), self.timeout),
+        }
+
+    def execute(self, command: str, params: dict) -> dict:
+        handler = self._handlers.get(command)
+        if handler is None:
+            raise UnknownMethodException(f"{command} is not supported by the CDP backend.")
+
+        return {'value': handler(params or {})}
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    # Session and windows
+
+    def _new_session(self, params: dict) -> dict:
+        pages = self._pages()
+        if not pages:
+            raise NoSuchWindowException(f"No page target on {self.host}:{self.port}.")
+
+        self._connect(pages[0])
+        browser = devtools.version(self.port, self.host).get('Browser', '')
+
+        return {
+            'sessionId': uuid.uuid4().hex,
+            'capabilities': {
+                'browserName': 'chrome',
+                'browserVersion': browser.partition('/')[2],
+                'platformName': platform.system().lower(),
+                'timeouts': dict(self.timeouts),
+            },
+        }
+
+    def _pages(self) -> list[dict]:
+        return [x for x in devtools.targets(self.port, self.host) if x.get('type') == 'page']
+
+    def _connect(self, target: dict) -> None:
+        self.close()
+        self.connection = CDPConnection(target['webSocketDebuggerUrl'], self.timeout)
+        self.target_id = target['id']
+        self.connection.add_listener('Page.loadEventFired', lambda _: self._loaded.set())
+        self.connection.add_listener('Page.navigatedWithinDocument', lambda _: self._loaded.set())
+        self.connection.send('Page.enable', timeout=self.timeout)
+        logger.debug(f"Connected to DevTools target {self.target_id}.")
+
+    def _switch_to(self, handle: str) -> None:
+        if handle == self.target_id and self.connection is not None:
+            return
+
+        for target in self._pages():
+            if target['id'] == handle:
+                return self._connect(target)
+
+        raise NoSuchWindowException(f"no such window: {handle}")
+
+    def _close_window(self) -> list[str]:
+        closed = self.target_id
+        try:
+            self.connection.send('Page.close', timeout=self.timeout)
+        except (CDPError, TimeoutException) as e:
+            # The target may go away before answering
+            logger.debug(f"Closing window {closed}: {e}")
+        self.close()
+
+        return [x['id'] for x in self._pages() if x['id'] != closed]
+
+    def _set_timeouts(self, params: dict) -> None:
+        for key in self.timeouts:
+            if key in params:
+                self.timeouts[key] = params[key]
+
+    # Navigation
+
+    def _navigate(self, method: str, params: dict = None) -> None:
+        self._loaded.clear()
+        rtn = self.connection.send(method, params, self.timeout)
+
+        if rtn.get('errorText'):
+            raise WebDriverException(f"unknown error: net::{rtn['errorText']}")
+        if method == 'Page.navigate' and not rtn.get('loaderId'):
+            # Same document navigation, nothing to load
+            return
+
+        timeout = _seconds(self.timeouts['pageLoad'])
+        if not self._loaded.wait(timeout):
+            raise TimeoutException(f"timeout: Timed out receiving message from renderer: {timeout}")
+
+    def _history(self, offset: int) -> None:
+        history = self.connection.send('Page.getNavigationHistory', timeout=self.timeout)
+        index = history['currentIndex'] + offset
+
+        if 0 <= index < len(history['entries']):
+            self._navigate('Page.navigateToHistoryEntry', {'entryId': history['entries'][index]['id']})
+
+    # Scripts and elements
+
+    def _script(self, script: str, args: list, is_async: bool):
+        timeout = self.timeouts['script']
+        expression = _CALL.format(op='script', args=f'function () {{\n{script}\n}}, '
+                                                    f'{json.dumps([args, is_async, timeout])[1:-1]}')
+
+        return self._evaluate_call(expression, _seconds(timeout, RESPONSE_MARGIN))
+
+    def _find(self, params: dict, parent: Optional[str], multiple: bool):
+        using, value = params['using'], params['value']
+        deadline = time.monotonic() + _seconds(self.timeouts['implicit'], 0)
+
+        # Implicit wait, like chromedriver
+        while True:
+            found = self._call('find', using, value, parent, multiple)
+            if found or time.monotonic() >= deadline:
+                break
+            time.sleep(FIND_POLL_INTERVAL)
+
+        if multiple:
+            return found
+        if not found:
+            raise NoSuchElementException(f'no such element: Unable to locate element: '
+                                         f'{{"method":"{using}","selector":"{value}"}}')
+        return found[0]
+
+    def _click(self, params: dict) -> None:
+        point = self._call('element', 'center', params['id'])
+
+        for event in ('mouseMoved', 'mousePressed', 'mouseReleased'):
+            self.connection.send('Input.dispatchMouseEvent', {
+                'type': event, 'x': point['x'], 'y': point['y'], 'button': 'none' if event == 'mouseMoved' else 'left',
+                'clickCount': 0 if event == 'mouseMoved' else 1,
+            }, self.timeout)
+
+    def _send_keys(self, params: dict) -> None:
+        self._call('element', 'focus', params['id'])
+
+        text = ''
+        for char in params['text']:
+            if char not in _KEYS and not '\ue000' <= char <= '\uf8ff':
+                text += char
+                continue
+
+            if text:
+                self.connection.send('Input.insertText', {'text': text}, self.timeout)
+                text = ''
+
+            if char not in _KEYS:
+                raise InvalidArgumentException(f"Key U+{ord(char):04X} is not supported by the CDP backend.")
+
+            key, code, key_code, key_text = _KEYS[char]
+            for event in ('keyDown', 'keyUp'):
+                self.connection.send('Input.dispatchKeyEvent', {
+                    'type': event, 'key': key, 'code': code, 'windowsVirtualKeyCode': key_code,
+                    'text': key_text if event == 'keyDown' else '',
+                }, self.timeout)
+
+        if text:
+            self.connection.send('Input.insertText', {'text': text}, self.timeout)
+
+    def _screenshot(self, clip: dict = None) -> str:
+        params = {'format': 'png'}
+        if clip:
+            params['clip'] = clip | {'scale': 1}
+
+        return self.connection.send('Page.captureScreenshot', params, self.timeout)['data']
+
+    def _call(self, op: str, *args):
+        return self._evaluate_call(_CALL.format(op=op, args=json.dumps(args)[1:-1]), self.timeout)
+
+    def _evaluate_call(self, expression: str, timeout: Optional[float]):
+        rtn = self._evaluate(expression, timeout)
+        if rtn == _MISSING:
+            logger.debug('Installing SpectronPy CDP helpers into the renderer.')
+            self._evaluate(_PAGE_JS, self.timeout)
+            rtn = self._evaluate(expression, timeout)
+
+        if 'error' in rtn:
+            raise _ERRORS.get(rtn['error'], WebDriverException)(rtn['message'])
+
+        return rtn['value']
+
+    def _evaluate(self, expression: str, timeout: Optional[float]):
+        if self.connection is None:
+            raise NoSuchWindowException("no such window: target window already closed")
+
+        try:
+            rtn = self.connection.send('Runtime.evaluate', {
+                'expression': expression,
+                'returnByValue': True,
+                'awaitPromise': True,
+            }, timeout)
+        except CDPError as e:
+            if 'destroyed' in str(e) or 'navigated' in str(e):
+                raise JavascriptException('javascript error: document unloaded while waiting for result')
+            raise
+
+        if 'exceptionDetails' in rtn:
+            details = rtn['exceptionDetails']
+            raise JavascriptException(f"javascript error: "
+                                      f"{details.get('exception', {}).get('description') or details.get('text')}")
+
+        return rtn['result'].get('value')
+
+
+class CDPDriver(SpectronDriver):
+    """
+    SpectronDriver speaking the DevTools protocol to the renderer directly, without chromedriver.
+    WebDriver commands are translated in process by CDPCommandExecutor, so finders, matchers, assertions, scripts
+    and screenshots work unchanged. Other commands raise UnknownMethodException.
+    """
+
+    def __init__(self, debugger_address: str, session: Session = None, metrics: bool = False,
+                 timeout: float = COMMAND_TIMEOUT):
+        host, _, port = debugger_address.rpartition(':')
+
+        self._prepare(session, metrics)
+        self.vendor_prefix = 'goog'
+        self.service = None
+        RemoteWebDriver.__init__(self, command_executor=CDPCommandExecutor(int(port), host or 'localhost', timeout),
+                                 options=Options())
+        self._is_remote = False
+        self._bind()
+
+    def start_client(self):
+        pass
+
+    @property
+    def cdp(self) -> CDPConnection:
+        """DevTools connection of the current window."""
+        return self.command_executor.connection
+
+    def quit(self, keep_service: bool = None) -> None:
+        """Closes the DevTools connection, there is no chromedriver to stop."""
+        try:
+            RemoteWebDriver.quit(self)
+        except Exception as e:
+            logger.debug(f"Closing the DevTools connection: {e}")
+
+
+def _seconds(milliseconds: Optional[int], margin: float = 0) -> Optional[float]:
+    return None if milliseconds is None else milliseconds / 1000 + margin
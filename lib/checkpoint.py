@@ -0,0 +1,226 @@
+# checkpoint.py
+import errno
+import json
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .exception import InvalidArgument
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), '.spectronpy', 'checkpoints')
+
+# auto: copy-on-write clones where the filesystem supports them, plain copies elsewhere.
+# hardlink: checkpoint and instance share the files. Only safe for apps that replace files instead of writing in place.
+MODES = ('auto', 'hardlink', 'copy')
+
+METADATA = 'checkpoint.json'
+DATA = 'data'
+INSTANCES = '.instances'
+
+# linux/fs.h, clone a whole file on btrfs, XFS with reflink=1, bcachefs, ...
+FICLONE = 0x40049409
+
+# Errors of FICLONE meaning "not on this filesystem", not a failed copy
+_NO_REFLINK = {errno.EOPNOTSUPP, errno.ENOTTY, errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EBADF}
+
+_NAME = re.compile(r'^[\w][\w.-]*$')
+
+
+def clone_tree(src: str, dst: str, mode: str = 'auto') -> str:
+    """
+    Copies the directory `src` to `dst`, which must not exist. Chromium's Singleton* lock files are left out.
+    Returns how the files were copied: 'clonefile', 'reflink', 'hardlink' or 'copy'.
+    """
+    if mode not in MODES:
+        raise InvalidArgument(f"Checkpoint clone mode is invalid -- {mode}")
+
+    if mode == 'hardlink':
+        shutil.copytree(src, dst, symlinks=True, ignore=_ignore(src), copy_function=os.link)
+        return 'hardlink'
+
+    if mode == 'auto' and platform.system() == 'Darwin' and _clonefile_tree(src, dst):
+        return 'clonefile'
+
+    if mode == 'auto' and fcntl is not None and platform.system() == 'Linux':
+        reflink = _Reflink()
+        shutil.copytree(src, dst, symlinks=True, ignore=_ignore(src), copy_function=reflink)
+        if reflink.supported:
+            return 'reflink'
+        logger.debug(f"No reflink support for {dst}, copied {reflink.copied} file(s)")
+        return 'copy'
+
+    shutil.copytree(src, dst, symlinks=True, ignore=_ignore(src), copy_function=shutil.copy2)
+    return 'copy'
+
+
+@dataclass
+class Checkpoint:
+    """A saved user-data directory. `local_storage` is {origin: {key: value}} when it was exported."""
+    name: str
+    path: str
+    created: float
+    source: str = ''
+    method: str = ''
+    local_storage: dict = field(default_factory=dict)
+
+    @property
+    def data(self) -> str:
+        return os.path.join(self.path, DATA)
+
+
+class CheckpointStore:
+    """
+    Checkpoints in `root`, one directory each: `data/` is the user-data directory, `checkpoint.json` its metadata.
+    Instances restored from a checkpoint are cloned next to them, so copy-on-write works within one filesystem.
+    """
+
+    def __init__(self, root: str = '', mode: str = 'auto'):
+        if mode not in MODES:
+            raise InvalidArgument(f"Checkpoint clone mode is invalid -- {mode}")
+
+        self.root = root or DEFAULT_ROOT
+        self.mode = mode
+
+    def create(self, name: str, user_data_dir: str, local_storage: Optional[dict] = None) -> Checkpoint:
+        """Saves `user_data_dir` as checkpoint `name`, replacing an existing one. The app must not be running."""
+        if not os.path.isdir(user_data_dir):
+            raise InvalidArgument(f"User data directory does not exist -- {user_data_dir}")
+
+        path = self._path(name)
+        os.makedirs(self.root, exist_ok=True)
+
+        # Built beside the final path and renamed, a checkpoint is never seen half written
+        staging = os.path.join(self.root, f'.{name}.{uuid.uuid4().hex}')
+        started = time.perf_counter()
+        try:
+            method = clone_tree(user_data_dir, os.path.join(staging, DATA), self.mode)
+            rtn = Checkpoint(name, path, time.time(), os.path.abspath(user_data_dir), method, local_storage or {})
+            with open(os.path.join(staging, METADATA), 'w') as f:
+                json.dump({k: v for k, v in vars(rtn).items() if k != 'path'}, f)
+
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            os.rename(staging, path)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        logger.info(f"Checkpoint {name} created in {time.perf_counter() - started:.3f}s ({method}).")
+        return rtn
+
+    def get(self, name: str) -> Checkpoint:
+        path = self._path(name)
+        try:
+            with open(os.path.join(path, METADATA)) as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            raise InvalidArgument(f"Checkpoint does not exist -- {name}") from None
+
+        return Checkpoint(path=path, **metadata)
+
+    def names(self) -> list[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(x for x in os.listdir(self.root) if os.path.isfile(os.path.join(self.root, x, METADATA)))
+
+    def delete(self, name: str) -> None:
+        shutil.rmtree(self._path(name), ignore_errors=True)
+
+    def restore(self, name: str) -> tuple[Checkpoint, str]:
+        """Clones checkpoint `name` into a new instance directory. Returns the checkpoint and the directory."""
+        checkpoint = self.get(name)
+
+        instances = os.path.join(self.root, INSTANCES)
+        os.makedirs(instances, exist_ok=True)
+        self._sweep(instances)
+
+        target = os.path.join(instances, f'{os.getpid()}-{uuid.uuid4().hex}')
+        started = time.perf_counter()
+        method = clone_tree(checkpoint.data, target, self.mode)
+
+        logger.info(f"Checkpoint {name} restored in {time.perf_counter() - started:.3f}s ({method}).")
+        return checkpoint, target
+
+    def _path(self, name: str) -> str:
+        if not _NAME.match(name or ''):
+            raise InvalidArgument(f"Checkpoint name is invalid -- {name!r}")
+        return os.path.join(self.root, name)
+
+    @staticmethod
+    def _sweep(instances: str) -> None:
+        """Removes instance directories left behind by processes that exited without cleaning up."""
+        for entry in os.listdir(instances):
+            pid = entry.partition('-')[0]
+            if pid.isdigit() and not _alive(int(pid)):
+                shutil.rmtree(os.path.join(instances, entry), ignore_errors=True)
+
+
+class _Reflink:
+    """copy_function for shutil.copytree, cloning with FICLONE until the filesystem refuses once."""
+
+    def __init__(self):
+        self.supported = True
+        self.copied = 0
+
+    def __call__(self, src: str, dst: str) -> str:
+        if self.supported:
+            try:
+                with open(src, 'rb') as s, open(dst, 'wb') as d:
+                    fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+                shutil.copystat(src, dst)
+                return dst
+            except OSError as e:
+                if e.errno not in _NO_REFLINK:
+                    raise
+                # One tree is one filesystem, the other files won't clone either
+                self.supported = False
+
+        self.copied += 1
+        return shutil.copy2(src, dst)
+
+
+def _clonefile_tree(src: str, dst: str) -> bool:
+    """`cp -c` clones with clonefile(2) on APFS. False when it can't, with `dst` removed again."""
+    try:
+        subprocess.run(['cp', '-c', '-R', src, dst], check=True, capture_output=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.debug(f"clonefile unavailable for {dst}: {e}")
+        shutil.rmtree(dst, ignore_errors=True)
+        return False
+
+    for entry in os.listdir(dst):
+        if entry.startswith('Singleton'):
+            os.remove(os.path.join(dst, entry))
+    return True
+
+
+def _ignore(root: str):
+    """Chromium's profile lock, a symlink to the host and pid of the running browser, only at the top level."""
+    def ignore(directory, names):
+        if os.path.samefile(directory, root):
+            return [x for x in names if x.startswith('Singleton')]
+        return []
+    return ignore
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -0,0 +1,183 @@
+# chromedriver.py
+import glob
+import json
+import logging
+import os
+import threading
+import urllib.request
+from typing import Optional
+
+from .exception import DriverNotFound
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), '.wdm')
+INDEX_FILE = 'spectronpy-chromedriver.json'
+LATEST_RELEASE_URL = 'https://chromedriver.storage.googleapis.com/LATEST_RELEASE'
+
+
+class ChromedriverIndex:
+    """
+    Index of the chromedriver binaries on disk, keyed by exact version and by major (Chromium) version.
+    Resolving a known version is an in-memory lookup followed by a single stat of the binary.
+    """
+
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.path = os.path.join(root, INDEX_FILE)
+        self.exact: dict[str, str] = {}
+        self.major: dict[str, str] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def resolve(self, version: str, inferred: bool = False) -> Optional[str]:
+        """
+        Returns the binary for the exact version. A major version, or a version `inferred` from the bundled Chromium,
+        falls back to the newest binary of the same major version.
+        """
+        self._load()
+
+        binary = self.exact.get(version)
+        if not binary and (inferred or version == major(version)):
+            binary = self.major.get(major(version))
+            if binary and version != major(version):
+                logger.warning(f"No chromedriver {version} indexed, using {self._version_of(binary)} of the same "
+                               f"major version.")
+
+        if binary and os.path.isfile(binary):
+            return binary
+
+        return None
+
+    def add(self, version: str, binary: str) -> None:
+        self._load()
+
+        with self._lock:
+            self.exact[version] = binary
+            current = self.major.get(major(version))
+            if current is None or _newer(version, self._version_of(current)):
+                self.major[major(version)] = binary
+
+        self.save()
+
+    def scan(self) -> int:
+        """Rebuild the index from the webdriver_manager cache folder. Returns the number of binaries found."""
+        pattern = os.path.join(self.root, 'drivers', 'chromedriver', '*', '*', 'chromedriver*')
+        binaries = [x for x in glob.glob(pattern) if os.path.isfile(x) and not x.endswith('.zip')]
+
+        with self._lock:
+            self.exact = {}
+            self.major = {}
+            for binary in sorted(binaries, key=lambda x: _version_key(_version_dir(x))):
+                version = _version_dir(binary)
+                self.exact[version] = binary
+                self.major[major(version)] = binary
+            self._loaded = True
+
+        self.save()
+        logger.info(f"Indexed {len(binaries)} chromedriver binaries in {self.root}")
+        return len(binaries)
+
+    def save(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'exact': self.exact, 'major': self.major}, f, indent=2)
+        os.replace(tmp, self.path)
+
+    # private
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        with self._lock:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                self.exact = data.get('exact', {})
+                self.major = data.get('major', {})
+            except (OSError, ValueError):
+                pass
+            self._loaded = True
+
+    def _version_of(self, binary: str) -> str:
+        for version, path in self.exact.items():
+            if path == binary:
+                return version
+        return _version_dir(binary)
+
+
+_indexes: dict[str, ChromedriverIndex] = {}
+
+
+def get_index(root: str = DEFAULT_ROOT) -> ChromedriverIndex:
+    if root not in _indexes:
+        _indexes[root] = ChromedriverIndex(root)
+
+    return _indexes[root]
+
+
+def resolve(version: str, cache_valid_range: int = 7, offline: bool = False, root: str = DEFAULT_ROOT,
+            inferred: bool = False) -> str:
+    """
+    Returns the path of a chromedriver binary for the version, e.g. `104.0.5112.79` or `104`.
+    Looks in the index first, then rescans the cache folder. Downloads via webdriver_manager unless offline.
+    Only a version `inferred` from the bundled Chromium may resolve to another release of its major version.
+    """
+    index = get_index(root)
+
+    if binary := index.resolve(version, inferred):
+        return binary
+
+    if index.scan() and (binary := index.resolve(version, inferred)):
+        return binary
+
+    if offline:
+        raise DriverNotFound(f"No chromedriver for version {version} in {root} and offline mode is enabled.")
+
+    binary = _download(version, cache_valid_range, inferred)
+    index.add(_version_dir(binary), binary)
+
+    return binary
+
+
+def version_from_browser(browser: str) -> str:
+    """Extracts the Chromium version from the DevTools `Browser` field, e.g. `Chrome/104.0.5112.102`."""
+    return browser.rpartition('/')[2]
+
+
+def major(version: str) -> str:
+    return version.split('.')[0]
+
+
+# private
+
+
+def _download(version: str, cache_valid_range: int, inferred: bool = False) -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    try:
+        return ChromeDriverManager(version, cache_valid_range=cache_valid_range).install()
+    except Exception as e:
+        if not inferred:
+            raise DriverNotFound(f"No chromedriver release {version}. {e}") from e
+        # Electron ships Chromium builds without a matching chromedriver release, use the latest of the major version
+        logger.warning(f"No chromedriver release {version}, looking up latest release for {major(version)}. {e}")
+
+    with urllib.request.urlopen(f"{LATEST_RELEASE_URL}_{major(version)}", timeout=10) as response:
+        latest = response.read().decode('utf8').strip()
+
+    return ChromeDriverManager(latest, cache_valid_range=cache_valid_range).install()
+
+
+def _version_dir(binary: str) -> str:
+    return os.path.basename(os.path.dirname(binary))
+
+
+def _version_key(version: str) -> tuple:
+    return tuple(int(x) if x.isdigit() else 0 for x in version.split('.'))
+
+
+def _newer(version: str, other: str) -> bool:
+    return _version_key(version) > _version_key(other)
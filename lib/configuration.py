@@ -13,13 +13,21 @@ class Configuration:
         Path to electron application. Path is relative to the current working directory.
 
     app_port
-        Electron debugger port. WebDriver will connect to this.
+        Electron debugger port. WebDriver will connect to this. "auto" reserves a free port per Application.
 
     start_timeout
         Timeout for webdriver start up.
 
     wait_timeout
-        Timeout for WebDriver wait. Refer to WebDriver class for set_page_load_timeout, set_script_timeout, implicitly_wait.
+        Timeout for WebDriver wait. Refer to WebDriver class for set_page_load_timeout, set_script_timeout.
+        Finders, matchers and assertions wait up to it, the implicit wait stays 0.
+
+    backend
+        "chromedriver" sends WebDriver commands through chromedriver, "cdp" speaks the DevTools protocol to the
+        renderer directly, see cdp.py.
+
+    wait_strategy
+        "observer" resolves waits in the renderer as soon as the DOM changes, "poll" polls with WebDriverWait.
 
     stop_timeout
         Timeout for Application termination.
@@ -33,10 +41,15 @@ class Configuration:
         Cache for chromedriver version
 
     webdriver_options
-        Options passed to webdriver.
+        Options passed to webdriver. `transport` configures the connection pool to chromedriver:
+        {'pool_size': int, 'block': bool}, see transport.py.
 
     chromedriver_version
         Version of chromedriver to download. This must match the version of the Electron application.
+        Inferred from the Chromium version bundled with the application when empty.
+
+    chromedriver_offline
+        Only use chromedriver binaries already on disk, never download.
 
     chromedriver_path
         Path to chromedriver. Path is relative to the current working directory.
@@ -50,29 +63,61 @@ class Configuration:
     chromedriver_verbose
         Set chromedriver to verbose with `--verbose`.
 
+    chromedriver_reuse
+        Keep chromedriver running when the Application stops, new sessions attach to the same service.
+
+    user_data_dir
+        Electron's user data directory, passed as `--user-data-dir`. The app's default when empty.
+
+    checkpoint_dir
+        Where `Application.checkpoint()` saves user data directories. ~/.spectronpy/checkpoints when empty.
+
+    checkpoint_clone
+        How checkpoints are saved and restored: "auto" clones copy-on-write where the filesystem allows and copies
+        otherwise, "copy" always copies, "hardlink" shares the files, see checkpoint.py.
+
     electron_log_path
         Location for Electron log file to output. ex: electron.log
 
+    electron_log_buffer
+        Bytes of Electron output kept in memory for `Application.logs`, e.g. 256 * 1024. 0 leaves the output unread.
+
     debug_timeout
         Timeout for pause functionality. Refer to `Application.pause()`.
 
+    screenshot_queue_size
+        Screenshots captured but not yet written to disk before `take_screenshot()` blocks.
+
+    metrics
+        Record the latency of every WebDriver command, see `SpectronDriver.metrics` and `Application.results`.
+
     """
     app_path: str = ''
-    app_port: int = 9515
+    app_port: int | str = 9515
     start_timeout: int = 10_000
     wait_timeout: int = 5000
+    wait_strategy: str = 'poll'
+    backend: str = 'chromedriver'
     stop_timeout: int = 5000
     electron_args: list = field(default_factory=list)
     working_directory: str = os.getcwd()
     chromedriver_cache: int = 7
     webdriver_options: dict = field(default_factory=dict)
     chromedriver_version: str = ''
+    chromedriver_offline: bool = False
     chromedriver_path: str = ''
     chrome_driver_args: list = field(default_factory=list)
     chromedriver_log_path: str = ''
     chromedriver_verbose: bool = False
+    chromedriver_reuse: bool = False
+    user_data_dir: str = ''
+    checkpoint_dir: str = ''
+    checkpoint_clone: str = 'auto'
     electron_log_path: str = ''
+    electron_log_buffer: int = 0
     debug_timeout: int = 50_000
+    screenshot_queue_size: int = 16
+    metrics: bool = False
 
     def dict(self):
         return {k: v for k, v in asdict(self).items()}
@@ -81,9 +126,26 @@ class Configuration:
         if type(self.electron_args) is not list:
             raise InvalidArgument("Electron args is not a list.")
 
-        if not self.app_port:
+        if not self.app_port or (isinstance(self.app_port, str) and self.app_port != 'auto'):
             raise InvalidArgument("App port is invalid.")
 
+        if self.screenshot_queue_size < 1:
+            raise InvalidArgument("Screenshot queue size must be at least 1.")
+
+        if transport_options := self.webdriver_options.get('transport'):
+            from .transport import OPTIONS
+            if unknown := set(transport_options) - set(OPTIONS):
+                raise InvalidArgument(f"Unknown transport option(s) -- {', '.join(sorted(unknown))}")
+
+        if self.wait_strategy not in ('observer', 'poll'):
+            raise InvalidArgument(f"Wait strategy is invalid -- {self.wait_strategy}")
+
+        if self.checkpoint_clone not in ('auto', 'hardlink', 'copy'):
+            raise InvalidArgument(f"Checkpoint clone mode is invalid -- {self.checkpoint_clone}")
+
+        if self.backend not in ('chromedriver', 'cdp'):
+            raise InvalidArgument(f"Backend is invalid -- {self.backend}")
+
         if not os.path.exists(self.app_path):
             raise InvalidArgument(f"App file does not exist -- {self.app_path}")
 
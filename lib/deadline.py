@@ -0,0 +1,57 @@
+# deadline.py
+# One remaining-time budget for every wait of a step, kept per thread or asyncio task like the current Session.
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, Optional
+
+from . import session
+
+_deadline: ContextVar[Optional[float]] = ContextVar('spectronpy_deadline', default=None)
+
+
+@contextmanager
+def within(seconds: float = None) -> Iterator[Optional[float]]:
+    """
+    Waits inside the block draw from one budget of `seconds`, the session's wait time by default, instead of each
+    getting its full wait. Nested blocks can only shorten the budget of the outer one.
+
+        with deadline.within(5):
+            row = finders.element('.row')
+            matchers.Element.to_have_text(row, 'Saved')  # whatever finding the row left of the 5 seconds
+    """
+    token = start(seconds)
+    try:
+        yield _deadline.get()
+    finally:
+        reset(token)
+
+
+def start(seconds: float = None) -> Token:
+    """Same as `within()` for hooks that can't wrap a block, e.g. behave's before_step. End it with `reset()`."""
+    if seconds is None:
+        seconds = session.current().wait_time
+
+    end = _deadline.get()
+    if seconds is not None:
+        end = time.monotonic() + seconds if end is None else min(end, time.monotonic() + seconds)
+
+    return _deadline.set(end)
+
+
+def reset(token: Token) -> None:
+    _deadline.reset(token)
+
+
+def remaining(wait: Optional[float] = None) -> Optional[float]:
+    """`wait` capped by the time left of the current budget, unchanged outside of `within()`."""
+    end = _deadline.get()
+    if end is None:
+        return wait
+
+    left = max(end - time.monotonic(), 0)
+    return left if wait is None else min(wait, left)
+
+
+def active() -> bool:
+    return _deadline.get() is not None
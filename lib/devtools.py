@@ -0,0 +1,68 @@
+# devtools.py
+import http.client
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+from subprocess import Popen
+from typing import Optional
+
+from .exception import NotReady, POpenError
+
+logger = logging.getLogger(__name__)
+
+# Local endpoint, never go through a proxy configured in the environment
+_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+INITIAL_DELAY = 0.005
+MAX_DELAY = 0.1
+
+
+def get_json(port: int, path: str, host: str = 'localhost', timeout: float = 1.0) -> dict | list:
+    """GET one of the DevTools HTTP endpoints, e.g. `/json/version` or `/json/list`."""
+    with _opener.open(f"http://{host}:{port}{path}", timeout=timeout) as response:
+        return json.loads(response.read().decode('utf8'))
+
+
+def version(port: int, host: str = 'localhost') -> dict:
+    return get_json(port, '/json/version', host)
+
+
+def targets(port: int, host: str = 'localhost') -> list:
+    return get_json(port, '/json/list', host)
+
+
+def wait_until_ready(port: int, timeout: float, process: Optional[Popen] = None, host: str = 'localhost') -> dict:
+    """
+    Polls the DevTools endpoint with a short exponential backoff until it answers and a page target exists.
+    Returns the `/json/version` payload.
+
+    Raises POpenError if the process exits first and NotReady if the timeout expires.
+    """
+    deadline = time.monotonic() + timeout
+    delay = INITIAL_DELAY
+    info = None
+    error = None
+
+    while True:
+        if process is not None and process.poll() is not None:
+            raise POpenError(f"Application exited with code {process.returncode} before DevTools was ready.")
+
+        try:
+            if info is None:
+                info = version(port, host)
+            if any(x.get('type') == 'page' for x in targets(port, host)):
+                return info
+            error = 'no page target yet'
+        except (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError, ValueError) as e:
+            # Not listening yet, or dropping the connection while it comes up
+            error = e
+            logger.debug(f"DevTools on port {port} not ready:: {e!r}")
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise NotReady(f"DevTools on port {port} not ready after {timeout} seconds, last: {error}")
+
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, MAX_DELAY)
@@ -1,31 +1,101 @@
 # driver.py
+import time
+from typing import Optional
 
 from selenium.webdriver.chrome.webdriver import WebDriver
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
 from selenium.webdriver.common.timeouts import Timeouts
+from selenium.webdriver.remote.webelement import WebElement
 
-from . import globals as world
+from . import snapshot
+from .element import ELEMENT_KEY, SpectronElement
+from .metrics import CommandMetrics
+from .session import Session
+from .transport import SpectronConnection
 
 
 class SpectronDriver(WebDriver):
+    _web_element_cls = SpectronElement
 
-    def __init__(self, kwargs):
+    def __init__(self, kwargs, session: Session = None, metrics: bool = False):
+        self._prepare(session, metrics)
+        kwargs = dict(kwargs)
+        self._transport_options: dict = kwargs.pop('transport', None) or {}
+        super().__init__(**kwargs)
+        self._bind()
+
+    def _prepare(self, session: Optional[Session], metrics: bool) -> None:
+        # Set before the session is created, so newSession is recorded as well
+        self.metrics: Optional[CommandMetrics] = CommandMetrics() if metrics else None
+        self.session = session or Session()
+
+    def _bind(self) -> None:
         from . import matchers
         from . import finders
 
-        super().__init__(**kwargs)
-        matchers.driver = self
-        finders.driver = self
+        self.session.driver = self
+        self.script_timeout = None
         self.match = matchers
         self.find = finders
 
+    def start_client(self):
+        # Called by the WebDriver constructor before the session is created
+        if not isinstance(self.command_executor, SpectronConnection):
+            self.command_executor = SpectronConnection.replace(self.command_executor, self.vendor_prefix,
+                                                               self._transport_options)
+
+    @property
+    def transport(self) -> SpectronConnection:
+        """Connection to chromedriver, `transport.stats.summary()` reports its pool usage."""
+        return self.command_executor
+
+    def execute(self, driver_command: str, params: dict = None) -> dict:
+        if self.session.snapshot is not None and snapshot.mutates(driver_command, params):
+            self.session.snapshot.invalidate()
+
+        if self.metrics is None:
+            return super().execute(driver_command, params)
+
+        started = time.perf_counter()
+        try:
+            return super().execute(driver_command, params)
+        finally:
+            self.metrics.record(driver_command, time.perf_counter() - started, params,
+                                size=getattr(self.command_executor, 'sent_bytes', None))
+
+    def _wrap_value(self, value):
+        # Elements created outside the driver are sent as references as well
+        if isinstance(value, WebElement):
+            return {ELEMENT_KEY: value.id}
+        return super()._wrap_value(value)
+
+    def quit(self, keep_service: bool = None) -> None:
+        """
+        Ends the session. The chromedriver service is only stopped when keep_service is False, by default a shared
+        service (see `service.shared()`) keeps running. WebDriver calls quit() as well when the session fails to start.
+        """
+        if keep_service is None:
+            keep_service = getattr(self.service, 'shared', False)
+
+        if not keep_service:
+            return super().quit()
+
+        try:
+            RemoteWebDriver.quit(self)
+        except Exception:
+            # Same as ChromiumDriver.quit, the session is gone either way
+            pass
+
     def update_wait(self, wait_time: int):
+        # Finders, matchers and assertions wait explicitly, an implicit wait would be added to every poll
         timeouts = Timeouts(
-            implicit_wait=wait_time,
+            implicit_wait=0,
             page_load=wait_time,
             script=wait_time
         )
         self._set_wait_timers(timeouts)
+        self.session.wait_time = wait_time
 
     def _set_wait_timers(self, timeouts: Timeouts):
         self.timeouts = timeouts
-        world.default_wait_time = timeouts.implicit_wait
+        self.script_timeout = timeouts.script
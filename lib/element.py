@@ -1,13 +1,39 @@
+from collections.abc import Sequence
+from typing import Iterable, Optional
+
+from selenium.common import StaleElementReferenceException, WebDriverException
 from selenium.webdriver.remote.webelement import WebElement
 
+from . import evaluate
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# (by, value, filters) an element was found with, filters as in `finders.all()`
+Locator = tuple[str, str, dict]
+
 
 def wrap_element(el: WebElement) -> WebElement:
-    return SpectronElement(el)
+    if isinstance(el, SpectronElement):
+        return el
+    return SpectronElement(el.parent, el.id)
 
 
 class SpectronElement(WebElement):
-    def __init__(self, el):
-        super().__init__(el.parent, el.id)
+    """
+    Element class of SpectronDriver, every element the driver returns is one.
+
+    Elements returned by finders remember their locator and their index among the matches. When a command fails
+    because the element went stale, e.g. after a re-render, it is found again once by locator and the command is
+    retried. Counted in `Session.stale`.
+    """
+
+    def __init__(self, parent, id_: str = None, locator: Optional[Locator] = None, index: int = 0):
+        if id_ is None and isinstance(parent, WebElement):
+            # SpectronElement(element), as before the driver created them itself
+            parent, id_ = parent.parent, parent.id
+        super().__init__(parent, id_)
+        self.locator = locator
+        self.index = index
 
     def __enter__(self):
         return self
@@ -15,3 +41,174 @@ class SpectronElement(WebElement):
     def __exit__(self, exc_type, exc_val, traceback):
         # nothing to do during exit
         pass
+
+    def reresolve(self) -> bool:
+        """
+        Finds the element again by its locator, in one script call and without waiting.
+        Returns False when it has no locator or nothing matches at its index anymore.
+        """
+        if self.locator is None:
+            return False
+
+        ids = _pick(self._parent, _select(self._parent, self.locator), (self.index,))
+        if ids is None:
+            return False
+
+        self._id = ids[0]
+        return True
+
+    def _execute(self, command, params=None):
+        try:
+            return super()._execute(command, params)
+        except StaleElementReferenceException:
+            _count(self._parent, 'stale')
+            if not self.reresolve():
+                raise
+        return super()._execute(command, params)
+
+
+class BaseElementCollection(Sequence):
+    """
+    Ids of elements found together, with the locator they were found with and their positions among its matches.
+    Indexing and iteration create the elements on access. The bulk operations are up to the subclass, ElementCollection
+    or the aio one.
+    """
+    __slots__ = ('_driver', '_ids', '_locator', '_indexes')
+
+    def __init__(self, driver, ids: Iterable[str], locator: Optional[Locator] = None,
+                 indexes: Optional[Iterable[int]] = None):
+        self._driver = driver
+        self._ids = tuple(ids)
+        self._locator = locator
+        # Positions among the matches of the locator, a slice keeps those of the whole collection
+        self._indexes = tuple(indexes) if indexes is not None else tuple(range(len(self._ids)))
+
+    @classmethod
+    def of(cls, driver, elements: Iterable, locator: Optional[Locator] = None):
+        return cls(driver, [x.id for x in elements], locator)
+
+    @property
+    def ids(self) -> tuple[str, ...]:
+        return self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(self._driver, self._ids[index], self._locator, self._indexes[index])
+        return self._element(self._ids[index], self._indexes[index])
+
+    def __eq__(self, other):
+        if isinstance(other, BaseElementCollection):
+            return self._ids == other._ids
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<{type(self).__name__} of {len(self._ids)} elements>"
+
+    def _element(self, id_: str, index: int):
+        raise NotImplementedError
+
+    def _args(self) -> list[dict]:
+        """The elements as script arguments"""
+        return [{ELEMENT_KEY: x} for x in self._ids]
+
+    def _found_again(self, ids: Optional[list[str]]) -> bool:
+        """Takes the ids at the collection's positions among the matches found again, False if any is gone."""
+        ids = _pick(self._driver, ids, self._indexes)
+        if ids is None:
+            return False
+
+        self._ids = ids
+        return True
+
+
+class ElementCollection(BaseElementCollection):
+    """
+    Elements returned by `finders.all()`. Only the element ids are kept, indexing and iteration create the
+    SpectronElement on access.
+
+    Bulk operations query or act on every element in one script call:
+
+        rows = finders.all('.row')
+        rows.texts()           # ['Row 1', 'Row 2', ...]
+        rows.attributes('href')
+        rows.rects()           # [{'x': ..., 'y': ..., 'width': ..., 'height': ...}, ...]
+        rows.click_all()
+
+    With the locator the elements were found with, the elements remember it, and a bulk operation failing on a
+    stale element finds the elements again once.
+    """
+    __slots__ = ()
+
+    def texts(self) -> list[str]:
+        """Rendered text of every element (innerText)."""
+        return self._call('texts')
+
+    def attributes(self, name: str) -> list[Optional[str]]:
+        """Value of the HTML attribute of every element, None where it is missing."""
+        return self._call('attributes', name)
+
+    def rects(self) -> list[dict]:
+        """Position and size of every element relative to the document, like `WebElement.rect`."""
+        return self._call('rects')
+
+    def click_all(self) -> None:
+        """Clicks the elements in order with `HTMLElement.click()`, without WebDriver's interactability checks."""
+        self._call('clickAll')
+
+    def _element(self, id_: str, index: int) -> SpectronElement:
+        return SpectronElement(self._driver, id_, self._locator, index)
+
+    def _call(self, name: str, *args) -> list:
+        if not self._ids:
+            return []
+
+        try:
+            return evaluate.call(self._driver, name, self._args(), *args)
+        except StaleElementReferenceException:
+            _count(self._driver, 'stale')
+            if not self._reresolve():
+                raise
+        return evaluate.call(self._driver, name, self._args(), *args)
+
+    def _reresolve(self) -> bool:
+        if self._locator is None:
+            return False
+
+        return self._found_again(_select(self._driver, self._locator))
+
+
+def _select(driver, locator: Locator) -> Optional[list[str]]:
+    """Ids of the elements matching the locator now, None when there are none."""
+    by, value, filters = locator
+    try:
+        found = evaluate.call(driver, 'select', by, value, filters)
+    except WebDriverException:
+        return None
+    return _found_ids(found)
+
+
+def _found_ids(found: Optional[dict]) -> Optional[list[str]]:
+    """Ids of the elements of a runtime `select` result, None when nothing matched."""
+    return [x.id for x in found['elements']] if found else None
+
+
+def _pick(driver, ids: Optional[list[str]], indexes: Iterable[int]) -> Optional[tuple[str, ...]]:
+    """Ids at the positions among the matches found again, None when any of them is gone."""
+    if ids is None or any(x >= len(ids) for x in indexes):
+        _count(driver, 'failed')
+        return None
+
+    _count(driver, 'reresolved')
+    return tuple(ids[x] for x in indexes)
+
+
+def _count(driver, key: str) -> None:
+    if session := getattr(driver, 'session', None):
+        session.stale[key] += 1
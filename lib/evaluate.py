@@ -0,0 +1,471 @@
+# evaluate.py
+import logging
+import pkgutil
+import time
+from typing import Optional
+
+from selenium.common import JavascriptException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+
+from . import deadline
+from . import session
+from .expected import scripted
+from .result import ResultDict
+
+logger = logging.getLogger(__name__)
+
+RUNTIME_VERSION = 9
+
+OBSERVE_INTERVAL = 50
+
+# Leave room between the end of an observation and chromedriver's script timeout
+SCRIPT_TIMEOUT_MARGIN = 0.25
+
+# WebDriverWait's default, shortened when less time is left, so a spent deadline doesn't sleep a whole poll
+POLL_FREQUENCY = 0.5
+MIN_POLL_FREQUENCY = 0.01
+
+_MISSING = '__spectronpy_missing__'
+
+# Installed once per document as `window.__spectronpy`. Calls after that only send the function name and arguments,
+# so the (large) selenium isDisplayed atom is not re-sent with every script call.
+_RUNTIME_JS = """
+window.__spectronpy = (function () {
+    var isDisplayed = %(is_displayed)s;
+
+    function toArray(list) {
+        return Array.prototype.slice.call(list);
+    }
+
+    function locate(by, value) {
+        switch (by) {
+            case 'css selector':
+                return toArray(document.querySelectorAll(value));
+            case 'id':
+                return toArray(document.querySelectorAll('#' + CSS.escape(value)));
+            case 'class name':
+                return toArray(document.querySelectorAll('.' + CSS.escape(value)));
+            case 'name':
+                return toArray(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+            case 'tag name':
+                return toArray(document.getElementsByTagName(value));
+            case 'link text':
+                return toArray(document.querySelectorAll('a')).filter(function (a) {
+                    return text(a).trim() === value;
+                });
+            case 'partial link text':
+                return toArray(document.querySelectorAll('a')).filter(function (a) {
+                    return text(a).indexOf(value) !== -1;
+                });
+            case 'xpath':
+                var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                var nodes = [];
+                for (var i = 0; i < snapshot.snapshotLength; i++) {
+                    if (snapshot.snapshotItem(i).nodeType === Node.ELEMENT_NODE) {
+                        nodes.push(snapshot.snapshotItem(i));
+                    }
+                }
+                return nodes;
+        }
+        throw new Error('Unsupported locator strategy: ' + by);
+    }
+
+    function text(el) {
+        return el.innerText || '';
+    }
+
+    function matches(result) {
+        return Object.keys(result).every(function (k) {
+            return result[k];
+        });
+    }
+
+    function verify(el, expectations) {
+        var result = {};
+        if (expectations.visible) {
+            result.visible = Boolean(isDisplayed(el));
+        }
+        if (expectations.text) {
+            result.text = text(el).indexOf(expectations.text) !== -1;
+        }
+        return result;
+    }
+
+    // Conditions which can be polled from Python or observed in the renderer. Falsy while not met.
+    var predicates = {
+        title_contains: function (expected, caseInsensitive) {
+            var actual = document.title;
+            if (caseInsensitive) {
+                actual = actual.toLowerCase();
+                expected = expected.toLowerCase();
+            }
+            return actual.indexOf(expected) !== -1;
+        },
+        title_is: function (title) {
+            return document.title === title;
+        },
+        url_contains: function (url) {
+            return location.href.indexOf(url) !== -1;
+        },
+        url_to_be: function (url) {
+            return location.href === url;
+        },
+        url_matches: function (pattern) {
+            return new RegExp(pattern).test(location.href);
+        },
+        url_changes: function (url) {
+            return location.href !== url;
+        },
+        presence: function (by, value) {
+            var found = locate(by, value);
+            return found.length ? found : null;
+        },
+        clickable: function (by, value, element) {
+            var target = element || locate(by, value)[0];
+            return target && isDisplayed(target) && !target.disabled ? target : null;
+        },
+        text_in_element: function (by, value, element, expected) {
+            var target = element || locate(by, value)[0];
+            return Boolean(target) && text(target).indexOf(expected) !== -1;
+        },
+        verify: function (by, value, expectations, elements) {
+            var targets = elements || locate(by, value);
+            if (!targets.length) {
+                return null;
+            }
+            return targets.map(function (el) {
+                return verify(el, expectations);
+            });
+        },
+        // [index, value] of the first condition met, conditions given as [name, args]
+        any_of: function (conditions) {
+            for (var i = 0; i < conditions.length; i++) {
+                var value = predicates[conditions[i][0]].apply(null, conditions[i][1]);
+                if (value) {
+                    return [i, value];
+                }
+            }
+            return null;
+        },
+        // values of all conditions once every one of them is met
+        all_of: function (conditions) {
+            var values = [];
+            for (var i = 0; i < conditions.length; i++) {
+                var value = predicates[conditions[i][0]].apply(null, conditions[i][1]);
+                if (!value) {
+                    return null;
+                }
+                values.push(value);
+            }
+            return values;
+        },
+        select: function (by, value, filters) {
+            var candidates = locate(by, value);
+            if (!candidates.length) {
+                return null;
+            }
+            return {
+                found: candidates.length,
+                elements: candidates.filter(function (el) {
+                    return matches(verify(el, filters));
+                })
+            };
+        }
+    };
+
+    // Resolves `done` as soon as the predicate is met, re-checking on DOM mutations and navigation events.
+    // The interval covers changes without a DOM mutation, e.g. history.pushState or layout driven visibility.
+    function observe(name, args, timeout, done) {
+        var finished = false;
+        var observer = null;
+        var timer = null;
+        var interval = null;
+
+        function finish(value) {
+            if (finished) {
+                return;
+            }
+            finished = true;
+            if (observer) {
+                observer.disconnect();
+            }
+            clearTimeout(timer);
+            clearInterval(interval);
+            window.removeEventListener('popstate', check);
+            window.removeEventListener('hashchange', check);
+            done(value);
+        }
+
+        function check() {
+            try {
+                var value = predicates[name].apply(null, args);
+                if (value) {
+                    finish(value);
+                }
+            } catch (e) {
+                finish({__spectronpy_error__: String(e)});
+            }
+        }
+
+        check();
+        if (finished) {
+            return;
+        }
+
+        observer = new MutationObserver(check);
+        observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+        window.addEventListener('popstate', check);
+        window.addEventListener('hashchange', check);
+        interval = setInterval(check, %(interval)d);
+        timer = setTimeout(function () {
+            finish(false);
+        }, timeout);
+    }
+
+    // Text of the element's own text nodes, split at its child elements: one string before each child and one after
+    // the last. Sending innerText instead would repeat the text of every element in each of its ancestors.
+    function ownText(el) {
+        var segments = [''];
+        for (var node = el.firstChild; node; node = node.nextSibling) {
+            if (node.nodeType === Node.TEXT_NODE) {
+                segments[segments.length - 1] += node.data;
+            } else if (node.nodeType === Node.ELEMENT_NODE) {
+                segments.push('');
+            }
+        }
+        return segments;
+    }
+
+    // Every element in document order as [parent index, tag, attributes, displayed, own text], see snapshot.py
+    function snapshot() {
+        var elements = [document.documentElement].concat(toArray(document.documentElement.getElementsByTagName('*')));
+        var indexes = new Map();
+        var nodes = elements.map(function (el, i) {
+            var attrs = {};
+            for (var j = 0; j < el.attributes.length; j++) {
+                attrs[el.attributes[j].name] = el.attributes[j].value;
+            }
+            indexes.set(el, i);
+            var parent = indexes.has(el.parentElement) ? indexes.get(el.parentElement) : -1;
+            return [parent, el.tagName.toLowerCase(), attrs, Boolean(isDisplayed(el)), ownText(el)];
+        });
+        return {title: document.title, url: location.href, nodes: nodes, elements: elements};
+    }
+
+    // Bulk reads and actions of ElementCollection, one value per element
+    var bulk = {
+        texts: function (elements) {
+            return elements.map(function (el) {
+                return text(el);
+            });
+        },
+        attributes: function (elements, name) {
+            return elements.map(function (el) {
+                return el.getAttribute(name);
+            });
+        },
+        rects: function (elements) {
+            return elements.map(function (el) {
+                var rect = el.getBoundingClientRect();
+                return {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height};
+            });
+        },
+        clickAll: function (elements) {
+            elements.forEach(function (el) {
+                el.click();
+            });
+            return elements.length;
+        }
+    };
+
+    return Object.assign({
+        version: %(version)d,
+        snapshot: snapshot,
+        locate: locate,
+        text: text,
+        isDisplayed: isDisplayed,
+        observe: observe
+    }, predicates, bulk);
+})();
+"""
+
+_runtime_source: Optional[str] = None
+
+
+def call(driver, name: str, *args):
+    """Calls a function of the in-renderer runtime. Installs the runtime first when it is missing or outdated,
+    e.g. on first use or after the window was reloaded."""
+    script = _call_script(name)
+
+    rtn = _healing(driver.execute_script, script, args)
+    if rtn == _MISSING:
+        logger.debug('Installing SpectronPy runtime into the renderer.')
+        driver.execute_script(_runtime())
+        rtn = _healing(driver.execute_script, script, args)
+
+    return rtn
+
+
+def call_async(driver, name: str, *args):
+    """Same as `call()` for runtime functions which report their result through a callback."""
+    script = _call_async_script(name)
+
+    rtn = _healing(driver.execute_async_script, script, args)
+    if rtn == _MISSING:
+        logger.debug('Installing SpectronPy runtime into the renderer.')
+        driver.execute_script(_runtime())
+        rtn = _healing(driver.execute_async_script, script, args)
+
+    return rtn
+
+
+def until(driver, condition, wait: float, strategy: str = None):
+    """
+    Waits up to `wait` seconds until the condition returns a truthy value and returns it. Raises TimeoutException.
+
+    With the "observer" strategy, conditions created with `expected.scripted()` are evaluated in the renderer on every
+    DOM mutation and return as soon as they are met. Other conditions and the "poll" strategy use WebDriverWait.
+    """
+    if strategy is None:
+        strategy = session.current().wait_strategy
+
+    # Within `deadline.within()`, whatever is left of the step's budget
+    wait = deadline.remaining(wait)
+
+    script = getattr(condition, 'script', None)
+    script_timeout = getattr(driver, 'script_timeout', None)
+
+    if strategy == 'observer' and script and script_timeout and script_timeout > SCRIPT_TIMEOUT_MARGIN:
+        return observe(driver, script, wait, script_timeout - SCRIPT_TIMEOUT_MARGIN)
+
+    poll = max(min(POLL_FREQUENCY, wait), MIN_POLL_FREQUENCY)
+    return WebDriverWait(driver, wait, poll_frequency=poll).until(condition)
+
+
+def observe(driver, script: tuple, wait: float, max_slice: float):
+    """
+    Blocks on one async script per slice until the runtime predicate is met.
+    Slices are bounded by the script timeout, navigations restart the observation.
+    """
+    name, args = script
+    deadline = time.monotonic() + wait
+
+    while True:
+        remaining = max(deadline - time.monotonic(), 0)
+
+        try:
+            rtn = call_async(driver, 'observe', name, args, int(min(remaining, max_slice) * 1000))
+        except JavascriptException as e:
+            if 'unloaded' not in (e.msg or ''):
+                raise
+            logger.debug(f"Document unloaded while observing {name}, observing again.")
+            rtn = False
+
+        if isinstance(rtn, dict) and '__spectronpy_error__' in rtn:
+            raise JavascriptException(rtn['__spectronpy_error__'])
+
+        if rtn:
+            return rtn
+
+        if time.monotonic() >= deadline:
+            raise TimeoutException(f"Condition {name} not met within {wait} seconds.")
+
+
+def verify_all(driver, element_or_locator: WebElement | str, by: By, wait: int, expectations: dict) -> list[ResultDict]:
+    """
+    Evaluates the expectations (visible, text, count) against every element matching the locator in one script call.
+    Waits up to `wait` seconds for at least one element to be present, like `finders.all()`.
+    """
+    payload = _expectations(expectations)
+
+    if isinstance(element_or_locator, WebElement):
+        results = call(driver, 'verify', None, None, payload, [element_or_locator])
+    else:
+        try:
+            results = until(driver, _runtime_condition('verify', by, element_or_locator, payload), wait)
+        except TimeoutException:
+            logger.info(f"Wait time expired:: {(element_or_locator, by)}, wait time: {wait}")
+            results = []
+
+    return [ResultDict(x) for x in results]
+
+
+def select(driver, locator: str, by: By, wait: int, filters: dict) -> list[WebElement]:
+    """
+    Finds the elements matching the locator and keeps only those matching the filters (visible, text), in one script
+    call per poll. Waits up to `wait` seconds for at least one candidate to be present, like `query.query()`.
+    """
+    try:
+        return until(driver, _runtime_condition('select', by, locator, _filters(filters)), wait)['elements']
+    except TimeoutException:
+        logger.info(f"Wait time expired:: {(locator, by)}, wait time: {wait}")
+        return []
+
+
+def _runtime_condition(name: str, *args):
+    """Condition of the runtime predicate `name`, polled with `call()` or observed in the renderer."""
+    def _predicate(d):
+        return call(d, name, *args)
+
+    return scripted(_predicate, name, *args)
+
+
+def _filters(values: dict) -> dict:
+    """The filters of `select` among finder keyword arguments"""
+    return {k: values.get(k, None) for k in ('visible', 'text')}
+
+
+def _expectations(values: dict) -> dict:
+    """The expectations of `verify` among assertion keyword arguments"""
+    return {k: values.get(k, None) for k in ('visible', 'text', 'count')}
+
+
+def _healing(execute, script: str, args: tuple):
+    """Runs the script, once more if an element argument was stale and could be found again by its locator."""
+    try:
+        return execute(script, *args)
+    except StaleElementReferenceException:
+        elements = [x for x in _flatten(args) if getattr(x, 'locator', None) is not None]
+        if not elements:
+            raise
+        driver = elements[0].parent
+        if ctx := getattr(driver, 'session', None):
+            ctx.stale['stale'] += 1
+        if not all([x.reresolve() for x in elements]):
+            raise
+    return execute(script, *args)
+
+
+def _flatten(args):
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            yield from _flatten(arg)
+        else:
+            yield arg
+
+
+def _call_script(name: str) -> str:
+    return f"var rt = window.__spectronpy; " \
+           f"return rt && rt.version === {RUNTIME_VERSION} ? rt.{name}.apply(null, arguments) : '{_MISSING}';"
+
+
+def _call_async_script(name: str) -> str:
+    return f"var done = arguments[arguments.length - 1]; var rt = window.__spectronpy; " \
+           f"if (!(rt && rt.version === {RUNTIME_VERSION})) {{ done('{_MISSING}'); return; }} " \
+           f"rt.{name}.apply(null, Array.prototype.slice.call(arguments, 0, -1).concat([done]));"
+
+
+def _runtime() -> str:
+    global _runtime_source
+
+    if _runtime_source is None:
+        is_displayed = pkgutil.get_data('selenium.webdriver.remote', 'isDisplayed.js').decode('utf8')
+        _runtime_source = _RUNTIME_JS % {
+            'is_displayed': is_displayed,
+            'version': RUNTIME_VERSION,
+            'interval': OBSERVE_INTERVAL
+        }
+
+    return _runtime_source
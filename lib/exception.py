@@ -30,3 +30,20 @@ class ExpectationNotMet(Error):
 
 class AmbiguousMatch(Error):
     pass
+
+
+class NotReady(Error):
+    pass
+
+
+class DriverNotFound(Error):
+    pass
+
+
+class PortUnavailable(Error):
+    pass
+
+
+class CDPError(Error):
+    """Error response of the DevTools protocol, or its connection closed"""
+    pass
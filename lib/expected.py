@@ -1,7 +1,17 @@
 # expected.py
+import re
 
-from selenium.common import StaleElementReferenceException
-from selenium.webdriver.remote.webelement import WebElement
+from selenium.common import StaleElementReferenceException, WebDriverException
+from selenium.webdriver.support import expected_conditions as Expected
+
+
+def scripted(predicate, name: str, *args):
+    """
+    Attaches the equivalent runtime predicate (see evaluate.py) to a condition, so it can be observed in the renderer.
+    Locators are (by, value) tuples, anything else is an element of either driver, so aio conditions are built here too.
+    """
+    predicate.script = (name, list(args))
+    return predicate
 
 
 def text_to_be_present_in_element(element_or_locator, text_):
@@ -13,14 +23,18 @@ def text_to_be_present_in_element(element_or_locator, text_):
     def _predicate(driver):
         try:
             target = element_or_locator
-            if not isinstance(target, WebElement):
+            if isinstance(target, tuple):
                 target = driver.find_element(*target)
             element_text = target.text
             return text_ in element_text
         except StaleElementReferenceException:
             return False
 
-    return _predicate
+    if isinstance(element_or_locator, tuple):
+        by, locator = element_or_locator
+        return scripted(_predicate, 'text_in_element', by, locator, None, text_)
+
+    return scripted(_predicate, 'text_in_element', None, None, element_or_locator, text_)
 
 
 def title_contains(expected, case_insensitive=False):
@@ -38,4 +52,83 @@ def title_contains(expected, case_insensitive=False):
 
         return title in actual
 
-    return _predicate
+    return scripted(_predicate, 'title_contains', expected, case_insensitive)
+
+
+def title_is(title):
+    return scripted(Expected.title_is(title), 'title_is', title)
+
+
+def url_contains(url):
+    return scripted(Expected.url_contains(url), 'url_contains', url)
+
+
+def url_to_be(url):
+    return scripted(Expected.url_to_be(url), 'url_to_be', url)
+
+
+def url_matches(pattern):
+    source = pattern.pattern if isinstance(pattern, re.Pattern) else pattern
+    return scripted(Expected.url_matches(pattern), 'url_matches', source)
+
+
+def url_changes(url):
+    return scripted(Expected.url_changes(url), 'url_changes', url)
+
+
+def presence_of_all_elements_located(locator):
+    return scripted(Expected.presence_of_all_elements_located(locator), 'presence', *locator)
+
+
+def element_to_be_clickable(mark):
+    if isinstance(mark, tuple):
+        by, locator = mark
+        return scripted(Expected.element_to_be_clickable(mark), 'clickable', by, locator, None)
+
+    return scripted(Expected.element_to_be_clickable(mark), 'clickable', None, None, mark)
+
+
+def any_of(*expected_conditions):
+    """ An expectation that any of multiple expected conditions is true.
+    returns (index, value) of the first condition met, False otherwise.
+    """
+
+    def _predicate(driver):
+        for index, condition in enumerate(expected_conditions):
+            try:
+                if value := condition(driver):
+                    return index, value
+            except WebDriverException:
+                pass
+        return False
+
+    return _combined(_predicate, 'any_of', expected_conditions)
+
+
+def all_of(*expected_conditions):
+    """ An expectation that all of multiple expected conditions are true.
+    returns the list of values once every condition is met, False otherwise.
+    """
+
+    def _predicate(driver):
+        values = []
+        for condition in expected_conditions:
+            try:
+                if not (value := condition(driver)):
+                    return False
+                values.append(value)
+            except WebDriverException:
+                return False
+        return values
+
+    return _combined(_predicate, 'all_of', expected_conditions)
+
+
+def _combined(predicate, name: str, expected_conditions):
+    scripts = [getattr(x, 'script', None) for x in expected_conditions]
+
+    # Observable in the renderer only if every condition has a runtime predicate
+    if all(scripts):
+        return scripted(predicate, name, [list(x) for x in scripts])
+
+    return predicate
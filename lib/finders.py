@@ -1,16 +1,15 @@
 # finders.py
 import logging
-from typing import Optional
 
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as Expected
 
-from . import expected as SpectronExpected
-from .element import wrap_element
+from . import deadline
+from . import session
+from .element import ElementCollection
+from .evaluate import _filters, select
 from .exception import ExpectationNotMet, AmbiguousMatch
-from .globals import get_driver, get_default_wait_time, get_default_selector
 from .query import query
 
 logger = logging.getLogger(__name__)
@@ -48,31 +47,60 @@ def by_partial_link_text(text: str, wait: int = None) -> WebElement:
     return element(text, By.PARTIAL_LINK_TEXT, wait)
 
 
-def all(locator: str, by=None, wait: int = None, **kwargs) -> list[Optional[WebElement]]:
+def all(locator: str, by=None, wait: int = None, **kwargs) -> ElementCollection:
+    ctx = session.current()
+
     if by is None:
-        by = get_default_selector()
+        by = ctx.selector
 
     if wait is None:
-        wait = get_default_wait_time()
+        wait = ctx.wait_time
+
+    elems = []
+
+    filters = _filters(kwargs)
+    found = ctx.snapshot.select(locator, by, filters) if ctx.snapshot else None
+    if found is not None:
+        """Evaluated against the DOM snapshot, nothing to wait for"""
+        elems = found
+    elif any(filters.values()):
+        """Filter the elements within the viewport and/or containing the text in the renderer"""
+        with deadline.within(wait):
+            elems = select(ctx.driver, locator, by, wait, filters)
+    else:
+        try:
+            with deadline.within(wait):
+                elems = query(ctx.driver, locator, by, wait)
+        except TimeoutException as e:
+            logger.info(_wait_time_expired((locator, by), wait))
+
+    rtn = ElementCollection.of(ctx.driver, elems, (by, locator, filters))
+
+    _verify_found(rtn, locator, by, **kwargs)
 
-    rtn = []
+    return rtn
 
-    try:
-        elems = query(get_driver(), locator, by, wait)
-        rtn = list(map(wrap_element, elems))
-    except TimeoutException as e:
-        logger.info(_wait_time_expired((locator, by), wait))
 
-    visibility = kwargs.get('visible', None)
-    if visibility:
-        """Filter only the elements within the current viewport"""
-        rtn = list(filter(lambda x: Expected.visibility_of(x)(get_driver()), rtn))
+def first(locator: str, by=None, wait: int = None, **kwargs) -> WebElement:
+    return all(locator, by=by, wait=wait, minimum=1, **kwargs)[0]
 
-    expected_text = kwargs.get('text', None)
-    if expected_text:
-        """Filter the elements that contain the text"""
-        rtn = list(filter(lambda x: SpectronExpected.text_to_be_present_in_element(x, expected_text)(get_driver()), rtn))
 
+def element(locator: str, by=None, wait: int = None, **kwargs) -> WebElement:
+    ctx = session.current()
+
+    if by is None:
+        by = ctx.selector
+
+    if wait is None:
+        wait = ctx.wait_time
+
+    return all(locator, by, wait, count=1, ambiguous_check=True, **kwargs)[0]
+
+
+# Private
+
+
+def _verify_found(rtn: list, locator: str, by, **kwargs) -> None:
     if kwargs.get('ambiguous_check', None) and len(rtn) > 1:
         """Checks if only 1 elements was found"""
         msg = f"Ambiguous match, found {len(rtn)} elements matching by {by} '{locator}'."
@@ -91,28 +119,6 @@ def all(locator: str, by=None, wait: int = None, **kwargs) -> list[Optional[WebE
         logger.error(_minimum_expectation_not_met((locator, by), minimum_expected, len(rtn)))
         raise ExpectationNotMet(_minimum_expectation_not_met((locator, by), minimum_expected, len(rtn)))
 
-    return rtn
-
-
-def first(locator: str, by=None, wait: int = None, **kwargs) -> WebElement:
-    return all(locator, by=by, wait=wait, minimum=1, **kwargs)[0]
-
-
-def element(locator: str, by=None, wait: int = None, **kwargs) -> WebElement:
-    if by is None:
-        by = get_default_selector()
-
-    if wait is None:
-        wait = get_default_wait_time()
-
-    elem: WebElement = all(locator, by, wait, count=1, ambiguous_check=True, **kwargs)[0]
-    rtn = wrap_element(elem)
-
-    return rtn
-
-
-# Private
-
 
 def _wait_time_expired(locator: tuple, wait: int):
     return f"Wait time expired:: {locator}, wait time: {wait}"
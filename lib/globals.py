@@ -1,24 +1,50 @@
 # globals.py
+# Kept for backwards compatibility, the state lives in the Session bound to the current thread or asyncio task.
+import sys
+from types import ModuleType
 from typing import Optional
 
 from selenium.webdriver.chrome.webdriver import WebDriver
 
-default_wait_time = None
-driver = None
-default_selector = None
+from . import session
+
+_attributes = {
+    'driver': 'driver',
+    'default_wait_time': 'wait_time',
+    'default_selector': 'selector',
+}
+
+
+def __getattr__(name):
+    if name in _attributes:
+        return getattr(session.current(), _attributes[name])
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _Globals(ModuleType):
+    def __setattr__(self, name, value):
+        # `globals.driver = ...` sets the driver of the current session, which is what is read back
+        if name in _attributes:
+            setattr(session.current(), _attributes[name], value)
+        else:
+            super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Globals
 
 
 def initialize():
-    global default_wait_time, driver, default_selector
+    pass
 
 
 def get_default_wait_time():
-    return default_wait_time
+    return session.current().wait_time
 
 
 def get_driver() -> Optional[WebDriver]:
-    return driver
+    return session.current().driver
 
 
 def get_default_selector():
-    return default_selector
+    return session.current().selector
@@ -4,7 +4,7 @@ import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
 
-from . import globals as world
+from . import session
 
 
 def to_seconds(ms_time):
@@ -12,11 +12,11 @@ def to_seconds(ms_time):
 
 
 def generate_target(element_or_locator: str | WebElement, by=None) -> tuple | WebElement:
-    """Generates a selenium locator if the object passed in isn't a WebElement"""
-    if not isinstance(element_or_locator, WebElement):
+    """Generates a selenium locator from a locator string, elements of either driver are returned as they are"""
+    if isinstance(element_or_locator, str):
         locator = element_or_locator
         if by is None:
-            by = world.get_default_selector()
+            by = session.current().selector
 
         target: tuple[By, str] = (by, locator)
     else:
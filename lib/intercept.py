@@ -0,0 +1,356 @@
+# intercept.py
+import base64
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional, Union
+from urllib import parse
+
+from . import devtools
+from .cdp import COMMAND_TIMEOUT, CDPConnection
+from .exception import CDPError, InvalidArgument
+
+logger = logging.getLogger(__name__)
+
+ACTIONS = ('stub', 'block', 'replay')
+
+# Network.ErrorReason of blocked requests, what an ad blocker would cause
+BLOCK_REASON = 'BlockedByClient'
+
+Pattern = Union[str, re.Pattern]
+
+_TRANSFER_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def glob_to_regex(glob: str) -> re.Pattern:
+    """The wildcards of Fetch.RequestPattern: `*` any characters, `?` one character, `\\` escapes."""
+    out, escaped = [], False
+    for char in glob:
+        if escaped:
+            out.append(re.escape(char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '*':
+            out.append('.*')
+        elif char == '?':
+            out.append('.')
+        else:
+            out.append(re.escape(char))
+    return re.compile(''.join(out) + r'\Z', re.DOTALL)
+
+
+class FixtureStore:
+    """
+    Recorded responses, one JSON file per request in `root`. Requests are keyed by method, URL and body, the file
+    name starts with the method and path so the fixtures can be found and edited by hand.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, method: str, url: str, body: Optional[str] = None) -> str:
+        digest = hashlib.sha256('\n'.join([method, url, body or '']).encode('utf8')).hexdigest()[:16]
+        slug = re.sub(r'[^\w.-]+', '_', parse.urlsplit(url).path).strip('_')[:60] or 'root'
+        return os.path.join(self.root, f'{method}_{slug}_{digest}.json')
+
+    def get(self, method: str, url: str, body: Optional[str] = None) -> Optional[dict]:
+        try:
+            with open(self.path(method, url, body)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put(self, method: str, url: str, body: Optional[str], response: dict) -> str:
+        """Saves `response`, {'status', 'headers', 'body'} with the body base64 encoded. Returns the file path."""
+        path = self.path(method, url, body)
+        os.makedirs(self.root, exist_ok=True)
+
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'method': method, 'url': url} | response, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+
+@dataclass(eq=False)
+class Rule:
+    """
+    What to do with requests whose URL matches `pattern`, a glob string or a compiled regex, and `method` if given.
+    Glob rules are passed to Chromium, so requests no rule matches are never paused.
+    """
+    pattern: Pattern
+    action: str
+    method: Optional[str] = None
+    response: dict = field(default_factory=dict)
+    fixtures: Optional[FixtureStore] = None
+    record: bool = False
+    fallback: str = 'block'
+    hits: int = 0
+
+    def __post_init__(self):
+        if self.action not in ACTIONS:
+            raise InvalidArgument(f"Interception action is invalid -- {self.action}")
+        if self.fallback not in ('block', 'continue'):
+            raise InvalidArgument(f"Replay fallback is invalid -- {self.fallback}")
+
+        self.method = self.method.upper() if self.method else None
+        self._regex = self.pattern if isinstance(self.pattern, re.Pattern) else glob_to_regex(self.pattern)
+
+    @property
+    def url_pattern(self) -> str:
+        """Fetch.RequestPattern urlPattern, regex rules need every request."""
+        return '*' if isinstance(self.pattern, re.Pattern) else self.pattern
+
+    def matches(self, url: str, method: str) -> bool:
+        if self.method and self.method != method:
+            return False
+        if isinstance(self.pattern, re.Pattern):
+            return bool(self._regex.search(url))
+        return bool(self._regex.match(url))
+
+
+class Interceptor:
+    """
+    Stubs, blocks or replays the main window's requests with the DevTools Fetch domain, on a DevTools connection of
+    its own, so it works with either backend. Rules are checked in the order they were added, the first match wins.
+
+        app.intercept.stub('*/api/user', json={'name': 'Ada'})
+        app.intercept.block('*://telemetry.example.com/*')
+        app.intercept.replay(re.compile(r'/api/v\\d/'), 'fixtures/api', record=True)
+
+    Rules can be added before `Application.start()` and are kept across restarts.
+    """
+
+    def __init__(self, timeout: float = COMMAND_TIMEOUT):
+        self.timeout = timeout
+        self.rules: list[Rule] = []
+        self.counts: Counter = Counter()
+        self.connection: Optional[CDPConnection] = None
+        self._address: Optional[tuple[str, int]] = None
+        self._lock = threading.Lock()
+
+    def stub(self, pattern: Pattern, body: Union[str, bytes] = b'', json=None, status: int = 200,
+             headers: Optional[dict] = None, method: str = None) -> Rule:
+        """Answers with a fixed response. `json` is serialized as the body, with a JSON content type."""
+        headers = dict(headers or {})
+        if json is not None:
+            body = _dumps(json)
+            headers.setdefault('Content-Type', 'application/json')
+        elif isinstance(body, str):
+            headers.setdefault('Content-Type', 'text/plain; charset=utf-8')
+
+        if isinstance(body, str):
+            body = body.encode('utf8')
+
+        response = {'status': status, 'headers': headers, 'body': base64.b64encode(body).decode()}
+        return self._add(Rule(pattern, 'stub', method, response=response))
+
+    def block(self, pattern: Pattern, method: str = None) -> Rule:
+        """Fails matching requests as if blocked by an extension."""
+        return self._add(Rule(pattern, 'block', method))
+
+    def replay(self, pattern: Pattern, fixtures: Union[str, FixtureStore], record: bool = False,
+               fallback: str = 'block', method: str = None) -> Rule:
+        """
+        Answers from the recorded responses in `fixtures`. Requests without a recording are sent to the network and
+        recorded when `record`, otherwise blocked, or sent to the network with `fallback='continue'`.
+        """
+        if not isinstance(fixtures, FixtureStore):
+            fixtures = FixtureStore(fixtures)
+        return self._add(Rule(pattern, 'replay', method, fixtures=fixtures, record=record, fallback=fallback))
+
+    def remove(self, rule: Rule) -> None:
+        with self._lock:
+            self.rules.remove(rule)
+        self._update()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.rules.clear()
+        self._update()
+
+    @property
+    def stats(self) -> dict:
+        """Requests handled per outcome: stubbed, blocked, replayed, recorded, continued."""
+        return dict(self.counts)
+
+    def start(self, port: int, host: str = 'localhost') -> None:
+        """Called by Application once DevTools is up. Attaches right away when there are rules."""
+        self._address = (host, port)
+        self._update()
+
+    def stop(self) -> None:
+        self._address = None
+        self._detach()
+
+    # private
+
+    def _add(self, rule: Rule) -> Rule:
+        with self._lock:
+            self.rules.append(rule)
+        self._update()
+        return rule
+
+    def _update(self) -> None:
+        """Attach, detach or change the paused patterns to match the rules."""
+        if self._address is None:
+            return
+
+        if not self.rules:
+            return self._detach()
+
+        if self.connection is None or self.connection.closed:
+            self._attach()
+
+        with self._lock:
+            patterns = [{'urlPattern': x, 'requestStage': 'Request'} for x in dict.fromkeys(r.url_pattern
+                                                                                           for r in self.rules)]
+            patterns += [{'urlPattern': x, 'requestStage': 'Response'}
+                         for x in dict.fromkeys(r.url_pattern for r in self.rules if r.record)]
+
+        self.connection.send('Fetch.enable', {'patterns': patterns}, self.timeout)
+
+    def _attach(self) -> None:
+        host, port = self._address
+        pages = [x for x in devtools.targets(port, host) if x.get('type') == 'page']
+        if not pages:
+            raise CDPError(f"No page target on {host}:{port} to intercept.")
+
+        self.connection = CDPConnection(pages[0]['webSocketDebuggerUrl'], self.timeout)
+        self.connection.add_listener('Fetch.requestPaused', self._paused)
+        logger.debug(f"Intercepting requests of {pages[0].get('url')}.")
+
+    def _detach(self) -> None:
+        if self.connection is None:
+            return
+        try:
+            if not self.connection.closed:
+                self.connection.send('Fetch.disable', timeout=self.timeout)
+        except CDPError as e:
+            logger.debug(f"Fetch.disable: {e}")
+        finally:
+            self.connection.close()
+            self.connection = None
+
+    def _paused(self, event: dict) -> None:
+        """Fetch.requestPaused, every paused request has to be fulfilled, failed or continued."""
+        request = event['request']
+        request_id = event['requestId']
+
+        with self._lock:
+            rule = next((x for x in self.rules if x.matches(request['url'], request['method'])), None)
+
+        try:
+            if rule is None:
+                outcome = self._continue(request_id)
+            elif 'responseStatusCode' in event or 'responseErrorReason' in event:
+                outcome = self._record(rule, event)
+            else:
+                rule.hits += 1
+                outcome = self._handle(rule, request_id, request)
+        except CDPError as e:
+            # Mostly requests the page cancelled meanwhile
+            logger.debug(f"Intercepting {request['url']}: {e}")
+            return
+
+        self.counts[outcome] += 1
+
+    def _handle(self, rule: Rule, request_id: str, request: dict) -> str:
+        if rule.action == 'block':
+            self._send('Fetch.failRequest', {'requestId': request_id, 'errorReason': BLOCK_REASON})
+            return 'blocked'
+
+        if _is_preflight(request):
+            self._fulfill(request_id, request, {'status': 204, 'headers': {}, 'body': ''})
+            return 'stubbed' if rule.action == 'stub' else 'replayed'
+
+        if rule.action == 'stub':
+            self._fulfill(request_id, request, rule.response)
+            return 'stubbed'
+
+        if recorded := rule.fixtures.get(request['method'], request['url'], request.get('postData')):
+            self._fulfill(request_id, request, recorded)
+            return 'replayed'
+
+        if rule.record or rule.fallback == 'continue':
+            return self._continue(request_id)
+
+        logger.warning(f"No recorded response for {request['method']} {request['url']}, blocked.")
+        self._send('Fetch.failRequest', {'requestId': request_id, 'errorReason': BLOCK_REASON})
+        return 'blocked'
+
+    def _record(self, rule: Rule, event: dict) -> str:
+        """Response stage of a recording replay rule."""
+        request = event['request']
+        if not rule.record or 'responseErrorReason' in event:
+            return self._continue(event['requestId'])
+
+        try:
+            result = self._send('Fetch.getResponseBody', {'requestId': event['requestId']})
+            body = result['body'] if result.get('base64Encoded') else base64.b64encode(
+                result['body'].encode('utf8')).decode()
+        except CDPError:
+            # Redirects have no body
+            body = ''
+
+        # The body is stored decoded, whatever the transfer used
+        headers = {x['name']: x['value'] for x in event.get('responseHeaders', [])
+                   if x['name'].lower() not in _TRANSFER_HEADERS}
+        path = rule.fixtures.put(request['method'], request['url'], request.get('postData'),
+                                 {'status': event['responseStatusCode'], 'headers': headers, 'body': body})
+        logger.debug(f"Recorded {request['method']} {request['url']} to {path}")
+
+        self._continue(event['requestId'])
+        return 'recorded'
+
+    def _fulfill(self, request_id: str, request: dict, response: dict) -> None:
+        headers = _cors_headers(request) | response.get('headers', {})
+        self._send('Fetch.fulfillRequest', {
+            'requestId': request_id,
+            'responseCode': response.get('status', 200),
+            'responseHeaders': [{'name': k, 'value': str(v)} for k, v in headers.items()],
+            'body': response.get('body', ''),
+        })
+
+    def _continue(self, request_id: str) -> str:
+        self._send('Fetch.continueRequest', {'requestId': request_id})
+        return 'continued'
+
+    def _send(self, method: str, params: dict) -> dict:
+        connection = self.connection
+        if connection is None:
+            raise CDPError(f"Interception detached, can't send {method}.")
+        return connection.send(method, params, self.timeout)
+
+
+def _dumps(value) -> str:
+    return json.dumps(value)
+
+
+def _header(request: dict, name: str) -> Optional[str]:
+    name = name.lower()
+    return next((v for k, v in request.get('headers', {}).items() if k.lower() == name), None)
+
+
+def _is_preflight(request: dict) -> bool:
+    return request['method'] == 'OPTIONS' and _header(request, 'Access-Control-Request-Method') is not None
+
+
+def _cors_headers(request: dict) -> dict:
+    """A local answer to a cross-origin request needs the CORS headers the real service would send."""
+    origin = _header(request, 'Origin')
+    if not origin:
+        return {}
+
+    rtn = {'Access-Control-Allow-Origin': origin, 'Access-Control-Allow-Credentials': 'true', 'Vary': 'Origin'}
+    if _is_preflight(request):
+        rtn['Access-Control-Allow-Methods'] = _header(request, 'Access-Control-Request-Method')
+        if requested := _header(request, 'Access-Control-Request-Headers'):
+            rtn['Access-Control-Allow-Headers'] = requested
+    return rtn
@@ -1,6 +1,15 @@
 import logging
 
-# Basic logger configuration found in __init__.py
+# The package never configures logging itself, entry points call `basic_config()`.
+
+
+def basic_config():
+    """Default log format, a no-op when the root logger has handlers already."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='[%(asctime)s] %(levelname)s [%(name)s:%(lineno)s] %(message)s',
+        datefmt="%Y-%m-%dT%H:%M:%S"
+    )
 
 
 def set_selenium_log_level(level):
@@ -0,0 +1,180 @@
+# logs.py
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import IO, Iterator, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+FILE_POLL_INTERVAL = 0.1
+
+
+class LogTail:
+    """
+    Tails process output (a pipe) or a log file on a background thread into a ring buffer of the last `max_bytes`.
+
+        app.logs.wait_for(r'App ready', timeout=10)
+        for line in app.logs.lines(timeout=1):
+            ...
+        print(app.logs.tail(4096))
+
+    Every line gets a sequence number. `mark()` returns the next one, to wait for or iterate over lines arriving
+    after that point only. By default both start at the lines of the current source.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024):
+        self.max_bytes = max_bytes
+        self._lines: deque[tuple[int, str]] = deque()
+        self._size = 0
+        self._seq = 0
+        self._start = 0
+        self._closed = True
+        self._changed = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def attach(self, stream: IO[str], tee_path: str = None) -> None:
+        """Read lines from the stream until EOF, optionally copying them to tee_path."""
+        self._begin()
+        self._thread = threading.Thread(target=self._read_stream, args=(stream, tee_path), name='spectronpy-logs',
+                                        daemon=True)
+        self._thread.start()
+
+    def follow(self, path: str) -> None:
+        """Read lines appended to the file until `close()`, for applications writing their own log files."""
+        self._begin()
+        self._thread = threading.Thread(target=self._read_file, args=(path,), name='spectronpy-logs', daemon=True)
+        self._thread.start()
+
+    def close(self, timeout: float = None) -> None:
+        """Stop following a file, or wait up to timeout for the stream to reach EOF."""
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def mark(self) -> int:
+        """Sequence number of the next line."""
+        with self._changed:
+            return self._seq
+
+    def wait_for(self, pattern: str | Pattern[str], timeout: float = None, since: int = None) -> Optional[re.Match]:
+        """
+        Waits until a line matching the regex arrives and returns the match, None on timeout or EOF.
+        Lines already received from the current source count, unless `since` is given (see `mark()`).
+        """
+        regex = re.compile(pattern)
+
+        for line in self.lines(since, timeout):
+            if match := regex.search(line):
+                return match
+
+        logger.info(f"Log line not found in time:: '{regex.pattern}', wait: {timeout}")
+        return None
+
+    def lines(self, since: int = None, timeout: float = None) -> Iterator[str]:
+        """
+        Yields buffered lines from `since`, then new lines as they arrive. Stops at EOF, or when timeout expires.
+        Lines evicted from the buffer before they were read are skipped.
+        """
+        cursor = self._start if since is None else since
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._changed:
+                while cursor >= self._seq:
+                    if self._closed:
+                        return
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return
+                    self._changed.wait(remaining)
+
+                pending = [line for seq, line in self._lines if seq >= cursor]
+                cursor = self._seq
+
+            yield from pending
+
+    def __iter__(self) -> Iterator[str]:
+        return self.lines()
+
+    def tail(self, max_bytes: int = None) -> str:
+        """The buffered output, or only its last max_bytes characters."""
+        with self._changed:
+            text = ''.join(line for _, line in self._lines)
+
+        return text[-max_bytes:] if max_bytes else text
+
+    def dump(self, path: str, max_bytes: int = None) -> None:
+        with open(path, 'w') as f:
+            f.write(self.tail(max_bytes))
+
+    # private
+
+    def _begin(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            self.close(1)
+
+        with self._changed:
+            self._closed = False
+            self._start = self._seq
+
+    def _append(self, line: str) -> None:
+        with self._changed:
+            self._lines.append((self._seq, line))
+            self._seq += 1
+            self._size += len(line)
+
+            while self._size > self.max_bytes and len(self._lines) > 1:
+                _, evicted = self._lines.popleft()
+                self._size -= len(evicted)
+
+            self._changed.notify_all()
+
+    def _read_stream(self, stream: IO[str], tee_path: str = None) -> None:
+        tee = open(tee_path, 'w', buffering=1) if tee_path else None
+
+        try:
+            for line in stream:
+                self._append(line)
+                if tee:
+                    tee.write(line)
+        except (OSError, ValueError) as e:
+            # The stream was closed from another thread
+            logger.debug(f"Stopped reading application output: {e}")
+        finally:
+            if tee:
+                tee.close()
+            with self._changed:
+                self._closed = True
+                self._changed.notify_all()
+
+    def _read_file(self, path: str) -> None:
+        partial = ''
+
+        try:
+            with open(path, errors='replace') as f:
+                while not self._closed:
+                    chunk = f.readline()
+                    if not chunk:
+                        time.sleep(FILE_POLL_INTERVAL)
+                        continue
+
+                    partial += chunk
+                    if partial.endswith('\n'):
+                        self._append(partial)
+                        partial = ''
+        except OSError as e:
+            logger.warning(f"Could not follow log file {path}: {e}")
+        finally:
+            with self._changed:
+                self._closed = True
+                self._changed.notify_all()
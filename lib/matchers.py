@@ -5,12 +5,12 @@ from selenium.common import TimeoutException
 from selenium.webdriver.chrome.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as Expected
-from selenium.webdriver.support.wait import WebDriverWait
 
-from . import globals as world
+from . import deadline
+from . import session
 import logging
 from . import expected as SpectronExpected
+from .evaluate import until
 from .helper import generate_target
 
 logger = logging.getLogger(__name__)
@@ -25,27 +25,27 @@ class Title:
 
     @classmethod
     def equals(cls, title: str, wait=None) -> bool:
-        print(world.get_driver().title)
-        return _wait_until(Expected.title_is(title), wait, _repr(cls, title))
+        print(session.current().driver.title)
+        return _wait_until(SpectronExpected.title_is(title), wait, _repr(cls, title))
 
 
 class URL:
     @classmethod
     def has(cls, url: str, wait=None) -> bool:
-        return _wait_until(Expected.url_contains(url), wait, _repr(cls, url))
+        return _wait_until(SpectronExpected.url_contains(url), wait, _repr(cls, url))
 
     @classmethod
     def equals(cls, url: str, wait=None) -> bool:
-        return _wait_until(Expected.url_to_be(url), wait, _repr(cls, url))
+        return _wait_until(SpectronExpected.url_to_be(url), wait, _repr(cls, url))
 
     @classmethod
     def matches(cls, url: str, wait=None) -> bool:
         pattern: Pattern[str] = re.compile(url)
-        return _wait_until(Expected.url_matches(pattern), wait, _repr(cls, url))
+        return _wait_until(SpectronExpected.url_matches(pattern), wait, _repr(cls, url))
 
     @classmethod
     def changes(cls, url: str, wait=None) -> bool:
-        return _wait_until(Expected.url_changes(url), wait, _repr(cls, url))
+        return _wait_until(SpectronExpected.url_changes(url), wait, _repr(cls, url))
 
 
 class Element:
@@ -53,32 +53,53 @@ class Element:
     @classmethod
     def to_be_clickable(cls, element_or_locator: Element_Locator, by=None, wait=None) -> WebElement | bool:
         return _wait_until(
-            Expected.element_to_be_clickable(generate_target(element_or_locator, by)),
+            SpectronExpected.element_to_be_clickable(generate_target(element_or_locator, by)),
             wait,
             _repr(cls, element_or_locator)
         )
 
     @classmethod
-    def to_have_text(cls, element_or_locator: Element_Locator, text: str, wait=None) -> WebElement | bool:
+    def to_have_text(cls, element_or_locator: Element_Locator, text: str, wait=None, by=None) -> WebElement | bool:
         return _wait_until(
-            SpectronExpected.text_to_be_present_in_element(generate_target(element_or_locator), text),
+            SpectronExpected.text_to_be_present_in_element(generate_target(element_or_locator, by), text),
             wait,
             _repr(cls, text)
         )
 
 
+def any_of(*conditions, wait=None) -> tuple[int, object] | bool:
+    """
+    Waits until any of the conditions (see `spectronpy.expected`) is met, within one shared wait time.
+    Returns (index, value) of the condition that was met first, False when none was met in time.
+
+        match.any_of(expected.title_contains('Dashboard'), expected.presence_of_all_elements_located(error_toast))
+    """
+    rtn = _wait_until(SpectronExpected.any_of(*conditions), wait, _combined_repr('any_of', conditions))
+
+    return tuple(rtn) if rtn else False
+
+
+def all_of(*conditions, wait=None) -> list | bool:
+    """
+    Waits until all the conditions are met at the same time, within one shared wait time.
+    Returns the value of each condition, False when they weren't met in time.
+    """
+    return _wait_until(SpectronExpected.all_of(*conditions), wait, _combined_repr('all_of', conditions))
+
+
 # Private
 def _wait_until(condition, wait: int = None, debug_str=None) -> WebElement | bool:
+    ctx = session.current()
+
     if wait is None:
-        wait = world.get_default_wait_time()
+        wait = ctx.wait_time
 
-    driver = world.get_driver()
+    driver = ctx.driver
 
     rtn = False
     try:
-        rtn = WebDriverWait(driver, wait).until(
-            condition
-        )
+        with deadline.within(wait):
+            rtn = until(driver, condition, wait, ctx.wait_strategy)
     except TimeoutException:
         logger.info(_timeout_str(condition, wait, debug_str))
 
@@ -92,6 +113,10 @@ def _repr(cls, pattern=None):
         return f"{cls.__module__}.{cls.__qualname__}"
 
 
+def _combined_repr(name, conditions):
+    return f"{__name__}.{name} of " + ", ".join(str(getattr(x, 'script', x)) for x in conditions)
+
+
 def _timeout_str(condition, wait, debug=None):
     if debug:
         return f"Could not find target in time:: {debug}, wait: {wait}"
@@ -0,0 +1,151 @@
+# metrics.py
+import json
+import math
+import sys
+import threading
+from typing import Optional
+
+# Bucket bounds grow by 5%, percentiles are accurate to within that
+GROWTH = 1.05
+_LOG_GROWTH = math.log(GROWTH)
+
+# Modules whose functions are reported as the caller of a command
+CALLER_MODULES = ('finders', 'matchers', 'assertions')
+
+_MAX_DEPTH = 40
+
+# Package prefix of the caller modules, whatever name the package is installed under
+_PACKAGE = __name__.rpartition('.')[0] + '.'
+
+
+class Histogram:
+    """Log-bucketed duration histogram, constant memory however many samples are recorded."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._buckets: dict[int, int] = {}
+
+    def add(self, value: float) -> None:
+        bucket = math.ceil(math.log(value) / _LOG_GROWTH) if value > 0 else 0
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Upper bound of the bucket holding the p-th percentile, capped at the largest sample."""
+        if not self.count:
+            return None
+
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(GROWTH ** bucket, self.max)
+
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+        }
+
+
+class CommandMetrics:
+    """
+    Latency of every WebDriver command of a session, by command and by calling finder/matcher/assertion.
+    Durations are in seconds, payload sizes in bytes of the JSON sent.
+    Drivers only create one with the `metrics` option, so the size and caller lookups cost nothing otherwise.
+    """
+
+    def __init__(self):
+        self.commands: dict[str, Histogram] = {}
+        self.callers: dict[str, Histogram] = {}
+        self.payload_bytes: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, command: str, duration: float, params: Optional[dict] = None, caller: str = None,
+               size: int = None) -> None:
+        """`size` of the body as sent, when the transport serialized it already. Otherwise taken from params."""
+        if size is None:
+            size = payload_size(params)
+        if caller is None:
+            caller = find_caller()
+
+        with self._lock:
+            if command not in self.commands:
+                self.commands[command] = Histogram()
+                self.payload_bytes[command] = 0
+            self.commands[command].add(duration)
+            self.payload_bytes[command] += size
+
+            if caller not in self.callers:
+                self.callers[caller] = Histogram()
+            self.callers[caller].add(duration)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.commands.clear()
+            self.callers.clear()
+            self.payload_bytes.clear()
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'commands': {
+                    k: v.summary() | {'payload_bytes': self.payload_bytes[k]} for k, v in self.commands.items()
+                },
+                'callers': {k: v.summary() for k, v in self.callers.items()},
+            }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.summary(), **kwargs)
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as f:
+            f.write(self.to_json(indent=2))
+
+
+def payload_size(params: Optional[dict]) -> int:
+    if not params:
+        return 0
+
+    try:
+        return len(json.dumps(params, default=_element_id))
+    except (TypeError, ValueError):
+        return 0
+
+
+def find_caller() -> str:
+    """The outermost SpectronPy finder, matcher or assertion on the stack as "module.function", "-" for other code."""
+    frame = sys._getframe(2)
+    depth = 0
+    caller = '-'
+
+    while frame is not None and depth < _MAX_DEPTH:
+        module = frame.f_globals.get('__name__', '')
+        if module.startswith(_PACKAGE) and module.rpartition('.')[2] in CALLER_MODULES:
+            # co_qualname (3.11+) includes the class, e.g. "matchers.Title.has"
+            function = getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)
+            caller = f"{module[len(_PACKAGE):]}.{function}"
+        frame = frame.f_back
+        depth += 1
+
+    return caller
+
+
+def _element_id(value):
+    # WebElement and AsyncElement are sent as {"element-6066-11e4-a52e-4f735466cecf": id}
+    return {'element-6066-11e4-a52e-4f735466cecf': getattr(value, 'id', '')}
@@ -0,0 +1,179 @@
+# pool.py
+
+import logging
+import queue
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from .application import Application
+from .exception import InvalidArgument
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESET = ('close_windows', 'clear_storage', 'reload')
+
+
+class ApplicationPool:
+
+    def __init__(self, app_path: str, chromedriver_version: str, config=None, size: int = 1,
+                 reset: tuple = DEFAULT_RESET, health_check: Optional[Callable[[Application], bool]] = None):
+        """
+        Creates a pool of Applications which are started once and leased out, e.g. one per behave scenario.
+
+        :Args:
+         - app_path : Path to the Electron application.
+         - chromedriver_version : Specify the exact chromedriver version.
+         - config : Configuration shared by all Applications. A numeric `app_port` is incremented per Application,
+           "auto" allocates a free port per Application.
+         - size : Number of Applications kept running.
+         - reset : Steps run when an Application is released. Names from `RESET_STEPS` or callables taking the Application.
+         - health_check : Callable taking the Application, returns False when it needs to be recycled.
+        """
+        if size < 1:
+            raise InvalidArgument("Pool size must be at least 1.")
+
+        for step in reset:
+            if not callable(step) and step not in RESET_STEPS:
+                raise InvalidArgument(f"Unknown reset step -- {step}")
+
+        self.app_path = app_path
+        self.chromedriver_version = chromedriver_version
+        self.config = config or {}
+        self.size = size
+        self.reset = reset
+        self.health_check = health_check or is_healthy
+        self.apps: list[Application] = []
+        self._idle: queue.Queue[Application] = queue.Queue()
+
+    def start(self) -> None:
+        """Start all Applications of the pool."""
+        for index in range(len(self.apps), self.size):
+            app = Application(self.app_path, self.chromedriver_version, self._app_config(index))
+            app.start()
+            self.apps.append(app)
+            self._idle.put(app)
+
+        logger.info(f"Application pool started with {self.size} applications.")
+
+    def stop(self) -> None:
+        """Stop all Applications of the pool."""
+        for app in self.apps:
+            try:
+                app.stop()
+            except Exception as e:
+                logger.warning(f"Could not stop application, terminating it. {e}")
+                app.terminate()
+                app._cleanup()
+
+        self.apps = []
+        self._idle = queue.Queue()
+
+    def lease(self, timeout: Optional[float] = None) -> Application:
+        """
+        Take an idle Application out of the pool and make it the target of finders, matchers and assertions.
+        An unhealthy Application is recycled first, if that fails it goes back to the pool and the error is raised.
+        """
+        app = self._idle.get(timeout=timeout)
+
+        if not self._healthy(app):
+            try:
+                self._recycle(app)
+            except Exception:
+                # Back to the pool, the next lease tries again
+                self._idle.put(app)
+                raise
+
+        app.activate()
+        return app
+
+    def release(self, app: Application) -> None:
+        """
+        Reset the Application and return it to the pool. The process is only recycled if the reset fails.
+        The Application returns to the pool even if recycling it fails, the error is raised after that.
+        """
+        try:
+            try:
+                for step in self.reset:
+                    if callable(step):
+                        step(app)
+                    else:
+                        RESET_STEPS[step](app)
+            except Exception as e:
+                logger.warning(f"Reset failed, recycling application. {e}")
+                self._recycle(app)
+            else:
+                if not self._healthy(app):
+                    self._recycle(app)
+        finally:
+            self._idle.put(app)
+
+    @contextmanager
+    def leased(self, timeout: Optional[float] = None) -> Iterator[Application]:
+        app = self.lease(timeout)
+        try:
+            yield app
+        finally:
+            self.release(app)
+
+    # private
+
+    def _app_config(self, index: int) -> dict:
+        config = self.config.copy()
+        for key in ('electron_args', 'chrome_driver_args', 'webdriver_options'):
+            if key in config:
+                config[key] = config[key].copy()
+
+        if isinstance(config.get('app_port', None), int):
+            config['app_port'] += index
+
+        return config
+
+    def _healthy(self, app: Application) -> bool:
+        try:
+            return bool(self.health_check(app))
+        except Exception as e:
+            logger.warning(f"Health check failed. {e}")
+            return False
+
+    def _recycle(self, app: Application) -> None:
+        logger.info("Recycling application.")
+        try:
+            app.stop()
+        except Exception as e:
+            logger.warning(f"Could not stop application, terminating it. {e}")
+            app.terminate()
+            app._cleanup()
+
+        app.start()
+
+
+def is_healthy(app: Application) -> bool:
+    """Default health check: the Electron process is alive and the main window finished loading."""
+    if not app.is_running() or app._app.poll() is not None:
+        return False
+
+    return app.client.execute_script("return document.readyState;") == 'complete'
+
+
+def close_windows(app: Application) -> None:
+    handles = app.client.window_handles
+    for handle in handles[1:]:
+        app.client.switch_to.window(handle)
+        app.client.close()
+
+    app.switch_to_main_window()
+
+
+def clear_storage(app: Application) -> None:
+    app.client.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+
+
+def reload(app: Application) -> None:
+    app.client.refresh()
+
+
+RESET_STEPS = {
+    'close_windows': close_windows,
+    'clear_storage': clear_storage,
+    'reload': reload,
+}
@@ -0,0 +1,123 @@
+# ports.py
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+
+import psutil
+
+from .exception import PortUnavailable
+
+logger = logging.getLogger(__name__)
+
+# One directory per reserved port. os.mkdir is atomic, so only one process can reserve a port.
+LOCK_DIR = os.path.join(tempfile.gettempdir(), 'spectronpy-ports')
+PID_FILE = 'pid'
+GRACE_SECONDS = 5
+
+
+def allocate(attempts: int = 50) -> int:
+    """Reserve a free port for this process. Release it with `release()` once the application stopped."""
+    os.makedirs(LOCK_DIR, exist_ok=True)
+
+    for _ in range(attempts):
+        port = _free_port()
+        if _reserve(port):
+            logger.info(f"Allocated port {port}.")
+            return port
+
+    raise PortUnavailable(f"Could not allocate a free port after {attempts} attempts.")
+
+
+def release(port: int) -> None:
+    path = _path(port)
+    try:
+        os.remove(os.path.join(path, PID_FILE))
+    except FileNotFoundError:
+        pass
+
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass
+
+
+def is_reserved(port: int) -> bool:
+    return os.path.isdir(_path(port))
+
+
+# private
+
+
+def _path(port: int) -> str:
+    return os.path.join(LOCK_DIR, str(port))
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def _reserve(port: int) -> bool:
+    path = _path(port)
+
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        owner = _owner(path)
+        if owner is None or psutil.pid_exists(owner):
+            return False
+
+        if not _reclaim(path, owner):
+            return False
+
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            return False
+
+    with open(os.path.join(path, PID_FILE), 'w') as f:
+        f.write(str(os.getpid()))
+
+    return True
+
+
+def _owner(path: str) -> int | None:
+    """PID of the process holding the reservation. None while it is being written (within the grace period)."""
+    try:
+        with open(os.path.join(path, PID_FILE)) as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        try:
+            if time.time() - os.path.getmtime(path) > GRACE_SECONDS:
+                return -1
+        except OSError:
+            pass
+        return None
+
+
+def _reclaim(path: str, owner: int) -> bool:
+    """Remove a reservation left behind by a dead process. Renaming first makes the removal atomic."""
+    tombstone = f"{path}.{uuid.uuid4().hex}"
+    try:
+        os.rename(path, tombstone)
+    except OSError:
+        return False
+
+    if _owner(tombstone) != owner:
+        # Another process reclaimed and reserved it in the meantime, give it back
+        try:
+            os.rename(tombstone, path)
+        except OSError:
+            pass
+        return False
+
+    logger.info(f"Reclaimed port reservation of dead process {owner}.")
+    for name in os.listdir(tombstone):
+        os.remove(os.path.join(tombstone, name))
+    os.rmdir(tombstone)
+
+    return True
@@ -4,10 +4,10 @@ from typing import Optional
 from selenium.common import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
-from selenium.webdriver.support import expected_conditions as Expected
-from selenium.webdriver.support.wait import WebDriverWait
 
 import logging
+from . import expected as SpectronExpected
+from .evaluate import until
 
 logger = logging.getLogger(__name__)
 
@@ -16,10 +16,12 @@ def query(driver, locator: str, by: By, wait: int, **kwargs) -> list[Optional[We
     results: list[WebElement] = []
 
     try:
-        elements: list[WebElement] = WebDriverWait(driver, wait).until(
-            Expected.presence_of_all_elements_located(
+        elements: list[WebElement] = until(
+            driver,
+            SpectronExpected.presence_of_all_elements_located(
                 (by, locator)
-            )
+            ),
+            wait
         )
 
         if kwargs.get('maximum', None) == 1:
@@ -2,11 +2,6 @@
 
 import dataclasses
 
-import selenium.webdriver.support.expected_conditions as Expected
-from selenium.webdriver.remote.webelement import WebElement
-
-from . import expected as SpectronExpected
-
 
 @dataclasses.dataclass
 class Result:
@@ -25,21 +20,6 @@ class ResultDict(dict):
         return any([v for k, v in self.items()])
 
 
-def _verify_match(element: WebElement, kwargs) -> ResultDict:
-    results_list = ResultDict()
-    driver = element.parent
-
-    if kwargs.get('visible', None):
-        result = {'visible': bool(Expected.visibility_of(element)(None))}
-        results_list.add(Result(result))
-
-    if option := kwargs.get('text', None):
-        result = {'text': SpectronExpected.text_to_be_present_in_element(element, option)(driver)}
-        results_list.add(Result(result))
-
-    return results_list
-
-
 def _generate_results(results: list | dict, result: dict, summarize=False) -> list | dict:
     if summarize:
         rtn = next(iter(result.values()))
@@ -0,0 +1,107 @@
+# screenshot.py
+import base64
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+from selenium.webdriver.remote.webelement import WebElement
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {'.png': 'png', '.jpg': 'jpeg', '.jpeg': 'jpeg', '.webp': 'webp'}
+
+
+def capture_params(path: str, quality: int = None, clip: dict | WebElement = None) -> dict:
+    """
+    Parameters of CDP `Page.captureScreenshot`. The format follows the file extension (png, jpeg, webp),
+    quality (0-100) only applies to jpeg and webp. `clip` is a {x, y, width, height[, scale]} dict or an element.
+    """
+    params = {'format': format_of(path)}
+
+    if quality is not None and params['format'] != 'png':
+        params['quality'] = quality
+
+    if isinstance(clip, WebElement):
+        clip = clip.rect
+    if clip:
+        params['clip'] = {'scale': 1} | {k: clip[k] for k in ('x', 'y', 'width', 'height', 'scale') if k in clip}
+
+    return params
+
+
+def capture(driver, path: str, quality: int = None, clip: dict | WebElement = None) -> str:
+    """Captures the current page through CDP, returns the base64 encoded image."""
+    return driver.execute_cdp_cmd('Page.captureScreenshot', capture_params(path, quality, clip))['data']
+
+
+def format_of(path: str) -> str:
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'png')
+
+
+class ScreenshotWriter:
+    """
+    Decodes and writes captured screenshots on a background thread, so the caller only waits for the capture.
+    At most `max_pending` screenshots are held in memory, `submit()` blocks while the queue is full.
+    """
+
+    def __init__(self, max_pending: int = 16):
+        self.written = 0
+        self.errors: list[tuple[str, Exception]] = []
+        self._queue: queue.Queue[tuple[str, str]] = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str, data: str) -> None:
+        """Queue the base64 encoded image to be written to path."""
+        self._start()
+        self._queue.put((path, data))
+
+    def flush(self, timeout: float = None) -> bool:
+        """Waits until all submitted screenshots are written. False if the timeout expired first."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    logger.warning(f"{self._queue.unfinished_tasks} screenshot(s) not written after {timeout} seconds.")
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+
+        return True
+
+    def pending(self) -> int:
+        return self._queue.unfinished_tasks
+
+    # private
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='spectronpy-screenshots', daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            path, data = self._queue.get()
+            try:
+                _write(path, base64.b64decode(data))
+                self.written += 1
+                logger.debug(f'Saved screenshot to "{path}"')
+            except Exception as e:
+                logger.error(f'Could not save screenshot to "{path}": {e}')
+                self.errors.append((path, e))
+            finally:
+                self._queue.task_done()
+
+
+def _write(path: str, data: bytes) -> None:
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    with open(path, 'wb') as f:
+        f.write(data)
@@ -0,0 +1,70 @@
+# service.py
+import atexit
+import logging
+import threading
+
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+logger = logging.getLogger(__name__)
+
+
+class SpectronService(ChromeService):
+    """chromedriver service which can outlive the sessions using it. start() is a no-op while it is running."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sessions sharing the service may start it at the same time
+        self._start_lock = threading.Lock()
+        # Returned by `shared()`, other sessions may be using it
+        self.shared = False
+
+    def start(self):
+        with self._start_lock:
+            if self.is_running():
+                return
+
+            super().start()
+        logger.info(f"chromedriver started on port {self.port}.")
+
+    def is_running(self) -> bool:
+        process = getattr(self, 'process', None)
+        return process is not None and process.poll() is None
+
+    def has_exited(self) -> bool:
+        """Started before and not running anymore."""
+        process = getattr(self, 'process', None)
+        return process is not None and process.poll() is not None
+
+
+_services: dict[tuple, SpectronService] = {}
+_services_lock = threading.Lock()
+
+
+def shared(executable_path: str, log_path: str = None, service_args: list = None) -> SpectronService:
+    """Returns the running service for the chromedriver binary and arguments, or creates one."""
+    args = service_args or []
+    key = (executable_path, log_path, tuple(args))
+
+    with _services_lock:
+        service = _services.get(key)
+        # A service created but not started yet is about to be started by another session
+        if service is None or service.has_exited():
+            service = SpectronService(executable_path, log_path=log_path, service_args=args)
+            service.shared = True
+            _services[key] = service
+
+    return service
+
+
+def stop_all() -> None:
+    """Stop all shared chromedriver services."""
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+
+    for service in services:
+        if service.is_running():
+            service.stop()
+
+
+atexit.register(stop_all)
@@ -0,0 +1,70 @@
+# session.py
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    # selenium.webdriver imports every browser's driver, Session stays cheap to import without it
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    from .snapshot import Snapshot
+
+
+@dataclass(eq=False)
+class Session:
+    """
+    State finders, matchers and assertions resolve from: the driver and its defaults.
+
+    Every Application owns one Session. It is bound per thread or asyncio task with `with app.session:`,
+    so one process can drive several applications concurrently. Outside a `with` block, the session of the
+    most recently started Application is used.
+    """
+    driver: Optional['WebDriver'] = None
+    wait_time: Optional[float] = None
+    selector: Optional[str] = None
+    wait_strategy: str = 'poll'
+    snapshot: Optional['Snapshot'] = field(default=None, repr=False)
+    # Elements found stale, found again by their locator, or gone for good, see SpectronElement
+    stale: dict[str, int] = field(default_factory=lambda: {'stale': 0, 'reresolved': 0, 'failed': 0})
+
+    def activate(self) -> Token:
+        """Bind the session to the current thread or asyncio task."""
+        return _current.set(self)
+
+    def deactivate(self, token: Token) -> None:
+        """Undo `activate()`, unless another session was bound since. Only the thread or task which activated can."""
+        if _current.get() is not self:
+            return
+
+        try:
+            _current.reset(token)
+        except ValueError:
+            # Token of another thread or task
+            pass
+
+    def __enter__(self):
+        _tokens.set(_tokens.get() + (self.activate(),))
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback):
+        tokens = _tokens.get()
+        _tokens.set(tokens[:-1])
+        _current.reset(tokens[-1])
+
+
+_current: ContextVar[Optional[Session]] = ContextVar('spectronpy_session', default=None)
+# Tokens of the open `with session:` blocks of the current thread or asyncio task, innermost last. Kept per context,
+# not per Session, since threads and tasks can be in blocks of the same session at once.
+_tokens: ContextVar[tuple[Token, ...]] = ContextVar('spectronpy_session_tokens', default=())
+_default = Session()
+
+
+def current() -> Session:
+    """The session bound to the current thread or asyncio task, or the process wide default."""
+    return _current.get() or _default
+
+
+def set_default(session: Session) -> None:
+    """Use the session wherever no other session is bound."""
+    global _default
+    _default = session
@@ -0,0 +1,631 @@
+# snapshot.py
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+
+from .result import ResultDict
+
+logger = logging.getLogger(__name__)
+
+# Commands which don't change the DOM or the current window. Any other command invalidates an active snapshot.
+READ_COMMANDS = frozenset({
+    'getTitle', 'getCurrentUrl', 'getPageSource',
+    'findElement', 'findElements', 'findChildElement', 'findChildElements',
+    'findElementFromShadowRoot', 'findElementsFromShadowRoot', 'getShadowRoot',
+    'getElementText', 'getElementTagName', 'getElementAttribute', 'getElementProperty', 'getElementRect',
+    'getElementValueOfCssProperty', 'getElementAriaRole', 'getElementAriaLabel',
+    'isElementSelected', 'isElementEnabled', 'w3cGetActiveElement',
+    'screenshot', 'elementScreenshot',
+    'w3cGetCurrentWindowHandle', 'w3cGetWindowHandles', 'getWindowRect',
+    'getTimeouts', 'setTimeouts', 'getCookie', 'getCookies', 'getLog', 'getAvailableLogTypes',
+})
+
+_SCRIPT_COMMANDS = frozenset({'w3cExecuteScript', 'w3cExecuteScriptAsync', 'executeAsyncScript'})
+
+# Runtime functions which act on the page rather than read it
+_RUNTIME_ACTIONS = frozenset({'clickAll'})
+_RUNTIME_CALL = re.compile(r'rt\.(\w+)\.apply')
+
+
+class UnsupportedSelector(Exception):
+    """The locator uses syntax the snapshot engine doesn't implement, it is evaluated in the renderer instead."""
+    pass
+
+
+def mutates(command: str, params: Optional[dict]) -> bool:
+    """
+    Whether the WebDriver command may change the DOM. Scripts count as changes, except calls into the SpectronPy
+    runtime (see evaluate.py) which only read. `executeCdpCommand` only counts for non-screenshot commands.
+    """
+    if command in READ_COMMANDS:
+        return False
+
+    if command in _SCRIPT_COMMANDS:
+        script = (params or {}).get('script', '')
+        if 'window.__spectronpy' not in script:
+            return True
+        call = _RUNTIME_CALL.search(script)
+        return call is not None and call.group(1) in _RUNTIME_ACTIONS
+
+    if command == 'executeCdpCommand':
+        return (params or {}).get('cmd') != 'Page.captureScreenshot'
+
+    return True
+
+
+class Node:
+    __slots__ = ('index', 'parent', 'tag', 'attrs', 'visible', 'texts', 'element', 'children', 'position', '_text')
+
+    def __init__(self, index: int, tag: str, attrs: dict, visible: bool, texts: list[str], element: WebElement):
+        self.index = index
+        self.tag = tag
+        self.attrs = attrs
+        self.visible = visible
+        # Own text nodes: the text before each child element and after the last one
+        self.texts = texts
+        self.element = element
+        self.parent: Optional[Node] = None
+        self.children: list[Node] = []
+        self.position = 0
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """
+        innerText derived from the text nodes: for a displayed element whitespace collapsed, hidden descendants
+        skipped and line breaks around block elements, otherwise all the text (textContent).
+        """
+        if self._text is None:
+            if self.visible:
+                self._text = _LINE_BREAKS.sub('\n', _SPACES.sub(' ', _rendered_text(self))).strip()
+            else:
+                self._text = _text_content(self)
+        return self._text
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.attrs.get('id')
+
+    @property
+    def classes(self) -> list[str]:
+        return self.attrs.get('class', '').split()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            yield from child.descendants()
+
+    def __repr__(self):
+        return f"<Node {self.tag}#{self.id} .{'.'.join(self.classes)} [{self.index}]>"
+
+
+class DOMSnapshot:
+    """
+    Indexed copy of the DOM taken in one script call: tag, attributes, visibility and own text of every element.
+    `select()` evaluates locators against it in Python, supporting a subset of CSS and XPath.
+    """
+
+    def __init__(self, data: dict):
+        self.title: str = data.get('title', '')
+        self.url: str = data.get('url', '')
+        self.nodes: list[Node] = []
+        self.roots: list[Node] = []
+        self.by_id: dict[str, list[Node]] = {}
+        self.by_class: dict[str, list[Node]] = {}
+        self.by_tag: dict[str, list[Node]] = {}
+        self.by_element: dict[str, Node] = {}
+
+        for index, ((parent, tag, attrs, visible, texts), element) in enumerate(zip(data['nodes'], data['elements'])):
+            node = Node(index, tag, attrs, visible, texts, element)
+            self.nodes.append(node)
+
+            if parent < 0:
+                self.roots.append(node)
+            else:
+                node.parent = self.nodes[parent]
+                node.position = len(node.parent.children)
+                node.parent.children.append(node)
+
+            if node.id:
+                self.by_id.setdefault(node.id, []).append(node)
+            for cls in node.classes:
+                self.by_class.setdefault(cls, []).append(node)
+            self.by_tag.setdefault(tag, []).append(node)
+            self.by_element[element.id] = node
+
+    def select(self, by: str, value: str) -> list[Node]:
+        """Nodes matching the locator in document order. Raises UnsupportedSelector."""
+        if by == By.CSS_SELECTOR:
+            return _select_css(self, value)
+        elif by == By.XPATH:
+            return _select_xpath(self, value)
+        elif by == By.ID:
+            return list(self.by_id.get(value, []))
+        elif by == By.CLASS_NAME:
+            return list(self.by_class.get(value, []))
+        elif by == By.TAG_NAME:
+            return list(self.by_tag.get(value.lower(), []))
+        elif by == By.NAME:
+            return [x for x in self.nodes if x.attrs.get('name') == value]
+        elif by == By.LINK_TEXT:
+            return [x for x in self.by_tag.get('a', []) if x.text.strip() == value]
+        elif by == By.PARTIAL_LINK_TEXT:
+            return [x for x in self.by_tag.get('a', []) if value in x.text]
+
+        raise UnsupportedSelector(f"Unsupported locator strategy: {by}")
+
+    def node_of(self, element: WebElement) -> Optional[Node]:
+        return self.by_element.get(element.id)
+
+
+# Elements innerText puts on lines of their own
+_BLOCK_TAGS = frozenset({
+    'address', 'article', 'aside', 'blockquote', 'dd', 'details', 'dialog', 'div', 'dl', 'dt', 'fieldset',
+    'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main',
+    'nav', 'ol', 'p', 'pre', 'section', 'summary', 'table', 'tr', 'ul',
+})
+_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+_SPACES = re.compile(r' {2,}')
+_LINE_BREAKS = re.compile(r' *\n[ \n]*')
+
+
+def _segment(node: Node, index: int) -> str:
+    return node.texts[index] if index < len(node.texts) else ''
+
+
+def _rendered_text(node: Node) -> str:
+    parts = [_WHITESPACE.sub(' ', _segment(node, 0))]
+    for i, child in enumerate(node.children):
+        if child.visible:
+            if child.tag == 'br':
+                parts.append('\n')
+            elif child.tag in _BLOCK_TAGS:
+                parts.append(f'\n{_rendered_text(child)}\n')
+            else:
+                parts.append(_rendered_text(child))
+        parts.append(_WHITESPACE.sub(' ', _segment(node, i + 1)))
+    return ''.join(parts)
+
+
+def _text_content(node: Node) -> str:
+    parts = [_segment(node, 0)]
+    for i, child in enumerate(node.children):
+        parts.append(_text_content(child))
+        parts.append(_segment(node, i + 1))
+    return ''.join(parts)
+
+
+def verify(node: Node, expectations: dict) -> ResultDict:
+    """Same checks as the runtime's verify()"""
+    result = ResultDict()
+    if expectations.get('visible'):
+        result['visible'] = node.visible
+    if expectations.get('text'):
+        result['text'] = expectations['text'] in node.text
+    return result
+
+
+class Snapshot:
+    """
+    Scope of `Application.snapshot()`. Within it, finders and assertions of the session evaluate locators against
+    a DOMSnapshot instead of calling into the renderer, and return without waiting.
+    Commands which may change the DOM (clicks, keys, navigation, scripts) invalidate it, the next finder or assertion
+    takes a new one.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.taken = 0
+        self._dom: Optional[DOMSnapshot] = None
+        self._previous: Optional[Snapshot] = None
+
+    @property
+    def dom(self) -> DOMSnapshot:
+        if self._dom is None:
+            self.refresh()
+        return self._dom
+
+    def refresh(self) -> DOMSnapshot:
+        from . import evaluate
+
+        return self.load(evaluate.call(self.session.driver, 'snapshot'))
+
+    def load(self, data: dict) -> DOMSnapshot:
+        """Takes the result of the runtime's snapshot(), for drivers which can't be called synchronously."""
+        self._dom = DOMSnapshot(data)
+        self.taken += 1
+        logger.debug(f"DOM snapshot taken with {len(self._dom.nodes)} elements.")
+        return self._dom
+
+    def invalidate(self) -> None:
+        self._dom = None
+
+    @property
+    def valid(self) -> bool:
+        return self._dom is not None
+
+    def select(self, locator: str, by: str, filters: dict = None) -> Optional[list[WebElement]]:
+        """Elements matching the locator and the filters (visible, text), None if the locator is unsupported."""
+        try:
+            nodes = self.dom.select(by, locator)
+        except UnsupportedSelector as e:
+            logger.debug(f"{e}, evaluating in the renderer.")
+            return None
+
+        filters = {k: v for k, v in (filters or {}).items() if v}
+        return [x.element for x in nodes if not filters or all(verify(x, filters).values())]
+
+    def verify_all(self, element_or_locator: WebElement | str, by: str, expectations: dict) -> Optional[list]:
+        """Expectations (visible, text) evaluated per element, None if the locator is unsupported."""
+        if not isinstance(element_or_locator, str):
+            node = self.dom.node_of(element_or_locator)
+            return None if node is None else [verify(node, expectations)]
+
+        try:
+            nodes = self.dom.select(by, element_or_locator)
+        except UnsupportedSelector as e:
+            logger.debug(f"{e}, evaluating in the renderer.")
+            return None
+
+        return [verify(x, expectations) for x in nodes]
+
+    def __enter__(self):
+        self._previous = self.session.snapshot
+        self.session.snapshot = self
+        self.refresh()
+        return self
+
+    def __exit__(self, exc_type, exc_val, traceback):
+        self.session.snapshot = self._previous
+        self._dom = None
+
+
+# CSS subset: type, #id, .class, [attr], [attr(=|~=|^=|$=|*=||=)value], :first-child, :last-child,
+# :only-child, :nth-child(), :not() and the combinators " ", ">", "+" and "~".
+# :disabled and :enabled depend on fieldsets and properties the snapshot doesn't have, they are left to the renderer.
+
+@dataclass
+class _Compound:
+    tag: Optional[str] = None
+    ids: list = field(default_factory=list)
+    classes: list = field(default_factory=list)
+    attrs: list = field(default_factory=list)
+    pseudos: list = field(default_factory=list)
+
+    def matches(self, node: Node) -> bool:
+        if self.tag and node.tag != self.tag:
+            return False
+        if any(node.id != x for x in self.ids):
+            return False
+        if self.classes:
+            classes = node.classes
+            if any(x not in classes for x in self.classes):
+                return False
+        if any(not _attr_matches(node, *x) for x in self.attrs):
+            return False
+        return all(_pseudo_matches(node, *x) for x in self.pseudos)
+
+
+_CSS_TOKEN = re.compile(r"""
+    \s*(?P<combinator>[>+~])\s*
+    | (?P<space>\s+)
+    | (?P<tag>\*|[a-zA-Z][\w-]*)
+    | \#(?P<id>[\w-]+)
+    | \.(?P<cls>[\w-]+)
+    | \[\s*(?P<attr>[\w:-]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<value>"[^"]*"|'[^']*'|[\w-]+)\s*)?]
+    | :(?P<pseudo>[\w-]+)(?:\((?P<arg>[^()]*)\))?
+""", re.VERBOSE)
+
+_PSEUDOS = ('first-child', 'last-child', 'only-child', 'nth-child', 'nth-last-child', 'not')
+
+_css_cache: dict[str, list] = {}
+
+
+def _select_css(dom: DOMSnapshot, selector: str) -> list[Node]:
+    groups = _css_cache.get(selector)
+    if groups is None:
+        groups = _css_cache[selector] = [_parse_complex(x) for x in _split_top_level(selector, ',')]
+
+    found = {}
+    for parts in groups:
+        for node in _css_candidates(dom, parts[-1][1]):
+            if node.index not in found and _complex_matches(node, parts, len(parts) - 1):
+                found[node.index] = node
+
+    return [found[x] for x in sorted(found)]
+
+
+def _css_candidates(dom: DOMSnapshot, compound: _Compound) -> list[Node]:
+    if compound.ids:
+        return dom.by_id.get(compound.ids[0], [])
+    if compound.classes:
+        return dom.by_class.get(compound.classes[0], [])
+    if compound.tag:
+        return dom.by_tag.get(compound.tag, [])
+    return dom.nodes
+
+
+def _complex_matches(node: Node, parts: list, i: int) -> bool:
+    combinator, compound = parts[i]
+    if not compound.matches(node):
+        return False
+    if i == 0:
+        return True
+
+    if combinator == ' ':
+        return any(_complex_matches(x, parts, i - 1) for x in node.ancestors())
+    if combinator == '>':
+        return node.parent is not None and _complex_matches(node.parent, parts, i - 1)
+
+    siblings = node.parent.children[:node.position] if node.parent else []
+    if combinator == '+':
+        return bool(siblings) and _complex_matches(siblings[-1], parts, i - 1)
+    return any(_complex_matches(x, parts, i - 1) for x in siblings)
+
+
+def _parse_complex(selector: str) -> list[tuple[Optional[str], _Compound]]:
+    """[(combinator, compound)], the combinator relates a compound to the one before it."""
+    parts = []
+    combinator = None
+    compound = None
+    pos = 0
+    selector = selector.strip()
+
+    if not selector:
+        raise UnsupportedSelector("Empty CSS selector")
+
+    while pos < len(selector):
+        token = _CSS_TOKEN.match(selector, pos)
+        if not token or token.end() == pos:
+            raise UnsupportedSelector(f"Unsupported CSS selector: {selector!r} at {pos}")
+        pos = token.end()
+
+        if token['combinator'] or token['space']:
+            if compound is None:
+                raise UnsupportedSelector(f"Unsupported CSS selector: {selector!r}")
+            parts.append((combinator, compound))
+            combinator = token['combinator'] or ' '
+            compound = None
+            continue
+
+        if compound is None:
+            compound = _Compound()
+
+        if token['tag']:
+            if compound.tag or compound.ids or compound.classes or compound.attrs or compound.pseudos:
+                raise UnsupportedSelector(f"Unsupported CSS selector: {selector!r}")
+            compound.tag = None if token['tag'] == '*' else token['tag'].lower()
+        elif token['id']:
+            compound.ids.append(token['id'])
+        elif token['cls']:
+            compound.classes.append(token['cls'])
+        elif token['attr']:
+            value = token['value']
+            if value and value[0] in '"\'':
+                value = value[1:-1]
+            compound.attrs.append((token['attr'].lower(), token['op'], value))
+        elif token['pseudo']:
+            name, arg = token['pseudo'], token['arg']
+            if name not in _PSEUDOS:
+                raise UnsupportedSelector(f"Unsupported CSS pseudo-class: :{name}")
+            if name == 'not':
+                arg = _parse_complex(arg)
+                if len(arg) != 1:
+                    raise UnsupportedSelector(f"Unsupported CSS selector: {selector!r}")
+                arg = arg[0][1]
+            elif name in ('nth-child', 'nth-last-child'):
+                arg = _parse_nth(arg)
+            compound.pseudos.append((name, arg))
+
+    if compound is None:
+        raise UnsupportedSelector(f"Unsupported CSS selector: {selector!r}")
+    parts.append((combinator, compound))
+
+    return parts
+
+
+def _parse_nth(arg: str) -> tuple[int, int]:
+    arg = arg.replace(' ', '').lower()
+    if arg == 'odd':
+        return 2, 1
+    if arg == 'even':
+        return 2, 0
+
+    match = re.fullmatch(r'(?:([+-]?\d*)n)?([+-]?\d+)?', arg)
+    if not match or not arg:
+        raise UnsupportedSelector(f"Unsupported :nth-child argument: {arg}")
+
+    a, b = match.groups()
+    if a is None:
+        return 0, int(b)
+    a = {'': 1, '+': 1, '-': -1}.get(a, None) or int(a)
+    return a, int(b or 0)
+
+
+def _attr_matches(node: Node, name: str, op: Optional[str], value: Optional[str]) -> bool:
+    actual = node.attrs.get(name)
+    if actual is None:
+        return False
+
+    if op is None:
+        return True
+    elif op == '=':
+        return actual == value
+    elif op == '~=':
+        return value in actual.split()
+    elif op == '|=':
+        return actual == value or actual.startswith(value + '-')
+    elif op == '^=':
+        return bool(value) and actual.startswith(value)
+    elif op == '$=':
+        return bool(value) and actual.endswith(value)
+    return bool(value) and value in actual
+
+
+def _pseudo_matches(node: Node, name: str, arg) -> bool:
+    siblings = len(node.parent.children) if node.parent else 1
+
+    if name == 'first-child':
+        return node.position == 0
+    elif name == 'last-child':
+        return node.position == siblings - 1
+    elif name == 'only-child':
+        return siblings == 1
+    elif name in ('nth-child', 'nth-last-child'):
+        a, b = arg
+        index = node.position + 1 if name == 'nth-child' else siblings - node.position
+        if a == 0:
+            return index == b
+        return (index - b) % a == 0 and (index - b) // a >= 0
+    return not arg.matches(node)
+
+
+def _split_top_level(text: str, separator: str) -> list[str]:
+    """Splits on separator outside of brackets, parentheses and quotes."""
+    parts, depth, quote, start = [], 0, None, 0
+
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '[(':
+            depth += 1
+        elif char in '])':
+            depth -= 1
+        elif depth == 0 and text.startswith(separator, i):
+            parts.append(text[start:i])
+            start = i + len(separator)
+
+    parts.append(text[start:])
+    return parts
+
+
+# XPath subset: location paths of child ("/") and descendant ("//") steps with a name test, "*", "." or "..",
+# and predicates: [n], [last()], [@a], [@a='v'], [contains(@a,'v')], [starts-with(@a,'v')], joined with "and".
+# Predicates on text(), "." or normalize-space() are left to the renderer, their string values differ from innerText.
+
+_XPATH_STEP = re.compile(r"(//|/)(\*|\.\.|\.|[a-zA-Z][\w-]*)((?:\[[^\[\]]*])*)")
+_XPATH_PREDICATE = re.compile(r"\[([^\[\]]*)]")
+_XPATH_LITERAL = r"""(?:"([^"]*)"|'([^']*)')"""
+_XPATH_TESTS = [
+    (re.compile(r"(\d+)"), lambda m: _position_test(int(m[1]))),
+    (re.compile(r"last\(\)"), lambda m: _position_test(-1)),
+    (re.compile(r"@([\w:-]+)"), lambda m: lambda node: m[1] in node.attrs),
+    (re.compile(rf"@([\w:-]+)\s*=\s*{_XPATH_LITERAL}"),
+     lambda m: lambda node: node.attrs.get(m[1]) == _literal(m, 2)),
+    (re.compile(rf"contains\(\s*@([\w:-]+)\s*,\s*{_XPATH_LITERAL}\s*\)"),
+     lambda m: lambda node: _literal(m, 2) in node.attrs.get(m[1], '\0')),
+    (re.compile(rf"starts-with\(\s*@([\w:-]+)\s*,\s*{_XPATH_LITERAL}\s*\)"),
+     lambda m: lambda node: node.attrs.get(m[1], '\0').startswith(_literal(m, 2))),
+]
+
+
+def _select_xpath(dom: DOMSnapshot, xpath: str) -> list[Node]:
+    xpath = xpath.strip()
+    if xpath.startswith('.'):
+        # Relative to the document when used with driver.find_elements
+        xpath = xpath[1:]
+
+    steps = []
+    pos = 0
+    while pos < len(xpath):
+        step = _XPATH_STEP.match(xpath, pos)
+        if not step:
+            raise UnsupportedSelector(f"Unsupported XPath: {xpath!r} at {pos}")
+        steps.append((step[1], step[2], [_parse_predicate(x) for x in _XPATH_PREDICATE.findall(step[3])]))
+        pos = step.end()
+
+    if not steps:
+        raise UnsupportedSelector(f"Unsupported XPath: {xpath!r}")
+
+    document = Node(-1, '#document', {}, False, [], None)
+    document.children = dom.roots
+
+    context = [document]
+    for axis, test, predicates in steps:
+        context = _xpath_step(context, axis, test, predicates)
+
+    found = {x.index: x for x in context if x.index >= 0}
+    return [found[x] for x in sorted(found)]
+
+
+def _xpath_step(context: list[Node], axis: str, test: str, predicates: list) -> list[Node]:
+    if test == '.':
+        if axis == '//':
+            raise UnsupportedSelector("Unsupported XPath step: //.")
+        return _apply_predicates(context, predicates)
+    if test == '..':
+        if axis == '//':
+            raise UnsupportedSelector("Unsupported XPath step: //..")
+        return _apply_predicates([x.parent for x in context if x.parent is not None], predicates)
+
+    # Positions are counted per parent, like child::test[n] of descendant-or-self::node()
+    parents = context
+    if axis == '//':
+        parents = {}
+        for node in context:
+            parents[node.index] = node
+            for descendant in node.descendants():
+                parents[descendant.index] = descendant
+        parents = list(parents.values())
+
+    result = []
+    for parent in parents:
+        children = [x for x in parent.children if test == '*' or x.tag == test.lower()]
+        result.extend(_apply_predicates(children, predicates))
+
+    return result
+
+
+def _apply_predicates(nodes: list[Node], predicates: list) -> list[Node]:
+    for predicate in predicates:
+        nodes = [x for i, x in enumerate(nodes) if predicate(x, i, len(nodes))]
+    return nodes
+
+
+def _parse_predicate(expression: str):
+    tests = []
+    for part in _split_top_level(expression, ' and '):
+        part = part.strip()
+        for pattern, build in _XPATH_TESTS:
+            if match := pattern.fullmatch(part):
+                tests.append(build(match))
+                break
+        else:
+            raise UnsupportedSelector(f"Unsupported XPath predicate: [{expression}]")
+
+    def _predicate(node: Node, index: int, size: int) -> bool:
+        for test in tests:
+            if getattr(test, 'positional', False):
+                if not test(index, size):
+                    return False
+            elif not test(node):
+                return False
+        return True
+
+    return _predicate
+
+
+def _position_test(position: int):
+    def _test(index: int, size: int) -> bool:
+        return index == (size - 1 if position < 0 else position - 1)
+
+    _test.positional = True
+    return _test
+
+
+def _literal(match: re.Match, group: int) -> str:
+    value = match[group]
+    return value if value is not None else match[group + 1]
@@ -0,0 +1,162 @@
+# transport.py
+import logging
+import threading
+import time
+from typing import Optional
+
+import urllib3
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+from .exception import InvalidArgument
+from .metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+
+OPTIONS = ('pool_size', 'block')
+
+
+class PoolStats:
+    """
+    Connection pool counters of one driver. `requests` is every connection checkout, `opened` the ones needing a new
+    connection, `discarded` connections closed because the pool was full, `wait` the time spent waiting for a free
+    connection when the pool blocks.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.opened = 0
+        self.discarded = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.wait = Histogram()
+        self._lock = threading.Lock()
+
+    def checkout(self, waited: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            self.wait.add(waited)
+
+    def checkin(self, discarded: bool) -> None:
+        with self._lock:
+            self.in_use -= 1
+            self.discarded += discarded
+
+    def connection_opened(self) -> None:
+        with self._lock:
+            self.opened += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'opened': self.opened,
+                'reused': max(self.requests - self.opened, 0),
+                'discarded': self.discarded,
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'wait': self.wait.summary(),
+            }
+
+
+class MeteredConnectionPool(HTTPConnectionPool):
+    def __init__(self, *args, stats: PoolStats, **kwargs):
+        self.stats = stats
+        super().__init__(*args, **kwargs)
+
+    def _new_conn(self):
+        self.stats.connection_opened()
+        return super()._new_conn()
+
+    def _get_conn(self, timeout=None):
+        started = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        self.stats.checkout(time.perf_counter() - started)
+        return conn
+
+    def _put_conn(self, conn):
+        discarded = self.pool is None or self.pool.full()
+        self.stats.checkin(discarded)
+        super()._put_conn(conn)
+
+
+class SpectronPoolManager(urllib3.PoolManager):
+    """PoolManager creating metered pools."""
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        if scheme != 'http':
+            return super()._new_pool(scheme, host, port, request_context)
+
+        kwargs = dict(request_context or self.connection_pool_kw)
+        for key in ('scheme', 'host', 'port'):
+            kwargs.pop(key, None)
+
+        return MeteredConnectionPool(host, port, stats=self.stats, **kwargs)
+
+
+class SpectronConnection(ChromiumRemoteConnection):
+    """
+    Keep-alive connection to chromedriver for one driver, so sessions never share or contend for connections.
+
+    Selenium's pool holds a single connection per host: a second thread sending a command at the same time opens
+    a new connection, which is closed again afterwards. Here up to `pool_size` connections are kept open.
+    With `block`, threads wait for a free connection instead of opening more.
+    """
+
+    def __init__(self, remote_server_addr: str, vendor_prefix: str = 'goog', browser_name: str = 'chrome',
+                 pool_size: int = DEFAULT_POOL_SIZE, block: bool = False, ignore_proxy: Optional[bool] = False):
+        if pool_size < 1:
+            raise InvalidArgument(f"Transport pool_size has to be at least 1, got {pool_size}.")
+
+        self.pool_size = pool_size
+        self.block = block
+        self.stats = PoolStats()
+        self._sent = threading.local()
+        super().__init__(remote_server_addr, vendor_prefix, browser_name, keep_alive=True,
+                         ignore_proxy=ignore_proxy)
+
+    @classmethod
+    def replace(cls, connection: ChromiumRemoteConnection, vendor_prefix: str,
+                options: dict = None) -> 'SpectronConnection':
+        """Connection to the same chromedriver as `connection`, which is closed."""
+        options = options or {}
+        if unknown := set(options) - set(OPTIONS):
+            raise InvalidArgument(f"Unknown transport option(s): {', '.join(sorted(unknown))}. "
+                                  f"Supported: {', '.join(OPTIONS)}")
+
+        rtn = cls(connection._url, vendor_prefix, connection.browser_name,
+                  ignore_proxy=connection._proxy_url is None, **options)
+        connection.close()
+
+        logger.debug(f"Transport to {rtn._url}:: pool_size: {rtn.pool_size}, block: {rtn.block}")
+        return rtn
+
+    @property
+    def sent_bytes(self) -> int:
+        """Size of the JSON body of the current thread's last command, as serialized by selenium."""
+        return getattr(self._sent, 'bytes', 0)
+
+    def execute(self, command, params):
+        self._sent.bytes = 0
+        return super().execute(command, params)
+
+    def _request(self, method, url, body=None):
+        if body and method in ('POST', 'PUT'):
+            self._sent.bytes = len(body)
+        return super()._request(method, url, body)
+
+    def _get_connection_manager(self):
+        if self._proxy_url:
+            return super()._get_connection_manager()
+
+        return SpectronPoolManager(self.stats, timeout=self.get_timeout(), maxsize=self.pool_size,
+                                   block=self.block)
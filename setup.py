@@ -28,8 +28,8 @@ setup(
     license="MIT",
     keywords="spectronpy spectron electron python selenium webdriver",
     url="https://github.com/nils-e/SpectronPy",
-    packages=['spectronpy'],
-    package_dir={'spectronpy': 'lib'},
+    packages=['spectronpy', 'spectronpy.aio'],
+    package_dir={'spectronpy': 'lib', 'spectronpy.aio': 'lib/aio'},
     long_description=read('readme.md'),
     long_description_content_type='text/markdown',
     include_package_data=True,
@@ -0,0 +1,96 @@
+# conftest.py
+# Tests run against bench/fake_server.py, which stands in for chromedriver, the DevTools endpoint and the Electron
+# app, so no display, Electron or chromedriver is needed. Run from the repository root: `python -m pytest`.
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from bench import fake_server
+from bench.run import connect
+from spectronpy import session
+
+ROOT = Path(__file__).resolve().parent.parent
+
+BACKENDS = ('chromedriver', 'cdp')
+STRATEGIES = ('observer', 'poll')
+
+
+@pytest.fixture(autouse=True)
+def unbound_session():
+    """Every test starts without a session bound to it, and leaves none behind."""
+    token = session._current.set(None)
+    default = session._default
+    yield
+    session.set_default(default)
+    session._current.reset(token)
+
+
+@pytest.fixture
+def server():
+    server = fake_server.start(elements=10)
+    yield server
+    server.stop()
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request) -> str:
+    return request.param
+
+
+@pytest.fixture(params=STRATEGIES)
+def strategy(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def driver(server, backend, strategy):
+    """Driver of the fake server with its session bound to the test, wait time 2 seconds."""
+    driver = connect(server, strategy, backend)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def launchers(tmp_path) -> tuple[str, str]:
+    """Executables starting the fake server as the Electron app and as chromedriver."""
+    return launcher(tmp_path, 'electron'), launcher(tmp_path, 'chromedriver')
+
+
+@pytest.fixture
+def app_config(launchers) -> dict:
+    """Configuration of an Application run by the fake server, to pass as `config`."""
+    electron, chromedriver = launchers
+    return {
+        'app_path': electron,
+        'app_port': 'auto',
+        'chromedriver_path': chromedriver,
+        'stop_timeout': 2000,
+        'start_timeout': 10_000,
+    }
+
+
+@pytest.fixture
+def script(tmp_path):
+    """Writes an executable shell script `name` with the body, returns its path."""
+    def _script(name: str, body: str) -> str:
+        path = tmp_path / name
+        path.write_text(f'#!/bin/sh\n{body}\n')
+        path.chmod(0o755)
+        return str(path)
+
+    return _script
+
+
+def launcher(folder: Path, name: str, *args: str) -> str:
+    """Shell script running `python -m bench.fake_server` with `args` and the arguments it is given."""
+    path = folder / name
+    python_path = os.pathsep.join([str(ROOT)] + sys.path)
+    extra = ''.join(f' {x}' for x in args)
+
+    path.write_text(f'#!/bin/sh\n'
+                    f'PYTHONPATH="{python_path}" exec "{sys.executable}" -m bench.fake_server{extra} "$@"\n')
+    path.chmod(0o755)
+
+    return str(path)
@@ -0,0 +1,242 @@
+// dom.js
+// Just enough of the DOM for the SpectronPy renderer scripts to run in Node, see test_runtime.py. Selectors are
+// limited to `tag#id.class[attr="value"]` compounds and lists of them.
+'use strict';
+
+var observers = [];
+
+function notify(target) {
+    observers.forEach(function (observer) {
+        if (observer.root && (observer.root === target || contains(observer.root, target))) {
+            queueMicrotask(function () {
+                observer.callback([]);
+            });
+        }
+    });
+}
+
+function contains(root, node) {
+    for (; node; node = node.parentNode) {
+        if (node === root) {
+            return true;
+        }
+    }
+    return false;
+}
+
+function descendants(root) {
+    var rtn = [];
+    root.childNodes.forEach(function (node) {
+        if (node instanceof Element) {
+            rtn.push(node);
+            rtn = rtn.concat(descendants(node));
+        }
+    });
+    return rtn;
+}
+
+var SIMPLE = /^([a-z]+|\*)?(#[\w-]+)?((?:\.[\w-]+)*)(?:\[([\w-]+)="([^"]*)"\])?$/i;
+
+function matches(el, selector) {
+    var parts = SIMPLE.exec(selector);
+    if (!parts || !selector) {
+        throw new SyntaxError("'" + selector + "' is not a valid selector");
+    }
+    if (parts[1] && parts[1] !== '*' && parts[1].toUpperCase() !== el.tagName) {
+        return false;
+    }
+    if (parts[2] && parts[2].slice(1) !== el.getAttribute('id')) {
+        return false;
+    }
+    var classes = (el.getAttribute('class') || '').split(/\s+/);
+    if (parts[3] && !parts[3].slice(1).split('.').every(function (c) { return classes.indexOf(c) !== -1; })) {
+        return false;
+    }
+    return !parts[4] || el.getAttribute(parts[4]) === parts[5];
+}
+
+class Node {
+    constructor(nodeType) {
+        this.nodeType = nodeType;
+        this.parentNode = null;
+        this.childNodes = [];
+    }
+
+    get parentElement() {
+        return this.parentNode instanceof Element ? this.parentNode : null;
+    }
+
+    get firstChild() {
+        return this.childNodes[0] || null;
+    }
+
+    get nextSibling() {
+        var siblings = this.parentNode ? this.parentNode.childNodes : [];
+        return siblings[siblings.indexOf(this) + 1] || null;
+    }
+
+    get isConnected() {
+        return contains(document, this);
+    }
+
+    get textContent() {
+        return this.childNodes.map(function (node) {
+            return node.textContent;
+        }).join('');
+    }
+
+    appendChild(child) {
+        if (child.parentNode) {
+            child.remove();
+        }
+        child.parentNode = this;
+        this.childNodes.push(child);
+        notify(this);
+        return child;
+    }
+
+    remove() {
+        var parent = this.parentNode;
+        parent.childNodes.splice(parent.childNodes.indexOf(this), 1);
+        this.parentNode = null;
+        notify(parent);
+    }
+
+    querySelectorAll(selector) {
+        var list = selector.split(',').map(function (x) {
+            return x.trim();
+        });
+        return NodeList.from(descendants(this).filter(function (el) {
+            return list.some(function (x) {
+                return matches(el, x);
+            });
+        }));
+    }
+
+    getElementsByTagName(tag) {
+        return HTMLCollection.from(descendants(this).filter(function (el) {
+            return tag === '*' || el.tagName === tag.toUpperCase();
+        }));
+    }
+}
+
+Node.ELEMENT_NODE = 1;
+Node.TEXT_NODE = 3;
+Node.DOCUMENT_NODE = 9;
+
+class Text extends Node {
+    constructor(data) {
+        super(Node.TEXT_NODE);
+        this.data = data;
+    }
+
+    get textContent() {
+        return this.data;
+    }
+}
+
+class Element extends Node {
+    constructor(tag, attributes, text) {
+        super(Node.ELEMENT_NODE);
+        this.tagName = tag.toUpperCase();
+        this._attributes = Object.assign({}, attributes);
+        this.hidden = false;
+        this.disabled = false;
+        this.clicks = 0;
+        if (text !== undefined) {
+            this.appendChild(new Text(text));
+        }
+    }
+
+    get attributes() {
+        var attributes = this._attributes;
+        return Object.keys(attributes).map(function (name) {
+            return {name: name, value: attributes[name]};
+        });
+    }
+
+    get id() {
+        return this.getAttribute('id') || '';
+    }
+
+    get innerText() {
+        return this.hidden ? '' : this.textContent;
+    }
+
+    getAttribute(name) {
+        return name in this._attributes ? this._attributes[name] : null;
+    }
+
+    setAttribute(name, value) {
+        this._attributes[name] = String(value);
+        notify(this);
+    }
+
+    getBoundingClientRect() {
+        var index = descendants(document).indexOf(this);
+        return {left: 0, top: index * 10, width: this.hidden ? 0 : 100, height: this.hidden ? 0 : 10};
+    }
+
+    click() {
+        this.clicks++;
+    }
+}
+
+class NodeList extends Array {}
+
+class HTMLCollection extends Array {}
+
+class Document extends Node {
+    constructor() {
+        super(Node.DOCUMENT_NODE);
+        this.title = '';
+        this.documentElement = this.appendChild(new Element('html'));
+        this.body = this.documentElement.appendChild(new Element('body'));
+    }
+}
+
+class MutationObserver {
+    constructor(callback) {
+        this.callback = callback;
+        this.root = null;
+    }
+
+    observe(root) {
+        this.root = root;
+        observers.push(this);
+    }
+
+    disconnect() {
+        observers.splice(observers.indexOf(this), 1);
+        this.root = null;
+    }
+}
+
+var listeners = {};
+
+globalThis.window = globalThis;
+Object.assign(globalThis, {
+    Node: Node,
+    Text: Text,
+    Element: Element,
+    NodeList: NodeList,
+    HTMLCollection: HTMLCollection,
+    MutationObserver: MutationObserver,
+    document: new Document(),
+    location: {href: 'file:///index.html'},
+    scrollX: 0,
+    scrollY: 0,
+    CSS: {
+        escape: function (value) {
+            return String(value).replace(/[^\w-]/g, '\\$&');
+        }
+    },
+    addEventListener: function (type, listener) {
+        (listeners[type] = listeners[type] || []).push(listener);
+    },
+    removeEventListener: function (type, listener) {
+        listeners[type] = (listeners[type] || []).filter(function (x) {
+            return x !== listener;
+        });
+    }
+});
@@ -0,0 +1,216 @@
+import asyncio
+import atexit
+import os
+import time
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from spectronpy import Session, deadline, expected, ports
+from spectronpy.application import Application
+from spectronpy.aio import AsyncApplication, AsyncConnection, AsyncDriver, AsyncElementCollection, AsyncSnapshot, \
+    assert_no_selector, assert_selector, find, match
+from spectronpy.exception import AmbiguousMatch, ExpectationNotMet, InvalidArgument
+
+
+@pytest.fixture
+def run(server, strategy):
+    """Runs the coroutine function with an AsyncDriver of the fake server, its session bound, wait time 2 seconds."""
+    def _run(test):
+        async def main():
+            session = Session(selector=By.CSS_SELECTOR, wait_strategy=strategy)
+            driver = await AsyncDriver.create(AsyncConnection('127.0.0.1', server.port), {}, session)
+            await driver.update_wait(2)
+            with session:
+                try:
+                    await test(driver)
+                finally:
+                    await driver.quit()
+
+        asyncio.run(main())
+
+    return _run
+
+
+def test_all(run):
+    async def test(driver):
+        found = await find.all('.item')
+
+        assert isinstance(found, AsyncElementCollection)
+        assert len(found) == 10
+        assert await found.texts() == [f'Item {i}' for i in range(10)]
+        assert await found[2].text() == 'Item 2'
+        assert len(await find.all('.item', visible=True)) == 5
+        assert len(await find.all('.missing', wait=0)) == 0
+
+        assert (await find.element('#e4')).id == 'e4'
+        with pytest.raises(AmbiguousMatch):
+            await find.element('.item')
+        with pytest.raises(ExpectationNotMet):
+            await find.element('#missing', wait=0)
+
+    run(test)
+
+
+def test_stale_elements_are_found_again(server, run):
+    async def test(driver):
+        found = await find.all('.item')
+        element = found[3]
+        server.dom.rerender()
+
+        assert await element.text() == 'Item 3'
+        assert element.id == 'e3-1'
+        assert (await found.texts())[3] == 'Item 3'
+        assert driver.session.stale['reresolved'] == 2
+
+    run(test)
+
+
+def test_matchers(server, run):
+    async def test(driver):
+        server.dom.set_title('Dashboard', delay=0.2)
+
+        assert await match.Title.equals('Dashboard')
+        assert await match.Element.to_be_clickable('#e2')
+        assert await match.Element.to_have_text(await find.element('#e2'), 'Item 2')
+        assert await match.Element.to_have_text('e2', 'Item 2', by=By.ID)
+        assert await match.any_of(expected.title_contains('missing'), expected.url_contains('bench')) == (1, True)
+        assert await match.Title.has('missing', wait=0.1) is False
+
+        with pytest.raises(InvalidArgument):
+            await match.any_of(lambda d: True)
+
+    run(test)
+
+
+def test_assertions(run):
+    async def test(driver):
+        await assert_selector('.item', count=5, visible=True)
+        await assert_no_selector('.missing', wait=0)
+
+        with pytest.raises(ExpectationNotMet):
+            await assert_selector('.item', count=3, visible=True, wait=0)
+
+    run(test)
+
+
+def test_deadline(run):
+    async def test(driver):
+        started = time.perf_counter()
+
+        with deadline.within(0.3):
+            assert len(await find.all('.missing', wait=5)) == 0
+            assert await match.Element.to_be_clickable('#missing', wait=5) is False
+
+        assert time.perf_counter() - started < 1.5
+
+    run(test)
+
+
+def test_snapshot(server, run):
+    async def test(driver):
+        async with AsyncSnapshot(driver.session) as snapshot:
+            requests = server.requests
+            await assert_selector('.item', count=5, visible=True)
+            assert len(await find.all('.item', text='Item 3')) == 1
+            assert server.requests == requests
+
+            await (await find.element('#e2')).click()
+            await assert_selector('.item', count=10)
+            assert snapshot.taken == 2
+
+        assert driver.session.snapshot is None
+
+    run(test)
+
+
+def test_lifecycle(app_config):
+    assert not issubclass(AsyncApplication, Application)
+
+    async def main():
+        app = AsyncApplication(app_config['app_path'], config=app_config)
+        await app.start()
+        await app.stop()
+        handlers = atexit._ncallbacks()
+        await app.start()
+        try:
+            with app.session:
+                assert await match.Title.has('Bench')
+                assert len(await find.all('.item', By.CSS_SELECTOR)) == 100
+        finally:
+            await app.stop()
+
+        assert not app.is_running()
+        assert atexit._ncallbacks() == handlers
+
+    asyncio.run(main())
+
+
+def test_checkpoint_and_restore(app_config, tmp_path):
+    profile = tmp_path / 'profile'
+    profile.mkdir()
+    (profile / 'Preferences').write_text('{}')
+
+    async def main():
+        app = AsyncApplication(app_config['app_path'], config=app_config | {
+            'user_data_dir': str(profile),
+            'checkpoint_dir': str(tmp_path / 'checkpoints'),
+        })
+        await app.start()
+        try:
+            checkpoint = await app.checkpoint('ready')
+            assert app.is_running()
+
+            await app.restore(checkpoint.name)
+            assert app.is_running()
+            assert app.user_data_dir != str(profile)
+            assert os.path.exists(os.path.join(app.user_data_dir, 'Preferences'))
+        finally:
+            await app.stop()
+            app._discard_instance()
+
+    asyncio.run(main())
+
+
+def test_intercept(app_config):
+    async def main():
+        app = AsyncApplication(app_config['app_path'], config=app_config)
+        app.intercept.stub('*/api/user', json={'name': 'Ada'})
+
+        await app.start()
+        try:
+            assert app.intercept.connection is not None and not app.intercept.connection.closed
+        finally:
+            await app.stop()
+
+        assert app.intercept.connection is None
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize('electron, chromedriver', [
+    # DevTools never answers
+    ('exec sleep 60', None),
+    # chromedriver fails to start
+    (None, 'exit 1'),
+])
+def test_failed_start_cleans_up(app_config, script, electron, chromedriver):
+    config = dict(app_config, start_timeout=1000)
+    if electron:
+        config['app_path'] = script('electron', electron)
+    if chromedriver:
+        config['chromedriver_path'] = script('chromedriver', chromedriver)
+    app = AsyncApplication(config['app_path'], config=config)
+
+    spawned = []
+    start_app = app.start_app
+    app.start_app = lambda: spawned.append(start_app()) or spawned[-1]
+
+    with pytest.raises(Exception):
+        asyncio.run(app.start())
+
+    process, = spawned
+    assert process.poll() is not None
+    assert not ports.is_reserved(int(process.args[-1].rpartition('=')[2]))
+    assert app.port is None
+    assert not app.is_running()
@@ -0,0 +1,128 @@
+import atexit
+import os
+import time
+
+import psutil
+import pytest
+
+from spectronpy import Application, ports
+
+
+@pytest.fixture
+def app(app_config, tmp_path):
+    profile = tmp_path / 'profile'
+    profile.mkdir()
+    (profile / 'Preferences').write_text('{}')
+
+    app = Application(app_config['app_path'], config=app_config | {
+        'user_data_dir': str(profile),
+        'checkpoint_dir': str(tmp_path / 'checkpoints'),
+    })
+    yield app
+    app.stop()
+    app._discard_instance()
+
+
+def test_restore_registers_one_exit_handler(app):
+    app.checkpoint('logged-in')
+    handlers = atexit._ncallbacks()
+
+    first = app.restore('logged-in', start=False).name
+    instance = app.user_data_dir
+    app.restore(first, start=False)
+
+    assert atexit._ncallbacks() == handlers + 1
+    # The previous clone is removed right away, the current one at exit
+    assert not os.path.exists(instance)
+    assert os.path.exists(os.path.join(app.user_data_dir, 'Preferences'))
+
+
+@pytest.mark.parametrize('electron, chromedriver', [
+    # DevTools never answers
+    ('exec sleep 60', None),
+    # chromedriver fails to start
+    (None, 'exit 1'),
+])
+def test_failed_start_cleans_up(app_config, script, electron, chromedriver):
+    config = dict(app_config, start_timeout=1000)
+    if electron:
+        config['app_path'] = script('electron', electron)
+    if chromedriver:
+        config['chromedriver_path'] = script('chromedriver', chromedriver)
+    app = Application(config['app_path'], config=config)
+
+    spawned = []
+    start_app = app.start_app
+    app.start_app = lambda: spawned.append(start_app()) or spawned[-1]
+
+    with pytest.raises(Exception):
+        app.start()
+
+    process, = spawned
+    assert process.poll() is not None
+    assert not ports.is_reserved(int(process.args[-1].rpartition('=')[2]))
+    assert app.port is None
+    assert not app.is_running()
+
+
+def helper_ignoring_sigterm(script, electron: str, pid_file) -> str:
+    """Electron launcher which first starts a helper ignoring SIGTERM, writing its pid to pid_file."""
+    return script('electron-with-helper', f'sh -c \'trap "" TERM; echo $$ > {pid_file}; exec sleep 60\' &\n'
+                                          f'exec {electron} "$@"')
+
+
+def wait_for_pid(pid_file) -> int:
+    end = time.monotonic() + 5
+    while not pid_file.exists() or not pid_file.read_text().strip():
+        assert time.monotonic() < end
+        time.sleep(0.01)
+    return int(pid_file.read_text())
+
+
+def test_helpers_ignoring_sigterm_are_killed(app_config, script, tmp_path):
+    pid_file = tmp_path / 'helper.pid'
+    electron = helper_ignoring_sigterm(script, app_config['app_path'], pid_file)
+    app = Application(electron, config=app_config | {'app_path': electron})
+    app.start()
+    helper = psutil.Process(wait_for_pid(pid_file))
+
+    app.stop()
+
+    assert not helper.is_running() or helper.status() == psutil.STATUS_ZOMBIE
+    timings = app.teardown_timings
+    assert timings['killed'] == 1
+    assert timings['processes'][f'sleep[{helper.pid}]'] >= timings['grace']
+    assert all(x is not None for x in timings['processes'].values())
+    assert timings['total'] >= timings['grace']
+
+
+def test_helpers_outliving_the_leader_are_killed(app_config, script, tmp_path):
+    pid_file = tmp_path / 'helper.pid'
+    electron = helper_ignoring_sigterm(script, app_config['app_path'], pid_file)
+    app = Application(electron, config=app_config | {'app_path': electron})
+    leader = app.start_app()
+    helper = psutil.Process(wait_for_pid(pid_file))
+    leader.kill()
+    leader.wait()
+
+    app.terminate()
+
+    assert not helper.is_running() or helper.status() == psutil.STATUS_ZOMBIE
+    assert app.teardown_timings['killed'] == 1
+    assert list(app.teardown_timings['processes']) == [f'sleep[{helper.pid}]']
+    app._release_port()
+
+
+def test_restart_keeps_one_exit_handler(app_config):
+    app = Application(app_config['app_path'], config=app_config)
+
+    app.start()
+    # Counted once started, the first start may import modules registering handlers of their own
+    handlers = atexit._ncallbacks()
+    app.restart()
+    assert atexit._ncallbacks() == handlers
+
+    app.stop()
+    app.start()
+    app.stop()
+    assert atexit._ncallbacks() == handlers
@@ -0,0 +1,145 @@
+import io
+import json
+import shutil
+import subprocess
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, \
+    UnknownMethodException
+from selenium.webdriver.common.by import By
+
+from bench.run import connect
+from spectronpy import cdp
+
+
+@pytest.mark.parametrize('length', [0, 1, 125, 126, 65535, 65536])
+@pytest.mark.parametrize('mask', [True, False])
+def test_frames(length, mask):
+    payload = bytes(range(256)) * (length // 256) + bytes(range(length % 256))
+    frame = cdp.encode_frame(cdp.OP_TEXT, payload, mask)
+
+    stream = io.BytesIO(frame)
+    assert cdp.read_frame(stream) == (True, cdp.OP_TEXT, payload)
+    assert stream.read() == b''
+
+
+def test_truncated_frame():
+    frame = cdp.encode_frame(cdp.OP_TEXT, b'hello')
+
+    with pytest.raises(ConnectionError):
+        cdp.read_frame(io.BytesIO(frame[:-1]))
+
+
+def test_accept_key():
+    # Example of RFC 6455
+    assert cdp.accept_key('dGhlIHNhbXBsZSBub25jZQ==') == 's3pPLMBiTxaQ9kYGzzhZRbK+xOo='
+
+
+@pytest.fixture
+def driver(server):
+    driver = connect(server, backend='cdp')
+    yield driver
+    driver.quit()
+
+
+def test_page(server, driver):
+    assert driver.title == 'SpectronPy Bench'
+    assert driver.current_url == 'file:///bench/index.html'
+    assert driver.window_handles == [driver.current_window_handle] == ['page']
+
+    driver.get('file:///bench/other.html')
+    assert driver.current_url == server.dom.url == 'file:///bench/other.html'
+
+    driver.refresh()
+    assert driver.get_screenshot_as_png().startswith(b'\x89PNG')
+
+
+def test_elements(driver):
+    elements = driver.find_elements(By.CSS_SELECTOR, '.item')
+    assert len(elements) == 10
+
+    element = driver.find_element(By.ID, 'e2')
+    assert element.text == 'Item 2'
+    assert element.tag_name == 'div'
+    assert element.get_attribute('name') == 'item2'
+    assert element.is_enabled()
+    element.click()
+
+    with pytest.raises(NoSuchElementException):
+        driver.find_element(By.ID, 'missing')
+
+
+def test_scripts(driver):
+    assert driver.execute_script('return process.versions.electron') == '0.0.0-bench'
+    # Elements are passed to scripts as references
+    assert driver.find_element(By.ID, 'e2').is_displayed()
+    assert not driver.find_element(By.ID, 'e1').is_displayed()
+
+
+def test_implicit_wait(server, driver):
+    driver.implicitly_wait(2)
+    server.dom.mutate(lambda dom: dom.populate(20), delay=0.2)
+
+    started = time.perf_counter()
+    assert driver.find_element(By.ID, 'e15').text == 'Item 15'
+    assert 0.15 < time.perf_counter() - started < 1.5
+
+
+def test_stale_elements(server, driver):
+    element = driver.find_element(By.ID, 'e1')
+    server.dom.rerender()
+
+    with pytest.raises(StaleElementReferenceException):
+        element.text
+
+
+def test_unsupported_commands(driver):
+    with pytest.raises(UnknownMethodException):
+        driver.minimize_window()
+
+
+# Runs the page helpers in node with a minimal DOM, to check element references don't keep elements alive
+_PAGE_TEST = """
+class Node {}
+class Element extends Node {
+    constructor() { super(); this.isConnected = true; this.tagName = 'DIV'; }
+}
+Object.assign(globalThis, {window: globalThis, Node, Element, NodeList: class {}, HTMLCollection: class {}});
+eval(require('fs').readFileSync(0, 'utf8'));
+
+const cdp = window.__spectronpy_cdp;
+const key = 'element-6066-11e4-a52e-4f735466cecf';
+const tick = () => new Promise(resolve => setTimeout(resolve, 10));
+
+(async () => {
+    let dropped = new Element();
+    const kept = new Element();
+    const refs = (await cdp.script(() => [dropped, kept], [], false, null)).value.map(x => x[key]);
+    dropped = null;
+    await tick();
+    global.gc();
+    await tick();
+    console.log(JSON.stringify(await Promise.all(refs.map(id => cdp.element('tag', id)))));
+})();
+"""
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='needs node')
+def test_page_helpers_hold_elements_weakly():
+    out = subprocess.run(['node', '--expose-gc', '-e', _PAGE_TEST], input=cdp._PAGE_JS, capture_output=True,
+                         text=True, check=True, timeout=30)
+    dropped, kept = json.loads(out.stdout)
+
+    assert dropped['error'] == 'stale element reference'
+    assert kept == {'value': 'div'}
+
+
+def test_references_of_replaced_elements_go_stale(server, driver):
+    elements = driver.find_elements(By.CSS_SELECTOR, '.item')
+    server.dom.rerender()
+
+    for element in (elements[0], elements[-1]):
+        with pytest.raises(StaleElementReferenceException):
+            element.tag_name
+    assert driver.find_element(By.ID, 'e9').tag_name == 'div'
@@ -0,0 +1,42 @@
+import logging
+import os
+
+import pytest
+
+from spectronpy import chromedriver
+from spectronpy.exception import DriverNotFound
+
+
+@pytest.fixture
+def root(tmp_path):
+    """webdriver_manager cache folder holding chromedriver 104.0.5112.79"""
+    folder = tmp_path / 'drivers' / 'chromedriver' / 'linux64' / '104.0.5112.79'
+    folder.mkdir(parents=True)
+    (folder / 'chromedriver').write_text('')
+    return str(tmp_path)
+
+
+def test_exact_version(root):
+    index = chromedriver.ChromedriverIndex(root)
+    assert index.scan() == 1
+
+    assert index.resolve('104.0.5112.79').endswith(os.path.join('104.0.5112.79', 'chromedriver'))
+    assert index.resolve('104') == index.resolve('104.0.5112.79')
+    assert index.resolve('104.0.5112.102') is None
+
+
+def test_inferred_version_falls_back_to_the_major_version(root, caplog):
+    index = chromedriver.ChromedriverIndex(root)
+    index.scan()
+
+    with caplog.at_level(logging.WARNING, chromedriver.__name__):
+        assert index.resolve('104.0.5112.102', inferred=True) == index.resolve('104.0.5112.79')
+
+    assert 'using 104.0.5112.79' in caplog.text
+
+
+def test_offline(root):
+    with pytest.raises(DriverNotFound):
+        chromedriver.resolve('104.0.5112.102', offline=True, root=root)
+
+    assert chromedriver.resolve('104.0.5112.102', offline=True, root=root, inferred=True)
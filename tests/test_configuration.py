@@ -0,0 +1,33 @@
+import pytest
+
+from spectronpy.configuration import Configuration
+from spectronpy.exception import InvalidArgument
+
+
+@pytest.fixture
+def app_path(tmp_path) -> str:
+    path = tmp_path / 'app'
+    path.touch()
+    return str(path)
+
+
+def test_defaults_keep_earlier_behaviour(app_path):
+    config = Configuration(app_path=app_path)
+
+    assert config.app_port == 9515
+    assert config.chromedriver_reuse is False
+    assert config.electron_log_buffer == 0
+    assert config.wait_strategy == 'poll'
+    assert config.metrics is False
+
+
+@pytest.mark.parametrize('option, value', [
+    ('app_port', 0),
+    ('app_port', 'any'),
+    ('electron_args', '--flag'),
+    ('wait_strategy', 'sleep'),
+    ('backend', 'firefox'),
+])
+def test_invalid(app_path, option, value):
+    with pytest.raises(InvalidArgument):
+        Configuration(app_path=app_path, **{option: value})
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import pytest
+
+from spectronpy import assert_selector, deadline, finders, matchers
+from spectronpy.exception import ExpectationNotMet
+
+
+def test_remaining_outside_a_budget():
+    assert not deadline.active()
+    assert deadline.remaining(3) == 3
+    assert deadline.remaining() is None
+
+
+def test_nested_budgets_only_shorten():
+    with deadline.within(2):
+        assert deadline.active()
+        assert deadline.remaining(10) == pytest.approx(2, abs=0.05)
+
+        with deadline.within(5):
+            assert deadline.remaining() == pytest.approx(2, abs=0.05)
+
+        with deadline.within(0.5):
+            assert deadline.remaining(10) == pytest.approx(0.5, abs=0.05)
+            assert deadline.remaining(0.1) == 0.1
+
+        assert deadline.remaining() == pytest.approx(2, abs=0.05)
+
+    assert not deadline.active()
+
+
+def test_start_and_reset():
+    token = deadline.start(1)
+    try:
+        assert deadline.remaining(5) == pytest.approx(1, abs=0.05)
+    finally:
+        deadline.reset(token)
+
+    assert not deadline.active()
+
+
+def test_spent_budget():
+    with deadline.within(0.05):
+        time.sleep(0.1)
+        assert deadline.remaining(1) == 0
+
+
+def test_budgets_are_per_thread():
+    seen = []
+
+    with deadline.within(1):
+        thread = threading.Thread(target=lambda: seen.append(deadline.active()))
+        thread.start()
+        thread.join()
+
+    assert seen == [False]
+
+
+def test_default_budget_is_the_wait_time(driver):
+    with deadline.within():
+        assert deadline.remaining() == pytest.approx(driver.session.wait_time, abs=0.05)
+
+
+def test_sequential_waits_share_the_budget(driver):
+    started = time.perf_counter()
+
+    with deadline.within(0.5):
+        assert len(finders.all('.missing', wait=2)) == 0
+        assert matchers.Title.has('missing', wait=2) is False
+        with pytest.raises(ExpectationNotMet):
+            assert_selector('.missing', wait=2)
+
+    assert time.perf_counter() - started < 1.2
+
+
+def test_spent_budget_checks_once(driver):
+    with deadline.within(0):
+        assert matchers.Title.has('Bench')
+        assert len(finders.all('.item')) == 10
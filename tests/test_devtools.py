@@ -0,0 +1,105 @@
+import json
+import subprocess
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from spectronpy import Application, devtools, ports
+from spectronpy.exception import NotReady, POpenError
+
+VERSION = {'Browser': 'Chrome/120.0.0.0', 'webSocketDebuggerUrl': 'ws://localhost/devtools/browser'}
+PAGE = {'type': 'page', 'url': 'file:///index.html'}
+
+
+class _Booting(BaseHTTPRequestHandler):
+    """DevTools endpoint coming up: no page target, then a connection dropped mid-response, then the page."""
+
+    def do_GET(self):
+        if self.path == '/json/version':
+            return self._send(json.dumps(VERSION).encode())
+
+        self.server.lists += 1
+        if self.server.lists == 1:
+            self._send(b'[]')
+        elif self.server.lists == 2:
+            # Announces more than it sends, the client gets an IncompleteRead
+            self.send_response(200)
+            self.send_header('Content-Length', '100')
+            self.end_headers()
+            self.wfile.write(b'[{"type": ')
+            self.close_connection = True
+        else:
+            self._send(json.dumps([PAGE]).encode())
+
+    def _send(self, data: bytes):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def port():
+    port = ports.allocate()
+    yield port
+    ports.release(port)
+
+
+def serve_late(port: int, delay: float) -> list[ThreadingHTTPServer]:
+    """Starts answering on port after delay."""
+    servers = []
+
+    def serve():
+        time.sleep(delay)
+        server = ThreadingHTTPServer(('localhost', port), _Booting)
+        server.lists = 0
+        servers.append(server)
+        server.serve_forever(poll_interval=0.05)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return servers
+
+
+def test_wait_until_ready(port):
+    servers = serve_late(port, 0.2)
+    started = time.monotonic()
+    try:
+        assert devtools.wait_until_ready(port, timeout=5) == VERSION
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    assert time.monotonic() - started >= 0.2
+    assert servers[0].lists == 3
+
+
+def test_not_ready(port):
+    with pytest.raises(NotReady, match=f'port {port}'):
+        devtools.wait_until_ready(port, timeout=0.2)
+
+
+def test_process_exits_first(port):
+    process = subprocess.Popen(['true'])
+    process.wait()
+
+    with pytest.raises(POpenError):
+        devtools.wait_until_ready(port, timeout=5, process=process)
+
+
+def test_boot_timings(app_config):
+    app = Application(app_config['app_path'], config=app_config)
+    app.start()
+    try:
+        timings = app.boot_timings
+    finally:
+        app.stop()
+
+    assert set(timings) == {'spawn', 'devtools_ready', 'session_created', 'total'}
+    assert all(x >= 0 for x in timings.values())
+    assert timings['total'] >= timings['spawn'] + timings['devtools_ready'] + timings['session_created'] - 1e-6
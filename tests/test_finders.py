@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from spectronpy import assert_no_selector, assert_selector, expected, finders, matchers
+from spectronpy.element import ElementCollection
+from spectronpy.exception import AmbiguousMatch, ExpectationNotMet
+from spectronpy.metrics import CommandMetrics
+
+
+def test_all(driver):
+    found = finders.all('.item')
+
+    assert isinstance(found, ElementCollection)
+    assert len(found) == 10
+    assert found.texts() == [f'Item {i}' for i in range(10)]
+    assert found.attributes('name')[:2] == ['item0', 'item1']
+    assert len(finders.all('.item', visible=True)) == 5
+    assert [x.id for x in finders.all('.item', text='Item 3')] == ['e3']
+    assert len(finders.all('.missing', wait=0)) == 0
+
+
+def test_element(driver):
+    assert finders.element('#e4').text == 'Item 4'
+    assert finders.by_id('e4').id == 'e4'
+    assert finders.first('.item').id == 'e0'
+
+    with pytest.raises(AmbiguousMatch):
+        finders.element('.item')
+    with pytest.raises(ExpectationNotMet):
+        finders.element('#missing', wait=0)
+    with pytest.raises(ExpectationNotMet):
+        finders.all('.item', minimum=11, wait=0)
+
+
+def test_waits_for_elements(server, driver):
+    server.dom.mutate(lambda dom: dom.populate(20), delay=0.2)
+
+    started = time.perf_counter()
+    assert finders.element('#e15').text == 'Item 15'
+    assert time.perf_counter() - started < 1.5
+
+
+def test_matchers(server, driver):
+    assert matchers.Title.has('Bench')
+    assert matchers.Title.has('bench', case_insensitive=True)
+    assert matchers.URL.has('index.html')
+    assert matchers.URL.matches(r'bench/\w+\.html')
+    assert matchers.Title.has('missing', wait=0.1) is False
+
+    server.dom.set_title('Dashboard', delay=0.2)
+    assert matchers.Title.equals('Dashboard', wait=2)
+
+    assert matchers.Element.to_be_clickable('#e2')
+    assert matchers.Element.to_have_text('#e2', 'Item 2')
+    assert matchers.Element.to_have_text('e2', 'Item 2', by=By.ID)
+
+
+def test_any_of(server, driver):
+    server.dom.set_title('Dashboard', delay=0.2)
+
+    index, _ = matchers.any_of(expected.presence_of_all_elements_located((By.CSS_SELECTOR, '.missing')),
+                               expected.title_contains('Dashboard'), wait=2)
+    assert index == 1
+    assert matchers.all_of(expected.title_contains('Dash'), expected.url_contains('bench'))
+    assert matchers.any_of(expected.title_contains('missing'), wait=0.1) is False
+
+
+def test_assertions(driver):
+    assert_selector('.item', count=5, visible=True)
+    assert_selector('.item', count=10)
+    assert_selector('.item', count=1, text='Item 7')
+    assert_no_selector('.missing', wait=0)
+
+    with pytest.raises(ExpectationNotMet):
+        assert_selector('.item', count=3, visible=True, wait=0)
+    with pytest.raises(ExpectationNotMet):
+        assert_no_selector('.item', wait=0)
+
+
+def test_stale_elements_are_found_again(server, driver):
+    found = finders.all('.item')
+    element = found[3]
+    server.dom.rerender()
+
+    assert found.texts()[3] == 'Item 3'
+    assert element.text == 'Item 3'
+    assert element.id == 'e3-1'
+
+
+def test_waits_leave_the_timeouts_alone(driver):
+    driver.metrics = CommandMetrics()
+    started = time.perf_counter()
+
+    assert len(finders.all('.missing', wait=0.3)) == 0
+    assert matchers.Element.to_be_clickable('#missing', wait=0.3) is False
+
+    # The implicit wait is 0, so polls don't stack on it
+    assert time.perf_counter() - started < 1.2
+    assert 'setTimeouts' not in driver.metrics.commands
@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench.run import IMPORT_CASES, ROOT, _IMPORT_SCRIPT
+
+# Milliseconds, generous so slow CI machines pass; `python -m bench --import-budget` checks the tight one
+BUDGET = 500
+# Only imported once a name needing them is used
+LAZY = ('selenium', 'urllib3', 'psutil', 'webdriver_manager')
+
+
+@pytest.mark.parametrize('statement', IMPORT_CASES)
+def test_import_is_lazy(statement):
+    env = os.environ | {'PYTHONPATH': os.pathsep.join([str(ROOT)] + sys.path)}
+
+    out = subprocess.run([sys.executable, '-c', _IMPORT_SCRIPT, statement, *LAZY], env=env,
+                         capture_output=True, text=True, check=True)
+    sample = json.loads(out.stdout)
+
+    assert sample['loaded'] == []
+    assert sample['seconds'] * 1000 < BUDGET
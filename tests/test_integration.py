@@ -0,0 +1,53 @@
+# Runs the renderer runtime in a real Electron window: `npm run build:test-app` installs the test app's Electron,
+# the chromedriver backend downloads a matching chromedriver and a display is needed. Skipped otherwise.
+from pathlib import Path
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from spectronpy import Application, assert_no_selector, assert_selector, expected, finders, matchers
+
+ROOT = Path(__file__).resolve().parent.parent
+ELECTRON = ROOT / 'test' / 'node_modules' / '.bin' / 'electron'
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(not ELECTRON.exists(), reason='needs the test app, run `npm run build:test-app`'),
+]
+
+
+@pytest.fixture(params=['chromedriver', 'cdp'])
+def app(request):
+    app = Application(str(ELECTRON), config={
+        'app_port': 'auto',
+        'electron_args': [str(ROOT / 'test')],
+        'wait_strategy': 'observer',
+        'backend': request.param,
+    })
+    app.start()
+    app.default_selector(By.CSS_SELECTOR)
+    with app.session:
+        yield app
+    app.stop()
+
+
+def test_runtime(app):
+    assert matchers.Title.equals('Hello World!')
+    assert matchers.any_of(expected.title_contains('missing'), expected.title_contains('Hello')) == (1, True)
+
+    spans = finders.all('span')
+    assert len(spans) == 3
+    assert spans.texts() == [x.text for x in spans]
+    assert all(x['width'] > 0 for x in spans.rects())
+    assert spans.attributes('id') == ['node-version', 'chrome-version', 'electron-version']
+
+    assert finders.element('h1', text='Hello').text == 'Hello World!'
+    assert_selector('button', count=1, visible=True, text='Click me!')
+    assert_no_selector('.missing', wait=0)
+    finders.all('button').click_all()
+
+
+def test_snapshot(app):
+    with app.snapshot():
+        assert_selector('span', count=3)
+        assert finders.element('h1', text='Hello World!').tag_name == 'h1'
@@ -0,0 +1,108 @@
+import os
+import threading
+
+import pytest
+
+from spectronpy.logs import LogTail
+
+
+@pytest.fixture
+def pipe():
+    """(reader, writer) text streams of an OS pipe, like the output of a child process."""
+    r, w = os.pipe()
+    reader, writer = os.fdopen(r, 'r'), os.fdopen(w, 'w', buffering=1)
+    yield reader, writer
+    for stream in (writer, reader):
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def test_wait_for(pipe):
+    reader, writer = pipe
+    logs = LogTail()
+    logs.attach(reader)
+
+    threading.Timer(0.05, writer.write, ('starting\nApp ready on port 1234\n',)).start()
+    match = logs.wait_for(r'ready on port (\d+)', timeout=2)
+
+    assert match[1] == '1234'
+    assert logs.wait_for('never', timeout=0.05) is None
+
+
+def test_lines_stop_at_eof(pipe, tmp_path):
+    reader, writer = pipe
+    tee = tmp_path / 'electron.log'
+    logs = LogTail()
+    logs.attach(reader, str(tee))
+
+    writer.write('one\ntwo\n')
+    writer.close()
+
+    assert list(logs.lines(timeout=2)) == ['one\n', 'two\n']
+    logs.close(1)
+    assert logs.closed
+    assert tee.read_text() == 'one\ntwo\n'
+
+
+def test_mark(pipe):
+    reader, writer = pipe
+    logs = LogTail()
+    logs.attach(reader)
+
+    writer.write('ready\n')
+    assert logs.wait_for('ready', timeout=2)
+
+    mark = logs.mark()
+    assert logs.wait_for('ready', timeout=0.05, since=mark) is None
+
+    writer.write('ready again\n')
+    assert logs.wait_for('ready', timeout=2, since=mark).string == 'ready again\n'
+
+
+def test_ring_buffer(pipe):
+    reader, writer = pipe
+    logs = LogTail(max_bytes=10)
+    logs.attach(reader)
+
+    writer.write('aaaa\nbbbb\ncccc\n')
+    writer.close()
+    logs.close(2)
+
+    assert logs.tail() == 'bbbb\ncccc\n'
+    assert logs.tail(5) == 'cccc\n'
+    # Evicted lines are skipped
+    assert list(logs.lines()) == ['bbbb\n', 'cccc\n']
+
+
+def test_follow(tmp_path):
+    path = tmp_path / 'app.log'
+    path.write_text('')
+    logs = LogTail()
+    logs.follow(str(path))
+
+    with open(path, 'a') as f:
+        f.write('partial ')
+        f.flush()
+        f.write('line\n')
+
+    try:
+        assert logs.wait_for('partial line', timeout=2)
+    finally:
+        logs.close(1)
+
+    assert logs.closed
+    assert logs.tail() == 'partial line\n'
+
+
+def test_dump(pipe, tmp_path):
+    reader, writer = pipe
+    logs = LogTail()
+    logs.attach(reader)
+    writer.write('one\n')
+    writer.close()
+    logs.close(2)
+
+    logs.dump(str(tmp_path / 'out.log'))
+    assert (tmp_path / 'out.log').read_text() == 'one\n'
@@ -0,0 +1,49 @@
+import importlib.util
+import json
+
+import pytest
+
+from spectronpy import finders, metrics
+from spectronpy.metrics import CommandMetrics
+
+
+def test_record():
+    recorded = CommandMetrics()
+    recorded.record('getTitle', 0.01, caller='-')
+    recorded.record('w3cExecuteScript', 0.02, {'script': 'return 1', 'args': []}, caller='-')
+    recorded.record('w3cExecuteScript', 0.03, caller='-', size=10)
+
+    summary = recorded.summary()
+    assert summary['commands']['getTitle']['count'] == 1
+    assert summary['commands']['w3cExecuteScript']['payload_bytes'] == len('{"script": "return 1", "args": []}') + 10
+    assert summary['callers']['-']['count'] == 3
+
+
+def test_callers(driver):
+    driver.metrics = CommandMetrics()
+
+    finders.all('.item')
+
+    assert 'finders.all' in driver.metrics.callers
+
+
+@pytest.mark.parametrize('backend', ['chromedriver'])
+def test_payload_size_of_the_body_sent(driver):
+    driver.metrics = CommandMetrics()
+
+    driver.execute_script('return 1')
+
+    params = {'script': 'return 1', 'args': []}
+    assert driver.command_executor.sent_bytes == len(json.dumps(params))
+    assert driver.metrics.payload_bytes['w3cExecuteScript'] == len(json.dumps(params))
+
+
+def test_callers_under_another_package_name():
+    spec = importlib.util.spec_from_file_location('vendored.spectronpy.metrics', metrics.__file__)
+    vendored = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(vendored)
+
+    scope = {'__name__': 'vendored.spectronpy.finders', 'find_caller': vendored.find_caller}
+    exec("def all():\n    return lookup()\n\ndef lookup():\n    return find_caller()\n", scope)
+
+    assert scope['all']() == 'finders.all'
@@ -0,0 +1,114 @@
+import queue
+
+import pytest
+
+from spectronpy import ports, session
+from spectronpy.exception import InvalidArgument
+from spectronpy.pool import ApplicationPool
+
+
+@pytest.fixture
+def pool(app_config):
+    pool = ApplicationPool(app_config['app_path'], None, app_config, size=2)
+    yield pool
+    pool.stop()
+
+
+def test_invalid_arguments(app_config):
+    with pytest.raises(InvalidArgument):
+        ApplicationPool(app_config['app_path'], None, app_config, size=0)
+    with pytest.raises(InvalidArgument):
+        ApplicationPool(app_config['app_path'], None, app_config, reset=('unknown',))
+
+
+def test_app_config():
+    pool = ApplicationPool('app', None, {'app_port': 9000, 'electron_args': ['--a']}, size=2)
+
+    first, second = pool._app_config(0), pool._app_config(1)
+    assert (first['app_port'], second['app_port']) == (9000, 9001)
+    assert first['electron_args'] is not second['electron_args']
+
+
+def test_lease_and_release(pool):
+    pool.start()
+    first, second = pool.apps
+    processes = [app._app for app in pool.apps]
+
+    assert first.port != second.port
+    assert all(ports.is_reserved(app.port) for app in pool.apps)
+
+    with pool.leased() as app:
+        assert app is first
+        assert session.current() is app.session
+        assert app.client.title == 'SpectronPy Bench'
+
+        with pool.leased() as other:
+            assert other is second
+            with pytest.raises(queue.Empty):
+                pool.lease(timeout=0.1)
+
+    # Released apps are reset, not restarted
+    assert [app._app for app in pool.apps] == processes
+    assert pool.lease(timeout=1) is second
+
+
+def test_unhealthy_apps_are_recycled(pool):
+    pool.start()
+    app = pool.lease()
+    process = app._app
+    process.kill()
+    process.wait()
+
+    pool.release(app)
+
+    assert app._app is not process
+    assert app.is_running()
+    assert app.client.title == 'SpectronPy Bench'
+
+
+def test_failed_reset_recycles(pool):
+    def fail(app):
+        raise RuntimeError('reset failed')
+
+    pool.reset = (fail,)
+    pool.start()
+    app = pool.lease()
+    process = app._app
+
+    pool.release(app)
+
+    assert app._app is not process
+    assert app.is_running()
+
+
+def test_stop(pool):
+    pool.start()
+    used = [app.port for app in pool.apps]
+
+    pool.stop()
+
+    assert pool.apps == []
+    assert not any(ports.is_reserved(port) for port in used)
+
+
+def test_failed_recycle_keeps_the_pool_size(pool, monkeypatch):
+    pool.size = 1
+    pool.start()
+    app = pool.lease()
+    app._app.kill()
+    app._app.wait()
+
+    def fail():
+        raise RuntimeError('start failed')
+
+    monkeypatch.setattr(app, 'start', fail)
+    with pytest.raises(RuntimeError):
+        pool.release(app)
+    with pytest.raises(RuntimeError):
+        pool.lease(timeout=1)
+
+    # Still in the pool, recycled by the next lease
+    monkeypatch.undo()
+    assert pool.lease(timeout=1) is app
+    assert app.is_running()
+    assert app.client.title == 'SpectronPy Bench'
@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from spectronpy import ports
+
+
+@pytest.fixture(autouse=True)
+def lock_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ports, 'LOCK_DIR', str(tmp_path / 'ports'))
+    return tmp_path / 'ports'
+
+
+def test_allocate_and_release():
+    port = ports.allocate()
+
+    assert ports.is_reserved(port)
+    with open(os.path.join(ports.LOCK_DIR, str(port), ports.PID_FILE)) as f:
+        assert int(f.read()) == os.getpid()
+
+    # A port reserved by a live process is not handed out again
+    assert not ports._reserve(port)
+
+    ports.release(port)
+    assert not ports.is_reserved(port)
+    # Releasing twice is harmless
+    ports.release(port)
+
+
+def test_reclaims_reservations_of_dead_processes(lock_dir):
+    dead = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'], capture_output=True, text=True)
+    path = lock_dir / '1234'
+    path.mkdir(parents=True)
+    (path / ports.PID_FILE).write_text(dead.stdout.strip())
+
+    assert ports._reserve(1234)
+    assert (path / ports.PID_FILE).read_text() == str(os.getpid())
+    assert os.listdir(lock_dir) == ['1234']
+
+
+def test_reservation_being_written_is_respected(lock_dir):
+    (lock_dir / '1234').mkdir(parents=True)
+
+    assert not ports._reserve(1234)
+
+
+def test_abandoned_reservation_is_reclaimed(lock_dir):
+    path = lock_dir / '1234'
+    path.mkdir(parents=True)
+    os.utime(path, (0, 0))
+
+    assert ports._reserve(1234)
+
+
+def test_concurrent_allocations_are_unique():
+    allocated = []
+
+    def allocate():
+        for _ in range(10):
+            allocated.append(ports.allocate())
+
+    threads = [threading.Thread(target=allocate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(allocated) == len(set(allocated)) == 40
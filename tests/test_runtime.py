@@ -0,0 +1,189 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from spectronpy import cdp, evaluate
+
+NODE = shutil.which('node')
+DOM = Path(__file__).with_name('dom.js')
+
+pytestmark = pytest.mark.skipif(NODE is None, reason='needs node')
+
+# bench/fake_server.py answers the runtime calls in Python, here the shipped scripts run against tests/dom.js.
+# The selenium isDisplayed atom needs layout, the DOM stand-in has none: an element is displayed unless hidden.
+RUNTIME = evaluate._RUNTIME_JS % {
+    'is_displayed': 'function (el) { return !el.hidden; }',
+    'version': evaluate.RUNTIME_VERSION,
+    'interval': evaluate.OBSERVE_INTERVAL,
+}
+
+SETUP = """
+for (var i = 0; i < 4; i++) {
+    var item = document.body.appendChild(new Element('div', {id: 'e' + i, class: 'item', 'data-i': String(i)}));
+    item.appendChild(new Text('Item '));
+    item.appendChild(new Element('b', {}, String(i)));
+    item.hidden = i % 2 === 1;
+}
+document.title = 'Bench';
+var rt = window.__spectronpy;
+var page = window.__spectronpy_cdp;
+function ids(elements) {
+    return elements && elements.map(function (el) { return el.id; });
+}
+function report(value) {
+    console.log(JSON.stringify(value));
+}
+"""
+
+
+def run(script: str):
+    """Runs the runtime, the CDP helpers and then script in Node, returns what script passed to report()."""
+    source = '\n'.join([DOM.read_text(), RUNTIME, cdp._PAGE_JS, SETUP, script])
+    out = subprocess.run([NODE], input=source, capture_output=True, text=True, timeout=30)
+    assert out.returncode == 0, out.stderr
+
+    return json.loads(out.stdout)
+
+
+def check(tmp_path: Path, name: str, source: str) -> None:
+    path = tmp_path / f'{name}.js'
+    path.write_text(source)
+    out = subprocess.run([NODE, '--check', str(path)], capture_output=True, text=True, timeout=30)
+    assert out.returncode == 0, out.stderr
+
+
+def test_syntax(tmp_path):
+    check(tmp_path, 'runtime', evaluate._runtime())
+    check(tmp_path, 'page', cdp._PAGE_JS)
+    check(tmp_path, 'call', f'function call() {{ {evaluate._call_script("verify")} }}')
+    check(tmp_path, 'call_async', f'function call() {{ {evaluate._call_async_script("observe")} }}')
+    check(tmp_path, 'cdp_call', cdp._CALL.format(op='find', args='"css selector", ".item", null, true'))
+
+
+def test_runtime():
+    result = run("""
+        var items = rt.locate('css selector', '.item');
+        report({
+            version: rt.version,
+            text: rt.text(items[0]),
+            presence: ids(rt.presence('css selector', '.item')),
+            missing: rt.presence('css selector', '.missing'),
+            by_id: ids(rt.locate('id', 'e2')),
+            by_class: ids(rt.locate('class name', 'item')).length,
+            by_tag: ids(rt.locate('tag name', 'b')).length,
+            clickable: rt.clickable('css selector', '#e1') || ids([rt.clickable('css selector', '#e2')]),
+            text_in_element: rt.text_in_element('css selector', '#e2', null, 'Item 2'),
+            title: [rt.title_contains('bench', true), rt.title_is('Bench'), rt.url_contains('index')],
+            verify: rt.verify('css selector', '.item', {visible: true, text: 'Item 2'}),
+            select: (function (selected) {
+                return {found: selected.found, elements: ids(selected.elements)};
+            })(rt.select('css selector', '.item', {visible: true})),
+            any_of: rt.any_of([['title_is', ['Other']], ['title_contains', ['Ben']]]),
+            all_of: rt.all_of([['title_is', ['Bench']], ['presence', ['css selector', '.missing']]]),
+            texts: rt.texts(items),
+            attributes: rt.attributes(items, 'data-i'),
+            rects: rt.rects(items.slice(0, 2)),
+            clicked: [rt.clickAll(items.slice(1, 3)), items.map(function (el) { return el.clicks; })]
+        });
+    """)
+
+    assert result['version'] == evaluate.RUNTIME_VERSION
+    assert result['text'] == 'Item 0'
+    assert result['presence'] == ['e0', 'e1', 'e2', 'e3']
+    assert result['missing'] is None
+    assert result['by_id'] == ['e2']
+    assert (result['by_class'], result['by_tag']) == (4, 4)
+    assert result['clickable'] == ['e2']
+    assert result['text_in_element'] is True
+    assert result['title'] == [True, True, True]
+    assert result['verify'] == [{'visible': True, 'text': False}, {'visible': False, 'text': False},
+                                {'visible': True, 'text': True}, {'visible': False, 'text': False}]
+    assert result['select'] == {'found': 4, 'elements': ['e0', 'e2']}
+    assert result['any_of'] == [1, True]
+    assert result['all_of'] is None
+    assert result['texts'] == ['Item 0', '', 'Item 2', '']
+    assert result['attributes'] == ['0', '1', '2', '3']
+    assert result['rects'][1] == {'x': 0, 'y': 40, 'width': 0, 'height': 0}
+    assert result['clicked'] == [2, [0, 1, 1, 0]]
+
+
+def test_snapshot():
+    result = run("""
+        var taken = rt.snapshot();
+        report({title: taken.title, url: taken.url, nodes: taken.nodes, elements: taken.elements.length});
+    """)
+
+    assert (result['title'], result['url']) == ('Bench', 'file:///index.html')
+    html, body, item, bold = result['nodes'][:4]
+    assert html == [-1, 'html', {}, True, ['', '']]
+    assert body[:2] == [0, 'body']
+    assert item == [1, 'div', {'id': 'e0', 'class': 'item', 'data-i': '0'}, True, ['Item ', '']]
+    assert bold == [2, 'b', {}, True, ['0']]
+    assert result['elements'] == len(result['nodes']) == 10
+
+
+def test_observe():
+    result = run("""
+        var started = Date.now();
+        rt.observe('presence', ['css selector', '.late'], 2000, function (value) {
+            var observed = ids(value);
+            rt.observe('title_is', ['Never'], 100, function (timedOut) {
+                rt.observe('presence', ['xpath', '//div'], 100, function (failed) {
+                    report({observed: observed, timed_out: timedOut, failed: failed, ms: Date.now() - started});
+                });
+            });
+        });
+        setTimeout(function () {
+            document.body.appendChild(new Element('span', {id: 'late', class: 'late'}));
+        }, 20);
+    """)
+
+    assert result['observed'] == ['late']
+    assert result['timed_out'] is False
+    # document.evaluate is missing here, errors are reported instead of thrown
+    assert '__spectronpy_error__' in result['failed']
+    assert result['ms'] < 1000
+
+
+def test_cdp_helpers():
+    result = run("""
+        Promise.all([
+            page.find('css selector', '.item', null, true),
+            page.find('css selector', 'div[', null, true),
+            page.page('title'),
+            page.script(function (a, b) { return [a + b, document.body]; }, [1, 2], false, null),
+            page.script(function (done) { setTimeout(function () { done('later'); }, 10); }, [], true, 1000),
+            page.script(function () { throw new Error('boom'); }, [], false, null),
+        ]).then(function (found) {
+            var first = found[0].value[0]['element-6066-11e4-a52e-4f735466cecf'];
+            return Promise.all([
+                page.element('text', first),
+                page.element('rect', first),
+                page.element('attribute', first, 'data-i'),
+                page.find('css selector', 'b', first, false),
+            ]).then(function (element) {
+                document.body.childNodes[0].remove();
+                return page.element('text', first).then(function (stale) {
+                    report({found: found, element: element, stale: stale});
+                });
+            });
+        });
+    """)
+
+    found, invalid, title, sync, async_, error = result['found']
+    assert len(found['value']) == 4
+    assert invalid['error'] == 'invalid selector'
+    assert title == {'value': 'Bench'}
+    assert sync['value'][0] == 3 and 'element-6066-11e4-a52e-4f735466cecf' in sync['value'][1]
+    assert async_ == {'value': 'later'}
+    assert error == {'error': 'javascript error', 'message': 'javascript error: boom'}
+
+    text, rect, attribute, child = result['element']
+    assert text == {'value': 'Item 0'}
+    assert rect == {'value': {'x': 0, 'y': 20, 'width': 100, 'height': 10}}
+    assert attribute == {'value': '0'}
+    assert len(child['value']) == 1
+    assert result['stale']['error'] == 'stale element reference'
@@ -0,0 +1,70 @@
+import subprocess
+import threading
+
+import pytest
+from selenium.common import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+
+from spectronpy import SpectronDriver, ports, service
+
+
+@pytest.fixture(autouse=True)
+def services():
+    yield
+    service.stop_all()
+
+
+def test_shared_across_threads(launchers):
+    _, chromedriver = launchers
+    barrier = threading.Barrier(8)
+    found = []
+
+    def share():
+        barrier.wait()
+        found.append(service.shared(chromedriver))
+
+    threads = [threading.Thread(target=share) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(found) == 8
+    assert all(x is found[0] for x in found)
+
+
+def test_exited_services_are_replaced(launchers):
+    _, chromedriver = launchers
+    first = service.shared(chromedriver)
+    assert service.shared(chromedriver) is first
+
+    first.process = subprocess.Popen(['true'])
+    first.process.wait()
+
+    assert service.shared(chromedriver) is not first
+
+
+def test_failed_session_keeps_the_shared_service(server, launchers):
+    _, chromedriver = launchers
+    shared = service.shared(chromedriver)
+    first = SpectronDriver({'options': _options(f'127.0.0.1:{server.port}'), 'service': shared})
+
+    # Nothing listens on the debugger address, like an app which crashed during boot
+    port = ports.allocate()
+    try:
+        with pytest.raises(SessionNotCreatedException):
+            SpectronDriver({'options': _options(f'127.0.0.1:{port}'), 'service': service.shared(chromedriver)})
+    finally:
+        ports.release(port)
+
+    assert shared.is_running()
+    assert first.title == server.dom.title
+
+    first.quit()
+    assert shared.is_running()
+
+
+def _options(debugger_address: str) -> Options:
+    options = Options()
+    options.debugger_address = debugger_address
+    return options
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+
+from spectronpy import Application, session
+from spectronpy.session import Session
+
+
+def test_nested_blocks():
+    outer, inner = Session(), Session()
+
+    with outer:
+        with inner:
+            assert session.current() is inner
+        assert session.current() is outer
+
+    assert session.current() is session._default
+
+
+def test_threads_in_blocks_of_the_same_session():
+    shared = Session()
+    entered, leave = threading.Barrier(2, timeout=5), threading.Barrier(2, timeout=5)
+    errors = []
+
+    def run(wait_first: bool):
+        try:
+            with shared:
+                entered.wait()
+                if wait_first:
+                    leave.wait()
+                assert session.current() is shared
+            if not wait_first:
+                leave.wait()
+            assert session.current() is not shared
+        except Exception as e:
+            errors.append(e)
+
+    # The first thread leaves its block while the second is still in its own
+    threads = [threading.Thread(target=run, args=(x,)) for x in (False, True)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_tasks_in_blocks_of_the_same_session():
+    shared = Session()
+
+    async def task(delay: float):
+        with shared:
+            await asyncio.sleep(delay)
+            assert session.current() is shared
+        return session.current()
+
+    async def main():
+        return await asyncio.gather(task(0.05), task(0.01))
+
+    assert all(x is not shared for x in asyncio.run(main()))
+
+
+def test_deactivate():
+    first, second = Session(), Session()
+
+    token = first.activate()
+    first.deactivate(token)
+    assert session._current.get() is None
+
+    token = first.activate()
+    second.activate()
+    # Another session was bound since, it stays bound
+    first.deactivate(token)
+    assert session.current() is second
+
+
+def test_globals_write_to_the_current_session():
+    from spectronpy import globals
+
+    bound = Session()
+    with bound:
+        globals.default_wait_time = 3
+        globals.default_selector = 'css selector'
+
+        assert (bound.wait_time, bound.selector) == (3, 'css selector')
+        assert globals.get_default_wait_time() == 3
+        assert 'default_wait_time' not in vars(globals)
+
+
+def test_stop_unbinds_the_started_session(app_config):
+    app = Application(app_config['app_path'], config=app_config)
+
+    app.start()
+    assert session.current() is app.session
+    app.stop()
+
+    assert session._current.get() is None
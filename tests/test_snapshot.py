@@ -0,0 +1,204 @@
+from types import SimpleNamespace
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from spectronpy import finders, assert_selector
+from spectronpy.snapshot import DOMSnapshot, Snapshot, UnsupportedSelector, mutates, verify
+
+# (tag, attributes, visible, content), content mixes text and child elements
+DOCUMENT = ('html', {}, True, [
+    ('body', {}, True, [
+        '\n  ',
+        ('div', {'id': 'main', 'class': 'container'}, True, [
+            ('ul', {'class': 'list'}, True, [
+                ('li', {'class': 'item', 'data-x': '1'}, True, ['One']),
+                ('li', {'class': 'item active'}, True, ['Two']),
+                ('li', {'class': 'item', 'lang': 'en-US'}, False, ['Three']),
+            ]),
+            ('p', {}, True, ['Hello \n ', ('b', {}, True, ['big']), ' world', ('span', {}, False, ['hidden'])]),
+            ('a', {'href': '/docs/index.html'}, True, [' Read the docs ']),
+        ]),
+        ('form', {}, True, [
+            ('input', {'name': 'q'}, True, []),
+            ('button', {'disabled': ''}, True, ['Go']),
+        ]),
+    ]),
+])
+
+
+def snapshot_data(document: tuple = DOCUMENT) -> dict:
+    """The payload of the runtime's snapshot() for a document of nested tuples, elements named n0, n1, ..."""
+    nodes, elements = [], []
+
+    def add(node, parent):
+        tag, attrs, visible, content = node
+        index = len(nodes)
+        texts = ['']
+        nodes.append([parent, tag, attrs, visible, texts])
+        elements.append(SimpleNamespace(id=f'n{index}'))
+        for x in content:
+            if isinstance(x, str):
+                texts[-1] += x
+            else:
+                texts.append('')
+                add(x, index)
+
+    add(document, -1)
+    return {'title': 'Test', 'url': 'file:///test.html', 'nodes': nodes, 'elements': elements}
+
+
+@pytest.fixture
+def dom() -> DOMSnapshot:
+    return DOMSnapshot(snapshot_data())
+
+
+def tags(nodes) -> list[str]:
+    """Tag of each node, with its text if it has text of its own"""
+    return [f"{x.tag}:{x.text}" if ''.join(x.texts).strip() else x.tag for x in nodes]
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ('li', ['li:One', 'li:Two', 'li:Three']),
+    ('#main', ['div']),
+    ('.item.active', ['li:Two']),
+    ('div.container > ul.list > li:first-child', ['li:One']),
+    ('li:last-child', ['li:Three']),
+    ('li:nth-child(2n+1)', ['li:One', 'li:Three']),
+    ('li:nth-child(even)', ['li:Two']),
+    ('li:nth-last-child(1)', ['li:Three']),
+    ('li:not(.active)', ['li:One', 'li:Three']),
+    ('#main li', ['li:One', 'li:Two', 'li:Three']),
+    ('ul + p', ['p:Hello big world']),
+    ('ul ~ a', ['a:Read the docs']),
+    ('p ~ ul', []),
+    ('[data-x]', ['li:One']),
+    ('[data-x="1"]', ['li:One']),
+    ("[class~='active']", ['li:Two']),
+    ('[href^="/docs"]', ['a:Read the docs']),
+    ('[href$=".html"]', ['a:Read the docs']),
+    ('[href*=index]', ['a:Read the docs']),
+    ('[lang|=en]', ['li:Three']),
+    ('a, p', ['p:Hello big world', 'a:Read the docs']),
+    ('*', ['html', 'body', 'div', 'ul', 'li:One', 'li:Two', 'li:Three', 'p:Hello big world', 'b:big', 'span:hidden',
+           'a:Read the docs', 'form', 'input', 'button:Go']),
+    ('body > *:only-child', []),
+])
+def test_css(dom, selector, expected):
+    assert tags(dom.select(By.CSS_SELECTOR, selector)) == expected
+
+
+@pytest.mark.parametrize('xpath, expected', [
+    ('//li', ['li:One', 'li:Two', 'li:Three']),
+    ('/html/body/div/ul/li[2]', ['li:Two']),
+    ('//ul/li[last()]', ['li:Three']),
+    ('//li[@data-x]', ['li:One']),
+    ("//a[@href='/docs/index.html']", ['a:Read the docs']),
+    ("//*[contains(@class, 'act')]", ['li:Two']),
+    ("//*[starts-with(@href, '/docs')]", ['a:Read the docs']),
+    ("//li[@class='item' and @data-x='1']", ['li:One']),
+    ('//li/..', ['ul']),
+    ('//ul/./li[1]', ['li:One']),
+    ('.//p', ['p:Hello big world']),
+])
+def test_xpath(dom, xpath, expected):
+    assert tags(dom.select(By.XPATH, xpath)) == expected
+
+
+@pytest.mark.parametrize('by, value, expected', [
+    (By.ID, 'main', ['div']),
+    (By.CLASS_NAME, 'item', ['li:One', 'li:Two', 'li:Three']),
+    (By.TAG_NAME, 'LI', ['li:One', 'li:Two', 'li:Three']),
+    (By.NAME, 'q', ['input']),
+    (By.LINK_TEXT, 'Read the docs', ['a:Read the docs']),
+    (By.PARTIAL_LINK_TEXT, 'docs', ['a:Read the docs']),
+])
+def test_strategies(dom, by, value, expected):
+    assert tags(dom.select(by, value)) == expected
+
+
+@pytest.mark.parametrize('by, value', [
+    (By.CSS_SELECTOR, 'li:hover'),
+    (By.CSS_SELECTOR, 'li::before'),
+    (By.CSS_SELECTOR, ''),
+    (By.CSS_SELECTOR, 'ul >'),
+    (By.CSS_SELECTOR, 'li:nth-child(foo)'),
+    (By.CSS_SELECTOR, 'button:disabled'),
+    (By.CSS_SELECTOR, 'form :enabled'),
+    (By.XPATH, "//li[text()='One']"),
+    (By.XPATH, "//li[.='One']"),
+    (By.XPATH, "//p[contains(text(), 'Hello')]"),
+    (By.XPATH, "//p[contains(., 'big')]"),
+    (By.XPATH, "//a[normalize-space()='Read the docs']"),
+    (By.XPATH, '//li[position() > 1]'),
+    (By.XPATH, '//li | //p'),
+    (By.XPATH, '//following-sibling::li'),
+    ('shadow', 'x'),
+])
+def test_unsupported(dom, by, value):
+    with pytest.raises(UnsupportedSelector):
+        dom.select(by, value)
+
+
+def test_text(dom):
+    body, main, p = dom.select(By.CSS_SELECTOR, 'body, #main, p')
+
+    # Like innerText: hidden elements skipped, whitespace collapsed, block elements on lines of their own
+    assert main.text == 'One\nTwo\nHello big world\nRead the docs'
+    assert body.text == 'One\nTwo\nHello big world\nRead the docs\nGo'
+    assert p.text == 'Hello big world'
+    # Like textContent for hidden elements
+    assert [x.text for x in dom.select(By.CSS_SELECTOR, 'span, li.item[lang]')] == ['Three', 'hidden']
+
+
+def test_verify(dom):
+    one, _, three = dom.select(By.CSS_SELECTOR, 'li')
+
+    assert verify(one, {'visible': True, 'text': 'On'}) == {'visible': True, 'text': True}
+    assert verify(three, {'visible': True, 'text': 'One'}) == {'visible': False, 'text': False}
+    assert verify(three, {'visible': False, 'text': None}) == {}
+
+
+def test_node_of(dom):
+    assert dom.node_of(SimpleNamespace(id='n4')).text == 'One'
+    assert dom.node_of(SimpleNamespace(id='unknown')) is None
+
+
+@pytest.mark.parametrize('command, params, expected', [
+    ('findElements', {}, False),
+    ('getElementText', {}, False),
+    ('clickElement', {}, True),
+    ('w3cExecuteScript', {'script': 'document.body.innerHTML = ""'}, True),
+    ('w3cExecuteScript', {'script': 'return window.__spectronpy ? rt.texts.apply(null, arguments) : 1'}, False),
+    ('w3cExecuteScript', {'script': 'return window.__spectronpy ? rt.clickAll.apply(null, arguments) : 1'}, True),
+    ('executeCdpCommand', {'cmd': 'Page.captureScreenshot'}, False),
+    ('executeCdpCommand', {'cmd': 'Runtime.evaluate'}, True),
+])
+def test_mutates(command, params, expected):
+    assert mutates(command, params) is expected
+
+
+def test_finders_use_the_snapshot(server, driver):
+    with Snapshot(driver.session) as dom:
+        requests = server.requests
+
+        assert len(finders.all('.item')) == 10
+        assert len(finders.all('.item', visible=True)) == 5
+        assert [x.id for x in finders.all('#e3')] == ['e3']
+        assert_selector('.item', count=5, visible=True)
+        assert server.requests == requests
+
+        # Commands which may change the page invalidate it, the next finder takes a new one
+        finders.element('#e1').click()
+        assert not dom.valid
+        assert len(finders.all('.item')) == 10
+        assert dom.taken == 2
+
+    assert driver.session.snapshot is None
+
+
+def test_unsupported_selectors_fall_back(server, driver):
+    with Snapshot(driver.session):
+        requests = server.requests
+        assert len(finders.all('div.item:hover', wait=0)) == 0
+        assert server.requests > requests
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+
+from bench.run import BenchService
+from spectronpy import Session, SpectronDriver
+from spectronpy.configuration import Configuration
+from spectronpy.exception import InvalidArgument
+from spectronpy.transport import SpectronConnection
+
+
+@pytest.fixture
+def connect(server):
+    """Drivers of the fake server with the given transport options."""
+    drivers = []
+
+    def _connect(**transport) -> SpectronDriver:
+        options = Options()
+        options.debugger_address = f'127.0.0.1:{server.port}'
+        driver = SpectronDriver({'options': options, 'service': BenchService('fake-chromedriver', port=server.port),
+                                 'transport': transport}, Session())
+        drivers.append(driver)
+        return driver
+
+    yield _connect
+
+    for driver in drivers:
+        driver.quit()
+
+
+def concurrently(driver: SpectronDriver, threads: int, commands: int) -> None:
+    barrier = threading.Barrier(threads, timeout=5)
+
+    def send():
+        barrier.wait()
+        for _ in range(commands):
+            assert driver.title == 'SpectronPy Bench'
+
+    workers = [threading.Thread(target=send) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def test_blocking_pool_never_opens_more_than_pool_size(server, connect):
+    driver = connect(pool_size=2, block=True)
+    server.latency = 0.005
+    before = driver.transport.stats.summary()['requests']
+
+    concurrently(driver, threads=6, commands=5)
+
+    stats = driver.transport.stats.summary()
+    assert stats['requests'] - before == 30
+    assert stats['opened'] <= 2
+    assert stats['reused'] == stats['requests'] - stats['opened']
+    assert stats['max_in_use'] == 2
+    assert stats['in_use'] == 0
+    assert stats['discarded'] == 0
+    assert stats['wait']['count'] == stats['requests']
+
+
+def test_pool_without_block_opens_and_discards_extra_connections(server, connect):
+    driver = connect(pool_size=1)
+    server.latency = 0.02
+
+    concurrently(driver, threads=4, commands=2)
+
+    stats = driver.transport.stats.summary()
+    assert stats['opened'] > 1
+    assert stats['discarded'] > 0
+    assert stats['max_in_use'] > 1
+    assert stats['in_use'] == 0
+
+
+def test_dropped_keep_alive_socket_is_reconnected(server, connect):
+    driver = connect(pool_size=1)
+    assert driver.title == 'SpectronPy Bench'
+    kept = set(server.connections)
+    assert len(kept) == 1
+
+    server.drop_connections()
+    # Wait for the server side to close, the pooled socket is stale from then on
+    end = time.monotonic() + 2
+    while server.connections and time.monotonic() < end:
+        time.sleep(0.01)
+
+    assert driver.title == 'SpectronPy Bench'
+    assert server.connections and not server.connections & kept
+
+
+def test_replace(server):
+    original = ChromiumRemoteConnection(server.url, 'goog', 'chrome', keep_alive=True)
+
+    replaced = SpectronConnection.replace(original, 'goog', {'pool_size': 3, 'block': True})
+
+    assert replaced._url == original._url
+    assert (replaced.pool_size, replaced.block) == (3, True)
+    assert replaced.stats.summary()['requests'] == 0
+
+
+@pytest.mark.parametrize('options', [{'unix_socket': '/run/cd.sock'}, {'pool_size': 2, 'retries': 3}])
+def test_unknown_options(server, options):
+    original = ChromiumRemoteConnection(server.url, 'goog', 'chrome', keep_alive=True)
+
+    with pytest.raises(InvalidArgument, match='Unknown transport option'):
+        SpectronConnection.replace(original, 'goog', options)
+    with pytest.raises(InvalidArgument, match='Unknown transport option'):
+        Configuration(app_path=__file__, webdriver_options={'transport': options})
+
+
+def test_options(server):
+    config = Configuration(app_path=__file__, webdriver_options={'transport': {'pool_size': 2, 'block': True}})
+    assert config.webdriver_options['transport'] == {'pool_size': 2, 'block': True}
+
+    with pytest.raises(InvalidArgument):
+        SpectronConnection(server.url, pool_size=0)